@@ -0,0 +1,235 @@
+"""
+Converts the embeddings of PostModelOutputs responses to a contiguous float32 matrix.
+
+  arrays = embeddings_to_arrays(stub.PostModelOutputs(request, metadata=metadata))
+  arrays.ids      # The input IDs, aligned with the rows.
+  arrays.vectors  # A (number of inputs, number of dimensions) float32 matrix.
+
+Any iterable of responses or outputs works as well, so the matrix of many requests can be
+built without keeping the responses around, optionally straight into a memory-mapped .npy file.
+"""
+import struct
+import typing  # noqa
+
+from google.protobuf.internal import api_implementation
+
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.grpc.api import resources_pb2
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError("clarifai_grpc.arrays requires numpy: pip install clarifai-grpc[numpy]")
+
+DTYPE = np.dtype("<f4")
+# The initial number of rows of a matrix of unknown size, which then grows by doubling.
+INITIAL_ROWS = 1024
+
+# The pure-Python protobuf implementation stores repeated floats as Python floats already, so
+# copying them is faster than serializing. The C implementations serialize packed floats as is.
+_PYTHON_PROTOBUF = api_implementation.Type() == "python"
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+class EmbeddingArrays:
+    def __init__(self, ids, vectors):  # type: (np.ndarray, np.ndarray) -> None
+        """
+        Args:
+          ids: the input IDs, a unicode array.
+          vectors: the (len(ids), number of dimensions) float32 embedding matrix.
+        """
+        self.ids = ids
+        self.vectors = vectors
+
+    @property
+    def num_dimensions(self):  # type: () -> int
+        return self.vectors.shape[1]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def embeddings_to_arrays(
+    responses,  # type: typing.Any
+    path=None,  # type: typing.Optional[str]
+    embedding_index=0,  # type: int
+    skip_missing=False,  # type: bool
+):
+    # type: (...) -> EmbeddingArrays
+    """
+    Args:
+      responses: a PostModelOutputsResponse or an Output, or an iterable of either, such as a
+        generator of responses.
+      path: if set, the vectors are written to this .npy file as they come, and returned
+        memory-mapped from it.
+      embedding_index: which of each output's data.embeddings to use.
+      skip_missing: whether to skip the outputs without that embedding, e.g. failed ones,
+        instead of raising.
+
+    Returns:
+      The embedding matrix and the aligned input IDs.
+    """
+    writer = _FileWriter(path) if path else _MemoryWriter(_count_outputs(responses))
+    ids = []
+    try:
+        for output in _iter_outputs(responses):
+            embeddings = output.data.embeddings
+            if len(embeddings) <= embedding_index:
+                if skip_missing:
+                    continue
+                raise ClarifaiException(
+                    "Output of input '%s' has no embedding %d" % (output.input.id, embedding_index)
+                )
+            writer.write(embeddings[embedding_index])
+            ids.append(output.input.id)
+        vectors = writer.finish()
+    finally:
+        writer.close()
+
+    return EmbeddingArrays(np.array(ids, dtype=str), vectors)
+
+
+def vector_to_array(embedding):  # type: (resources_pb2.Embedding) -> np.ndarray
+    """Converts one embedding's vector to a float32 array."""
+    if _PYTHON_PROTOBUF:
+        return np.array(embedding.vector[:], dtype=DTYPE)
+    return np.frombuffer(_packed_vector_bytes(embedding), dtype=DTYPE)
+
+
+def _packed_vector_bytes(embedding):  # type: (resources_pb2.Embedding) -> bytes
+    """The little-endian floats of the vector, read from the embedding's serialization."""
+    data = embedding.SerializeToString()
+    # The vector is field 1, which is serialized first, as a length-delimited packed field.
+    if not data or data[0] != 0x0A:
+        return b""
+    length = 0
+    shift = 0
+    position = 1
+    while True:
+        byte = data[position]
+        position += 1
+        length |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            break
+    return data[position : position + length]
+
+
+def _count_outputs(responses):  # type: (typing.Any) -> typing.Optional[int]
+    """The number of outputs, if known without consuming an iterator."""
+    if isinstance(responses, resources_pb2.Output):
+        return 1
+    if hasattr(responses, "outputs"):
+        return len(responses.outputs)
+    if isinstance(responses, (list, tuple)):
+        counts = [_count_outputs(r) for r in responses]
+        return None if None in counts else sum(counts)
+    return None
+
+
+def _iter_outputs(responses):  # type: (typing.Any) -> typing.Iterator[resources_pb2.Output]
+    if isinstance(responses, resources_pb2.Output):
+        yield responses
+    elif hasattr(responses, "outputs"):
+        for output in responses.outputs:
+            yield output
+    else:
+        for response in responses:
+            for output in _iter_outputs(response):
+                yield output
+
+
+class _MemoryWriter:
+    """Fills a matrix pre-sized from the number of outputs, or grown by doubling if unknown."""
+
+    def __init__(self, count):  # type: (typing.Optional[int]) -> None
+        self._capacity = count or INITIAL_ROWS
+        self._matrix = None  # type: typing.Optional[np.ndarray]
+        self._rows = 0
+
+    def write(self, embedding):  # type: (resources_pb2.Embedding) -> None
+        vector = vector_to_array(embedding)
+        if self._matrix is None:
+            num_dimensions = embedding.num_dimensions or len(vector)
+            self._matrix = np.empty((self._capacity, num_dimensions), dtype=DTYPE)
+        elif self._rows == len(self._matrix):
+            self._matrix.resize((2 * len(self._matrix), self._matrix.shape[1]), refcheck=False)
+        _check_dimensions(embedding, vector, self._matrix.shape[1])
+        self._matrix[self._rows] = vector
+        self._rows += 1
+
+    def finish(self):  # type: () -> np.ndarray
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=DTYPE)
+        if self._rows != len(self._matrix):
+            self._matrix.resize((self._rows, self._matrix.shape[1]), refcheck=False)
+        return self._matrix
+
+    def close(self):  # type: () -> None
+        pass
+
+
+class _FileWriter:
+    """
+    Appends the vectors to a .npy file as they come. The header's space is reserved for the
+    largest shape, and the header rewritten with the actual shape at the end.
+    """
+
+    def __init__(self, path):  # type: (str) -> None
+        if not path.endswith(".npy"):
+            raise UsageError("The embeddings file must be a .npy file, got '%s'" % path)
+        self._path = path
+        self._file = open(path, "wb")
+        self._num_dimensions = None  # type: typing.Optional[int]
+        self._header_size = None  # type: typing.Optional[int]
+        self._rows = 0
+
+    def write(self, embedding):  # type: (resources_pb2.Embedding) -> None
+        vector = vector_to_array(embedding)
+        if self._num_dimensions is None:
+            self._num_dimensions = embedding.num_dimensions or len(vector)
+            largest_header = _npy_header((1 << 63, self._num_dimensions))
+            self._header_size = len(largest_header)
+            self._file.write(largest_header)
+        _check_dimensions(embedding, vector, self._num_dimensions)
+        self._file.write(vector.tobytes())
+        self._rows += 1
+
+    def finish(self):  # type: () -> np.ndarray
+        if self._num_dimensions is None:
+            self._file.write(_npy_header((0, 0)))
+        else:
+            self._file.seek(0)
+            self._file.write(_npy_header((self._rows, self._num_dimensions), self._header_size))
+        self._file.close()
+        return np.load(self._path, mmap_mode="r")
+
+    def close(self):  # type: () -> None
+        self._file.close()
+
+
+def _check_dimensions(embedding, vector, num_dimensions):
+    # type: (resources_pb2.Embedding, np.ndarray, int) -> None
+    if len(vector) != num_dimensions or (
+        embedding.num_dimensions and embedding.num_dimensions != num_dimensions
+    ):
+        raise ClarifaiException(
+            "Embedding has %d values and num_dimensions %d, expected %d"
+            % (len(vector), embedding.num_dimensions, num_dimensions)
+        )
+
+
+def _npy_header(shape, size=None):  # type: (tuple, typing.Optional[int]) -> bytes
+    """A version 1.0 .npy header, padded to size, or to a multiple of 64 bytes if not set."""
+    header = repr({"descr": DTYPE.str, "fortran_order": False, "shape": shape}).encode("latin1")
+    if size is None:
+        size = -(-(len(_NPY_MAGIC) + 2 + len(header) + 1) // 64) * 64
+    padding = size - len(_NPY_MAGIC) - 2 - len(header) - 1
+    return (
+        _NPY_MAGIC
+        + struct.pack("<H", size - len(_NPY_MAGIC) - 2)
+        + header
+        + b" " * padding
+        + b"\n"
+    )
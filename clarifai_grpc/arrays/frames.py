@@ -0,0 +1,170 @@
+"""
+Converts the frames of video outputs to timeline arrays, one row per frame.
+
+  arrays = frames_to_arrays(stub.PostModelOutputs(request, metadata=metadata))
+  arrays.times     # The int64 time of each frame, in milliseconds.
+  arrays.concepts  # The concept ID of each column.
+  arrays.scores    # The (frames, concepts) float32 values, 0 where a frame lacks a concept.
+
+The frames of all the videos are stacked, those of the i-th video being the rows
+frame_offsets[i]:frame_offsets[i + 1]. With sparse=True, the values are kept as coordinates
+instead, which is smaller when each frame has few concepts, e.g. with a small max_concepts.
+
+The frames are read into compact buffers as the outputs come, so a generator of responses is
+converted without holding the responses. iter_frames_arrays converts one video at a time.
+"""
+import typing  # noqa
+from array import array
+
+from clarifai_grpc.arrays.embeddings import _iter_outputs
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError("clarifai_grpc.arrays requires numpy: pip install clarifai-grpc[numpy]")
+
+
+class FrameArrays:
+    def __init__(
+        self,
+        input_ids,  # type: np.ndarray
+        frame_offsets,  # type: np.ndarray
+        times,  # type: np.ndarray
+        frame_indexes,  # type: np.ndarray
+        concepts,  # type: np.ndarray
+        scores=None,  # type: typing.Optional[np.ndarray]
+        frame_rows=None,  # type: typing.Optional[np.ndarray]
+        concept_index=None,  # type: typing.Optional[np.ndarray]
+        values=None,  # type: typing.Optional[np.ndarray]
+    ):
+        # type: (...) -> None
+        """
+        Args:
+          input_ids: the input ID of each video, a unicode array.
+          frame_offsets: the int64 first row of each video, followed by the number of frames.
+          times: the int64 time of each frame, in milliseconds.
+          frame_indexes: the int64 index of each frame in its video.
+          concepts: the concept ID of each column, a unicode array.
+          scores: the dense (frames, concepts) float32 values, or None if sparse.
+          frame_rows: if sparse, the int64 frame row of each value.
+          concept_index: if sparse, the int32 column of each value.
+          values: if sparse, the float32 values.
+        """
+        self.input_ids = input_ids
+        self.frame_offsets = frame_offsets
+        self.times = times
+        self.frame_indexes = frame_indexes
+        self.concepts = concepts
+        self.scores = scores
+        self.frame_rows = frame_rows
+        self.concept_index = concept_index
+        self.values = values
+
+    @property
+    def is_sparse(self):  # type: () -> bool
+        return self.scores is None
+
+    def __len__(self):
+        return len(self.times)
+
+    def to_dense(self):  # type: () -> np.ndarray
+        """The (frames, concepts) float32 values, 0 where a frame lacks a concept."""
+        if not self.is_sparse:
+            return self.scores
+        scores = np.zeros((len(self), len(self.concepts)), dtype=np.float32)
+        scores[self.frame_rows, self.concept_index] = self.values
+        return scores
+
+
+def frames_to_arrays(
+    responses,  # type: typing.Any
+    sparse=False,  # type: bool
+    concepts=None,  # type: typing.Optional[typing.Iterable[str]]
+):
+    # type: (...) -> FrameArrays
+    """
+    Args:
+      responses: a PostModelOutputsResponse or an Output, or an iterable of either, such as a
+        generator of responses.
+      sparse: whether to keep the values as coordinates instead of a dense matrix.
+      concepts: if set, the concept IDs of the columns, in order. Other concepts are ignored.
+        By default, the columns are the concepts in the order they appear.
+
+    Returns:
+      The frames of all the videos, stacked.
+    """
+    timeline = _Timeline(concepts)
+    for output in _iter_outputs(responses):
+        timeline.add(output)
+    return timeline.to_arrays(sparse)
+
+
+def iter_frames_arrays(
+    responses,  # type: typing.Any
+    sparse=False,  # type: bool
+    concepts=None,  # type: typing.Optional[typing.Iterable[str]]
+):
+    # type: (...) -> typing.Iterator[FrameArrays]
+    """
+    Like frames_to_arrays, but yields the arrays of each video as it comes. Pass concepts to
+    get the same columns for every video.
+    """
+    if concepts is not None:
+        concepts = list(concepts)
+    for output in _iter_outputs(responses):
+        timeline = _Timeline(concepts)
+        timeline.add(output)
+        yield timeline.to_arrays(sparse)
+
+
+class _Timeline:
+    """Accumulates the frames in typed buffers, without keeping a Python object per value."""
+
+    def __init__(self, concepts):  # type: (typing.Optional[typing.Iterable[str]]) -> None
+        self._fixed_concepts = concepts is not None
+        self._concept_indexes = {
+            concept_id: index for index, concept_id in enumerate(concepts or ())
+        }  # type: typing.Dict[str, int]
+        self._input_ids = []  # type: typing.List[str]
+        self._frame_offsets = array("q", [0])
+        self._times = array("q")
+        self._frame_indexes = array("q")
+        self._frame_rows = array("q")
+        self._concept_index = array("i")
+        self._values = array("f")
+
+    def add(self, output):  # type: (typing.Any) -> None
+        concept_indexes = self._concept_indexes
+        row = len(self._times)
+        for frame in output.data.frames:
+            frame_info = frame.frame_info
+            self._times.append(frame_info.time)
+            self._frame_indexes.append(frame_info.index)
+            for concept in frame.data.concepts:
+                column = concept_indexes.get(concept.id)
+                if column is None:
+                    if self._fixed_concepts:
+                        continue
+                    column = concept_indexes[concept.id] = len(concept_indexes)
+                self._frame_rows.append(row)
+                self._concept_index.append(column)
+                self._values.append(concept.value)
+            row += 1
+        self._input_ids.append(output.input.id)
+        self._frame_offsets.append(row)
+
+    def to_arrays(self, sparse):  # type: (bool) -> FrameArrays
+        arrays = FrameArrays(
+            input_ids=np.array(self._input_ids, dtype=str),
+            frame_offsets=np.array(self._frame_offsets, dtype=np.int64),
+            times=np.array(self._times, dtype=np.int64),
+            frame_indexes=np.array(self._frame_indexes, dtype=np.int64),
+            concepts=np.array(list(self._concept_indexes), dtype=str),
+            frame_rows=np.array(self._frame_rows, dtype=np.int64),
+            concept_index=np.array(self._concept_index, dtype=np.int32),
+            values=np.array(self._values, dtype=np.float32),
+        )
+        if not sparse:
+            arrays.scores = arrays.to_dense()
+            arrays.frame_rows = arrays.concept_index = arrays.values = None
+        return arrays
@@ -0,0 +1,123 @@
+"""
+Converts search hits to parallel arrays of input IDs and float32 scores.
+
+  request = service_pb2.PostInputsSearchesRequest(
+      searches=[...], pagination=service_pb2.Pagination(per_page=1000)
+  )
+  hits = search_to_arrays(stub.PostInputsSearches, request, metadata)  # All the pages.
+  kept = hits[hits.scores >= 0.9]
+  inputs = kept.fetch_inputs(stub, metadata)  # The full inputs, only for the kept hits.
+
+Only the IDs and scores of the hits are read, without building a message or dict per hit.
+"""
+import typing  # noqa
+from array import array
+
+from google.protobuf.message import Message  # noqa
+
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.grpc.api import resources_pb2  # noqa
+from clarifai_grpc.grpc.api import service_pb2
+from clarifai_grpc.helpers.pagination import DEFAULT_PER_PAGE, DEFAULT_PREFETCH, paginate_responses
+from clarifai_grpc.helpers.responses import raise_on_failure
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError("clarifai_grpc.arrays requires numpy: pip install clarifai-grpc[numpy]")
+
+
+class HitArrays:
+    def __init__(self, input_ids, annotation_ids, scores):
+        # type: (np.ndarray, np.ndarray, np.ndarray) -> None
+        """
+        Args:
+          input_ids: the input ID of each hit, a unicode array.
+          annotation_ids: the annotation ID of each hit, empty if it has no annotation.
+          scores: the float32 score of each hit.
+        """
+        self.input_ids = input_ids
+        self.annotation_ids = annotation_ids
+        self.scores = scores
+
+    def __len__(self):
+        return len(self.input_ids)
+
+    def __getitem__(self, selection):  # type: (typing.Any) -> HitArrays
+        """The hits selected by a boolean mask, an index array or a slice."""
+        return HitArrays(
+            self.input_ids[selection], self.annotation_ids[selection], self.scores[selection]
+        )
+
+    def fetch_inputs(self, stub, metadata=None, per_page=DEFAULT_PER_PAGE):
+        # type: (typing.Any, typing.Optional[tuple], int) -> typing.List[resources_pb2.Input]
+        """
+        Gets the hits' inputs with ListInputs, per_page IDs per request.
+
+        Args:
+          stub: the V2Stub.
+          metadata: the call metadata, passed to each call.
+          per_page: the number of inputs per request.
+
+        Returns:
+          The input of each hit, in order.
+        """
+        unique_ids = list(dict.fromkeys(self.input_ids.tolist()))
+        inputs = {}  # type: typing.Dict[str, resources_pb2.Input]
+        for start in range(0, len(unique_ids), per_page):
+            ids = unique_ids[start : start + per_page]
+            response = stub.ListInputs(
+                service_pb2.ListInputsRequest(ids=ids, per_page=len(ids)), metadata=metadata
+            )
+            raise_on_failure(response)
+            for input_ in response.inputs:
+                inputs[input_.id] = input_
+        missing = [input_id for input_id in unique_ids if input_id not in inputs]
+        if missing:
+            raise ClarifaiException("Inputs %s do not exist" % missing[:10])
+        return [inputs[input_id] for input_id in self.input_ids.tolist()]
+
+
+def hits_to_arrays(responses):  # type: (typing.Any) -> HitArrays
+    """
+    Args:
+      responses: a search response, or an iterable of them, such as the pages of a search.
+
+    Returns:
+      The hits, in order.
+    """
+    if hasattr(responses, "hits"):
+        responses = [responses]
+    input_ids = []  # type: typing.List[str]
+    annotation_ids = []  # type: typing.List[str]
+    scores = array("f")
+    for response in responses:
+        for hit in response.hits:
+            annotation = hit.annotation
+            input_ids.append(hit.input.id or annotation.input_id)
+            annotation_ids.append(annotation.id)
+            scores.append(hit.score)
+    return HitArrays(
+        np.array(input_ids, dtype=str),
+        np.array(annotation_ids, dtype=str),
+        np.array(scores, dtype=np.float32),
+    )
+
+
+def search_to_arrays(
+    stub_method,  # type: typing.Callable
+    request,  # type: Message
+    metadata=None,  # type: typing.Optional[tuple]
+    prefetch=DEFAULT_PREFETCH,  # type: int
+    max_pages=None,  # type: typing.Optional[int]
+):
+    # type: (...) -> HitArrays
+    """
+    The hits of all the pages of a search, e.g. of PostInputsSearches, PostAnnotationsSearches or
+    PostSearches. The pages are requested as in paginate_responses.
+    """
+    return hits_to_arrays(
+        paginate_responses(
+            stub_method, request, metadata, prefetch, max_pages=max_pages, items_field="hits"
+        )
+    )
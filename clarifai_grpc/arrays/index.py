@@ -0,0 +1,393 @@
+"""
+Local nearest-neighbour search over embeddings, e.g. for deduplication, without a PostSearches
+call per query.
+
+  arrays = embeddings_to_arrays(responses)
+  index = build_index(arrays.ids, arrays.vectors)
+  ids, scores = index.search(query_vectors, k=10)  # (queries, k) arrays, best first.
+  hits = index.search_hits(query_vectors, k=10)  # Lists of resources_pb2.Hit.
+
+ExactIndex scores every vector and suits up to about a hundred thousand vectors.
+PartitionedIndex clusters the vectors with k-means, stores them quantized to int8, and only scores
+the partitions closest to each query, re-ranking the best candidates exactly.
+
+Indexes are saved to a directory of .npy files, which load memory-mapped.
+"""
+import abc
+import json
+import os
+import typing  # noqa
+
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.grpc.api import resources_pb2
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError("clarifai_grpc.arrays requires numpy: pip install clarifai-grpc[numpy]")
+
+METRICS = ("cosine", "dot")
+# build_index makes a PartitionedIndex for more vectors than this.
+EXACT_SEARCH_MAX_VECTORS = 100000
+# Bounds the size of the (queries, vectors) score blocks computed at once.
+MAX_SCORES_PER_BLOCK = 1 << 24
+
+_META_FILE = "index.json"
+
+
+class _Index(abc.ABC):
+    kind = None  # type: str
+
+    def __init__(self, ids, metric):  # type: (np.ndarray, str) -> None
+        if metric not in METRICS:
+            raise UsageError("Unknown metric '%s', expected one of %s" % (metric, METRICS))
+        self.ids = ids
+        self.metric = metric
+
+    def __len__(self):
+        return len(self.ids)
+
+    def search(self, queries, k=10):
+        # type: (np.ndarray, int) -> typing.Tuple[np.ndarray, np.ndarray]
+        """
+        Args:
+          queries: a (number of queries, number of dimensions) matrix, or a single vector.
+          k: the number of results per query.
+
+        Returns:
+          The (number of queries, k) IDs and float32 scores of the results, best first. With
+          fewer than k vectors, the rows are shorter.
+        """
+        queries = self._prepare_queries(queries)
+        k = min(k, len(self))
+        rows, scores = self._search_rows(queries, k)
+        return self.ids[rows], scores
+
+    def search_hits(self, queries, k=10):
+        # type: (np.ndarray, int) -> typing.List[typing.List[resources_pb2.Hit]]
+        """Like search, but returns the results of each query as Hit messages."""
+        ids, scores = self.search(queries, k)
+        return [
+            [
+                resources_pb2.Hit(score=float(score), input=resources_pb2.Input(id=str(input_id)))
+                for input_id, score in zip(query_ids, query_scores)
+            ]
+            for query_ids, query_scores in zip(ids, scores)
+        ]
+
+    def save(self, directory):  # type: (str) -> None
+        """Saves the index as .npy files in the directory, which is created if needed."""
+        os.makedirs(directory, exist_ok=True)
+        for name, array in self._arrays().items():
+            np.save(os.path.join(directory, name + ".npy"), array)
+        with open(os.path.join(directory, _META_FILE), "w") as f:
+            json.dump(dict(self._meta(), kind=self.kind, metric=self.metric), f)
+
+    def _prepare_queries(self, queries):  # type: (np.ndarray) -> np.ndarray
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        return _normalized(queries) if self.metric == "cosine" else queries
+
+    @classmethod
+    @abc.abstractmethod
+    def _load(cls, load, meta):
+        # type: (typing.Callable[[str], typing.Optional[np.ndarray]], dict) -> _Index
+        """Makes the index from the arrays, loaded by name, and the meta of a saved one."""
+
+    @abc.abstractmethod
+    def _search_rows(self, queries, k):
+        # type: (np.ndarray, int) -> typing.Tuple[np.ndarray, np.ndarray]
+        """The rows and scores of the top k vectors of each prepared query."""
+
+    @abc.abstractmethod
+    def _arrays(self):  # type: () -> typing.Dict[str, np.ndarray]
+        """The arrays to save, by name."""
+
+    def _meta(self):  # type: () -> dict
+        return {}
+
+
+class ExactIndex(_Index):
+    """Scores the queries against all the vectors."""
+
+    kind = "exact"
+
+    def __init__(self, ids, vectors, metric="cosine", normalized=False):
+        # type: (typing.Sequence[str], np.ndarray, str, bool) -> None
+        """
+        Args:
+          ids: the input IDs of the vectors.
+          vectors: the (len(ids), number of dimensions) matrix.
+          metric: "cosine" for cosine similarity, or "dot" for the dot product.
+          normalized: whether the vectors are float32 and, for cosine, normalized already, e.g.
+            those of a saved index. They are then used as they are, without a copy.
+        """
+        super(ExactIndex, self).__init__(np.asanyarray(ids, dtype=str), metric)
+        if not normalized:
+            vectors = np.asarray(vectors, dtype=np.float32)
+            if metric == "cosine":
+                vectors = _normalized(vectors)
+        self.vectors = vectors
+
+    @classmethod
+    def _load(cls, load, meta):
+        return cls(load("ids"), load("vectors"), meta["metric"], normalized=True)
+
+    def _search_rows(self, queries, k):
+        rows = np.empty((len(queries), k), dtype=np.int64)
+        scores = np.empty((len(queries), k), dtype=np.float32)
+        batch = max(1, MAX_SCORES_PER_BLOCK // max(1, len(self)))
+        for start in range(0, len(queries), batch):
+            block = queries[start : start + batch] @ self.vectors.T
+            top = _top_k(block, k)
+            rows[start : start + batch] = top
+            scores[start : start + batch] = np.take_along_axis(block, top, axis=1)
+        return rows, scores
+
+    def _arrays(self):
+        return {"ids": self.ids, "vectors": self.vectors}
+
+
+class PartitionedIndex(_Index):
+    """
+    Clusters the vectors into partitions with spherical k-means, and stores them quantized to
+    int8 with a scale per dimension. A search scores the vectors of the probes partitions whose
+    centroids are closest to the query, then re-ranks the best rerank * k of them with the
+    float32 vectors, if kept.
+    """
+
+    kind = "partitioned"
+
+    def __init__(self, ids, centroids, offsets, codes, scale, metric="cosine", vectors=None):
+        # type: (...) -> None
+        """Use PartitionedIndex.build to make one. The arrays are ordered by partition."""
+        super(PartitionedIndex, self).__init__(ids, metric)
+        self.centroids = centroids
+        self.offsets = offsets
+        self.codes = codes
+        self.scale = scale
+        self.vectors = vectors
+        self.probes = max(1, min(len(centroids), 8))
+        self.rerank = 4
+
+    @classmethod
+    def build(
+        cls,
+        ids,  # type: typing.Sequence[str]
+        vectors,  # type: np.ndarray
+        metric="cosine",  # type: str
+        partitions=None,  # type: typing.Optional[int]
+        iterations=10,  # type: int
+        sample_size=65536,  # type: int
+        keep_vectors=True,  # type: bool
+        seed=0,  # type: int
+    ):
+        # type: (...) -> PartitionedIndex
+        """
+        Args:
+          ids: the input IDs of the vectors.
+          vectors: the (len(ids), number of dimensions) matrix.
+          metric: "cosine" for cosine similarity, or "dot" for the dot product.
+          partitions: the number of partitions. Defaults to the square root of the number of
+            vectors.
+          iterations: the k-means iterations.
+          sample_size: the number of vectors k-means is trained on, at least one per partition.
+          keep_vectors: whether to keep the float32 vectors, to re-rank with. Without them the
+            index takes about a quarter of the memory, and the scores are approximate.
+          seed: the seed of the random sampling.
+        """
+        if metric not in METRICS:
+            raise UsageError("Unknown metric '%s', expected one of %s" % (metric, METRICS))
+        ids = np.asarray(ids, dtype=str)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if metric == "cosine":
+            vectors = _normalized(vectors)
+        partitions = min(len(vectors), partitions or max(1, int(np.sqrt(len(vectors)))))
+
+        centroids = _train_centroids(vectors, partitions, iterations, sample_size, seed)
+        assignments = _assign(vectors, centroids)
+        order = np.argsort(assignments, kind="stable")
+        offsets = np.zeros(partitions + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(assignments, minlength=partitions))
+
+        vectors = vectors[order]
+        scale = np.abs(vectors).max(axis=0) / 127.0
+        scale[scale == 0] = 1.0
+        codes = np.round(vectors / scale).astype(np.int8)
+        return cls(
+            ids[order],
+            centroids,
+            offsets,
+            codes,
+            scale.astype(np.float32),
+            metric,
+            vectors if keep_vectors else None,
+        )
+
+    @classmethod
+    def _load(cls, load, meta):
+        index = cls(
+            load("ids"),
+            load("centroids"),
+            load("offsets"),
+            load("codes"),
+            load("scale"),
+            meta["metric"],
+            load("vectors"),
+        )
+        index.probes = meta["probes"]
+        index.rerank = meta["rerank"]
+        return index
+
+    def _search_rows(self, queries, k):
+        candidates = k * self.rerank if self.vectors is not None else k
+        candidates = min(candidates, len(self))
+        rows = np.empty((len(queries), k), dtype=np.int64)
+        scores = np.empty((len(queries), k), dtype=np.float32)
+        # Re-ranking gathers a (queries, candidates, dimensions) block of vectors.
+        batch = max(1, MAX_SCORES_PER_BLOCK // (candidates * self.codes.shape[1]))
+        for start in range(0, len(queries), batch):
+            end = start + batch
+            rows[start:end], scores[start:end] = self._search_block(
+                queries[start:end], k, candidates
+            )
+        return rows, scores
+
+    def _search_block(self, queries, k, candidates):
+        # type: (np.ndarray, int, int) -> typing.Tuple[np.ndarray, np.ndarray]
+        rows, scores = self._probe(queries, candidates, self.probes)
+        # The queries whose probed partitions have too few vectors are searched in all of them.
+        unfilled = (rows < 0).any(axis=1)
+        if unfilled.any():
+            rows[unfilled], scores[unfilled] = self._probe(
+                queries[unfilled], candidates, len(self.centroids)
+            )
+        if self.vectors is None:
+            return rows, scores
+
+        # Re-rank the candidates with the exact scores.
+        exact = np.einsum("qd,qcd->qc", queries, self.vectors[rows])
+        top = _top_k(exact, k)
+        return np.take_along_axis(rows, top, axis=1), np.take_along_axis(exact, top, axis=1)
+
+    def _probe(self, queries, k, probes):
+        # type: (np.ndarray, int, int) -> typing.Tuple[np.ndarray, np.ndarray]
+        """
+        The approximate top k of the probes partitions closest to each query, from the quantized
+        vectors. Rows are -1 where the partitions have fewer than k vectors.
+        """
+        probes = _top_k(queries @ self.centroids.T, min(probes, len(self.centroids)))
+        best_rows = np.full((len(queries), k), -1, dtype=np.int64)
+        best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        # Scaling the queries dequantizes the codes in the dot product.
+        scaled_queries = queries * self.scale
+
+        for partition in np.unique(probes):
+            start, end = self.offsets[partition], self.offsets[partition + 1]
+            if start == end:
+                continue
+            query_rows = np.nonzero((probes == partition).any(axis=1))[0]
+            block = scaled_queries[query_rows] @ self.codes[start:end].T.astype(np.float32)
+
+            merged_scores = np.concatenate([best_scores[query_rows], block], axis=1)
+            partition_rows = np.broadcast_to(
+                np.arange(start, end, dtype=np.int64), (len(query_rows), end - start)
+            )
+            merged_rows = np.concatenate([best_rows[query_rows], partition_rows], axis=1)
+            top = _top_k(merged_scores, k)
+            best_scores[query_rows] = np.take_along_axis(merged_scores, top, axis=1)
+            best_rows[query_rows] = np.take_along_axis(merged_rows, top, axis=1)
+        return best_rows, best_scores
+
+    def _arrays(self):
+        arrays = {
+            "ids": self.ids,
+            "centroids": self.centroids,
+            "offsets": self.offsets,
+            "codes": self.codes,
+            "scale": self.scale,
+        }
+        if self.vectors is not None:
+            arrays["vectors"] = self.vectors
+        return arrays
+
+    def _meta(self):
+        return {"probes": self.probes, "rerank": self.rerank}
+
+
+def build_index(ids, vectors, metric="cosine", **partitioned_options):
+    # type: (typing.Sequence[str], np.ndarray, str, typing.Any) -> _Index
+    """
+    Makes an ExactIndex for up to EXACT_SEARCH_MAX_VECTORS vectors, and a PartitionedIndex,
+    with the options of PartitionedIndex.build, for more.
+    """
+    if len(vectors) <= EXACT_SEARCH_MAX_VECTORS:
+        return ExactIndex(ids, vectors, metric)
+    return PartitionedIndex.build(ids, vectors, metric, **partitioned_options)
+
+
+def load_index(directory, mmap_mode="r"):  # type: (str, typing.Optional[str]) -> _Index
+    """Loads an index saved with save, memory-mapping its arrays unless mmap_mode is None."""
+    with open(os.path.join(directory, _META_FILE)) as f:
+        meta = json.load(f)
+
+    def load(name):
+        path = os.path.join(directory, name + ".npy")
+        return np.load(path, mmap_mode=mmap_mode) if os.path.exists(path) else None
+
+    for index_class in (ExactIndex, PartitionedIndex):
+        if meta["kind"] == index_class.kind:
+            return index_class._load(load, meta)
+    raise UsageError("Unknown index kind '%s' in %s" % (meta["kind"], directory))
+
+
+def _normalized(vectors):  # type: (np.ndarray) -> np.ndarray
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+def _top_k(scores, k):  # type: (np.ndarray, int) -> np.ndarray
+    """The column indexes of the k highest scores of each row, highest first."""
+    if k < scores.shape[1]:
+        partitioned = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        partitioned = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, partitioned, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(partitioned, order, axis=1)
+
+
+def _assign(vectors, centroids):  # type: (np.ndarray, np.ndarray) -> np.ndarray
+    """The closest centroid of each vector, computed in blocks."""
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    batch = max(1, MAX_SCORES_PER_BLOCK // len(centroids))
+    for start in range(0, len(vectors), batch):
+        block = vectors[start : start + batch] @ centroids.T
+        assignments[start : start + batch] = block.argmax(axis=1)
+    return assignments
+
+
+def _train_centroids(vectors, partitions, iterations, sample_size, seed):
+    # type: (np.ndarray, int, int, int, int) -> np.ndarray
+    """Spherical k-means on a sample of the vectors, of at least one vector per partition."""
+    random = np.random.RandomState(seed)
+    # There are no more partitions than vectors, so the sample has one for each centroid.
+    sample_size = max(sample_size, partitions)
+    if len(vectors) > sample_size:
+        sample = vectors[random.choice(len(vectors), sample_size, replace=False)]
+    else:
+        sample = vectors
+    sample = _normalized(sample)
+    centroids = sample[random.choice(len(sample), partitions, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = _assign(sample, centroids)
+        counts = np.bincount(assignments, minlength=partitions)
+        starts = np.cumsum(counts) - counts
+        filled = counts > 0
+        sums = np.empty_like(centroids)
+        order = np.argsort(assignments, kind="stable")
+        sums[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+        # Restart the empty partitions from random vectors.
+        sums[~filled] = sample[random.choice(len(sample), int((~filled).sum()))]
+        centroids = _normalized(sums)
+    return centroids
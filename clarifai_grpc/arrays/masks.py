@@ -0,0 +1,193 @@
+"""
+Decodes the masks of segmentation outputs to NumPy arrays on access.
+
+  masks = lazy_masks(stub.PostModelOutputs(request, metadata=metadata))
+  masks.input_ids[masks.input_index]  # The input ID of each mask.
+  masks.region_ids                     # The region ID of each mask.
+  mask = masks[3]                      # Decoded now, and kept in a cache bounded by bytes.
+  for mask in masks.iter_decoded():    # All of them, decoded by a thread pool.
+      ...
+
+Only the encoded mask images are kept, not the responses. The default decoder needs Pillow.
+"""
+import collections
+import io
+import os
+import threading
+import typing  # noqa
+from concurrent.futures import ThreadPoolExecutor
+
+from clarifai_grpc.arrays.embeddings import _iter_outputs
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError("clarifai_grpc.arrays requires numpy: pip install clarifai-grpc[numpy]")
+
+# The default bound of the decoded masks' cache.
+CACHE_BYTES = 256 * 1024 * 1024
+# How many masks per worker iter_decoded decodes ahead of the one it yields.
+PREFETCH_PER_WORKER = 2
+
+
+def decode_image(data):  # type: (bytes) -> np.ndarray
+    """Decodes a PNG or other image to a (height, width) or (height, width, channels) array."""
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("Decoding masks requires Pillow: pip install clarifai-grpc[images]")
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image)
+
+
+class LazyMasks:
+    def __init__(
+        self,
+        input_ids,  # type: np.ndarray
+        input_index,  # type: np.ndarray
+        region_ids,  # type: np.ndarray
+        encoded,  # type: typing.List[bytes]
+        cache_bytes=CACHE_BYTES,  # type: int
+        decoder=decode_image,  # type: typing.Callable[[bytes], np.ndarray]
+    ):
+        # type: (...) -> None
+        """
+        Args:
+          input_ids: the input ID of each output, a unicode array.
+          input_index: the int32 index in input_ids of each mask.
+          region_ids: the region ID of each mask, a unicode array.
+          encoded: the encoded image of each mask.
+          cache_bytes: the most bytes of decoded masks to keep. 0 disables the cache.
+          decoder: decodes an image to an array.
+        """
+        self.input_ids = input_ids
+        self.input_index = input_index
+        self.region_ids = region_ids
+        self._encoded = encoded
+        self._decoder = decoder
+        self._cache = _BytesLRU(cache_bytes)
+
+    def __len__(self):
+        return len(self._encoded)
+
+    def __getitem__(self, index):  # type: (int) -> np.ndarray
+        """The decoded mask, read-only since it is shared through the cache."""
+        return self._get(index, cache=True)
+
+    def iter_decoded(
+        self,
+        indexes=None,  # type: typing.Optional[typing.Iterable[int]]
+        workers=None,  # type: typing.Optional[int]
+        cache=False,  # type: bool
+    ):
+        # type: (...) -> typing.Iterator[np.ndarray]
+        """
+        Yields the decoded masks in order, decoding a few ahead in a thread pool.
+
+        Args:
+          indexes: the masks to decode, all of them by default.
+          workers: the number of threads, by default the number of CPUs.
+          cache: whether to add the masks to the cache. By default, an export of all the masks
+            does not evict the ones cached for random access.
+        """
+        if indexes is None:
+            indexes = range(len(self))
+        workers = workers or os.cpu_count() or 1
+        pending = collections.deque()  # type: typing.Deque
+        with ThreadPoolExecutor(workers) as executor:
+            for index in indexes:
+                pending.append(executor.submit(self._get, index, cache))
+                if len(pending) >= workers * PREFETCH_PER_WORKER:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def decode_all(
+        self,
+        indexes=None,  # type: typing.Optional[typing.Iterable[int]]
+        workers=None,  # type: typing.Optional[int]
+    ):
+        # type: (...) -> typing.List[np.ndarray]
+        """Like iter_decoded, but returns a list."""
+        return list(self.iter_decoded(indexes, workers))
+
+    @property
+    def cached_bytes(self):  # type: () -> int
+        return self._cache.size
+
+    def _get(self, index, cache):  # type: (int, bool) -> np.ndarray
+        mask = self._cache.get(index)
+        if mask is None:
+            mask = np.asarray(self._decoder(self._encoded[index]))
+            mask.setflags(write=False)
+            if cache:
+                self._cache.put(index, mask)
+        return mask
+
+
+def lazy_masks(
+    responses,  # type: typing.Any
+    cache_bytes=CACHE_BYTES,  # type: int
+    decoder=decode_image,  # type: typing.Callable[[bytes], np.ndarray]
+):
+    # type: (...) -> LazyMasks
+    """
+    Args:
+      responses: a PostModelOutputsResponse or an Output, or an iterable of either, such as a
+        generator of responses.
+      cache_bytes: the most bytes of decoded masks to keep. 0 disables the cache.
+      decoder: decodes an image to an array.
+
+    Returns:
+      The masks of the regions which have one, in the order of the outputs and regions.
+    """
+    input_ids = []  # type: typing.List[str]
+    input_index = []  # type: typing.List[int]
+    region_ids = []  # type: typing.List[str]
+    encoded = []  # type: typing.List[bytes]
+    for output_number, output in enumerate(_iter_outputs(responses)):
+        input_ids.append(output.input.id)
+        for region in output.data.regions:
+            data = region.region_info.mask.image.base64
+            if data:
+                input_index.append(output_number)
+                region_ids.append(region.id)
+                encoded.append(data)
+    return LazyMasks(
+        np.array(input_ids, dtype=str),
+        np.array(input_index, dtype=np.int32),
+        np.array(region_ids, dtype=str),
+        encoded,
+        cache_bytes=cache_bytes,
+        decoder=decoder,
+    )
+
+
+class _BytesLRU:
+    """A thread-safe least-recently-used cache of arrays, bounded by their total nbytes."""
+
+    def __init__(self, max_bytes):  # type: (int) -> None
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._arrays = collections.OrderedDict()  # type: collections.OrderedDict
+        self._lock = threading.Lock()
+
+    def get(self, key):  # type: (typing.Hashable) -> typing.Optional[np.ndarray]
+        with self._lock:
+            array = self._arrays.get(key)
+            if array is not None:
+                self._arrays.move_to_end(key)
+            return array
+
+    def put(self, key, array):  # type: (typing.Hashable, np.ndarray) -> None
+        if array.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._arrays.pop(key, None)
+            if previous is not None:
+                self.size -= previous.nbytes
+            self._arrays[key] = array
+            self.size += array.nbytes
+            while self.size > self.max_bytes:
+                _, evicted = self._arrays.popitem(last=False)
+                self.size -= evicted.nbytes
@@ -0,0 +1,316 @@
+"""
+Converts the EvalMetrics of GetModelVersionMetrics responses to NumPy arrays.
+
+  arrays = eval_metrics_to_arrays(stub.GetModelVersionMetrics(request, metadata=metadata))
+  arrays.binary.roc_auc                        # The ROC AUC of each concept.
+  fpr, tpr, thresholds = arrays.binary.roc_curve(arrays.binary.index("ai_l8TKp2h5"))
+  arrays.confusion.matrix                      # (actual, predicted) values.
+  arrays.cooccurrence.matrix                   # (row, column) counts.
+
+To compare model versions, align one's matrices to the other's concepts:
+
+  difference = new.confusion.matrix - old.confusion.reindex(new.confusion.concept_ids).matrix
+"""
+import operator
+import typing  # noqa
+from array import array
+
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.grpc.api import resources_pb2  # noqa
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError("clarifai_grpc.arrays requires numpy: pip install clarifai-grpc[numpy]")
+
+
+class BinaryMetricsArrays:
+    """
+    The per-concept metrics, one entry per BinaryMetrics, and their curves.
+
+    Curves have different lengths, so the points of all the curves are concatenated. Those of the
+    i-th ROC curve are at roc_offsets[i]:roc_offsets[i + 1] of fpr and tpr, and its thresholds,
+    which may be fewer, at roc_threshold_offsets[i]:roc_threshold_offsets[i + 1] of
+    roc_thresholds. Likewise for the precision-recall curves.
+    """
+
+    def __init__(
+        self,
+        concept_ids,  # type: np.ndarray
+        area_names,  # type: np.ndarray
+        counts,  # type: typing.Dict[str, np.ndarray]
+        scores,  # type: typing.Dict[str, np.ndarray]
+        roc,  # type: typing.Tuple[np.ndarray, ...]
+        precision_recall,  # type: typing.Tuple[np.ndarray, ...]
+    ):
+        # type: (...) -> None
+        """
+        Args:
+          concept_ids: the concept ID of each entry, a unicode array.
+          area_names: the area name of each entry, a unicode array.
+          counts: the int64 num_pos, num_neg and num_tot arrays, by name.
+          scores: the float32 roc_auc, f1, avg_precision and iou arrays, by name.
+          roc: the ROC curves' offsets, fpr, tpr, threshold offsets and thresholds.
+          precision_recall: the precision-recall curves' offsets, precision, recall, threshold
+            offsets and thresholds.
+        """
+        self.concept_ids = concept_ids
+        self.area_names = area_names
+        self.num_pos = counts["num_pos"]
+        self.num_neg = counts["num_neg"]
+        self.num_tot = counts["num_tot"]
+        self.roc_auc = scores["roc_auc"]
+        self.f1 = scores["f1"]
+        self.avg_precision = scores["avg_precision"]
+        self.iou = scores["iou"]
+        (
+            self.roc_offsets,
+            self.fpr,
+            self.tpr,
+            self.roc_threshold_offsets,
+            self.roc_thresholds,
+        ) = roc
+        (
+            self.pr_offsets,
+            self.precision,
+            self.recall,
+            self.pr_threshold_offsets,
+            self.pr_thresholds,
+        ) = precision_recall
+
+    def __len__(self):
+        return len(self.concept_ids)
+
+    def index(self, concept_id, area_name=""):  # type: (str, str) -> int
+        """The position of a concept's metrics. Raises a KeyError if there are none."""
+        matches = np.flatnonzero((self.concept_ids == concept_id) & (self.area_names == area_name))
+        if not len(matches):
+            raise KeyError((concept_id, area_name))
+        return int(matches[0])
+
+    def roc_curve(self, position):
+        # type: (int) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]
+        """The false positive rates, true positive rates and thresholds of a ROC curve."""
+        points = slice(self.roc_offsets[position], self.roc_offsets[position + 1])
+        thresholds = slice(
+            self.roc_threshold_offsets[position], self.roc_threshold_offsets[position + 1]
+        )
+        return self.fpr[points], self.tpr[points], self.roc_thresholds[thresholds]
+
+    def precision_recall_curve(self, position):
+        # type: (int) -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]
+        """The precisions, recalls and thresholds of a precision-recall curve."""
+        points = slice(self.pr_offsets[position], self.pr_offsets[position + 1])
+        thresholds = slice(
+            self.pr_threshold_offsets[position], self.pr_threshold_offsets[position + 1]
+        )
+        return self.precision[points], self.recall[points], self.pr_thresholds[thresholds]
+
+
+class ConceptMatrix:
+    def __init__(
+        self,
+        concept_ids,  # type: np.ndarray
+        matrix=None,  # type: typing.Optional[np.ndarray]
+        rows=None,  # type: typing.Optional[np.ndarray]
+        columns=None,  # type: typing.Optional[np.ndarray]
+        values=None,  # type: typing.Optional[np.ndarray]
+    ):
+        # type: (...) -> None
+        """
+        Args:
+          concept_ids: the concept ID of each row and column, a unicode array.
+          matrix: the dense (concepts, concepts) values, or None if sparse.
+          rows: if sparse, the int32 row of each value.
+          columns: if sparse, the int32 column of each value.
+          values: if sparse, the values.
+        """
+        self.concept_ids = concept_ids
+        self.matrix = matrix
+        self.rows = rows
+        self.columns = columns
+        self.values = values
+
+    @property
+    def is_sparse(self):  # type: () -> bool
+        return self.matrix is None
+
+    def index(self, concept_id):  # type: (str) -> int
+        """The row and column of a concept. Raises a KeyError if it is not in the matrix."""
+        matches = np.flatnonzero(self.concept_ids == concept_id)
+        if not len(matches):
+            raise KeyError(concept_id)
+        return int(matches[0])
+
+    def to_dense(self):  # type: () -> np.ndarray
+        if not self.is_sparse:
+            return self.matrix
+        matrix = np.zeros((len(self.concept_ids),) * 2, dtype=self.values.dtype)
+        matrix[self.rows, self.columns] = self.values
+        return matrix
+
+    def reindex(self, concept_ids):  # type: (typing.Iterable[str]) -> ConceptMatrix
+        """
+        The matrix with the given concepts' rows and columns, in their order, e.g. those of
+        another model version's matrix. The concepts not in this matrix get zeros.
+        """
+        concept_ids = np.array(list(concept_ids), dtype=str)
+        positions = {concept_id: i for i, concept_id in enumerate(concept_ids)}
+        # Where each of this matrix's concepts goes, or -1 if it is dropped.
+        new_index = np.array(
+            [positions.get(concept_id, -1) for concept_id in self.concept_ids], dtype=np.int32
+        )
+        rows, columns, values = self._coordinates()
+        rows, columns = new_index[rows], new_index[columns]
+        kept = (rows >= 0) & (columns >= 0)
+        reindexed = ConceptMatrix(
+            concept_ids, rows=rows[kept], columns=columns[kept], values=values[kept]
+        )
+        if not self.is_sparse:
+            reindexed.matrix = reindexed.to_dense()
+            reindexed.rows = reindexed.columns = reindexed.values = None
+        return reindexed
+
+    def _coordinates(self):  # type: () -> typing.Tuple[np.ndarray, np.ndarray, np.ndarray]
+        if self.is_sparse:
+            return self.rows, self.columns, self.values
+        rows, columns = np.nonzero(self.matrix)
+        return rows, columns, self.matrix[rows, columns]
+
+
+class EvalMetricsArrays:
+    def __init__(self, binary, confusion, cooccurrence):
+        # type: (BinaryMetricsArrays, ConceptMatrix, ConceptMatrix) -> None
+        self.binary = binary
+        self.confusion = confusion
+        self.cooccurrence = cooccurrence
+
+
+def eval_metrics_to_arrays(metrics, sparse=False):
+    # type: (typing.Any, bool) -> EvalMetricsArrays
+    """
+    Args:
+      metrics: an EvalMetrics, or a response with a model_version, such as the response of
+        GetModelVersionMetrics.
+      sparse: whether to keep the matrices' values as coordinates instead of dense matrices.
+    """
+    if hasattr(metrics, "model_version"):
+        metrics = metrics.model_version.metrics
+    return EvalMetricsArrays(
+        binary_metrics_to_arrays(metrics.binary_metrics),
+        confusion_matrix_to_arrays(metrics.confusion_matrix, sparse),
+        cooccurrence_matrix_to_arrays(metrics.cooccurrence_matrix, sparse),
+    )
+
+
+def binary_metrics_to_arrays(binary_metrics):
+    # type: (typing.Iterable[resources_pb2.BinaryMetrics]) -> BinaryMetricsArrays
+    concept_ids = []  # type: typing.List[str]
+    area_names = []  # type: typing.List[str]
+    counts = {name: array("q") for name in ("num_pos", "num_neg", "num_tot")}
+    scores = {name: array("f") for name in ("roc_auc", "f1", "avg_precision", "iou")}
+    roc = (array("q", [0]), array("f"), array("f"), array("q", [0]), array("f"))
+    precision_recall = (array("q", [0]), array("f"), array("f"), array("q", [0]), array("f"))
+
+    for metrics in binary_metrics:
+        concept_ids.append(metrics.concept.id)
+        area_names.append(metrics.area_name)
+        for name, values in counts.items():
+            values.append(getattr(metrics, name))
+        for name, values in scores.items():
+            values.append(getattr(metrics, name))
+        _add_curve(roc, metrics.roc_curve, ("fpr", "tpr", "thresholds"))
+        _add_curve(
+            precision_recall,
+            metrics.precision_recall_curve,
+            ("precision", "recall", "thresholds"),
+        )
+
+    return BinaryMetricsArrays(
+        np.array(concept_ids, dtype=str),
+        np.array(area_names, dtype=str),
+        {name: np.array(values, dtype=np.int64) for name, values in counts.items()},
+        {name: np.array(values, dtype=np.float32) for name, values in scores.items()},
+        _curve_arrays(roc),
+        _curve_arrays(precision_recall),
+    )
+
+
+def confusion_matrix_to_arrays(confusion_matrix, sparse=False):
+    # type: (resources_pb2.ConfusionMatrix, bool) -> ConceptMatrix
+    """The (actual, predicted) values of a ConfusionMatrix."""
+    return _matrix_to_arrays(
+        confusion_matrix, "actual", "predicted", "value", array("f"), np.float32, sparse
+    )
+
+
+def cooccurrence_matrix_to_arrays(cooccurrence_matrix, sparse=False):
+    # type: (resources_pb2.CooccurrenceMatrix, bool) -> ConceptMatrix
+    """The (row, col) counts of a CooccurrenceMatrix."""
+    return _matrix_to_arrays(
+        cooccurrence_matrix, "row", "col", "count", array("q"), np.int64, sparse
+    )
+
+
+def _add_curve(buffers, curve, fields):
+    # type: (typing.Tuple[array, ...], typing.Any, typing.Tuple[str, str, str]) -> None
+    """Appends a curve's points, whose two coordinates must pair up, and its thresholds."""
+    offsets, xs, ys, threshold_offsets, thresholds = buffers
+    x_field, y_field, thresholds_field = fields
+    curve_xs, curve_ys = getattr(curve, x_field), getattr(curve, y_field)
+    if len(curve_xs) != len(curve_ys):
+        raise ClarifaiException(
+            "A %s has %d %s but %d %s"
+            % (curve.DESCRIPTOR.name, len(curve_xs), x_field, len(curve_ys), y_field)
+        )
+    xs.extend(curve_xs)
+    ys.extend(curve_ys)
+    offsets.append(len(xs))
+    thresholds.extend(getattr(curve, thresholds_field))
+    threshold_offsets.append(len(thresholds))
+
+
+def _curve_arrays(buffers):  # type: (typing.Tuple[array, ...]) -> typing.Tuple[np.ndarray, ...]
+    offsets, xs, ys, threshold_offsets, thresholds = buffers
+    return (
+        np.array(offsets, dtype=np.int64),
+        np.array(xs, dtype=np.float32),
+        np.array(ys, dtype=np.float32),
+        np.array(threshold_offsets, dtype=np.int64),
+        np.array(thresholds, dtype=np.float32),
+    )
+
+
+def _matrix_to_arrays(message, row_field, column_field, value_field, values, dtype, sparse):
+    # type: (typing.Any, str, str, str, array, typing.Any, bool) -> ConceptMatrix
+    concept_indexes = {
+        concept_id: i for i, concept_id in enumerate(message.concept_ids)
+    }  # type: typing.Dict[str, int]
+    get_row = operator.attrgetter(row_field)
+    get_column = operator.attrgetter(column_field)
+    get_value = operator.attrgetter(value_field)
+
+    def index_of(concept_id):  # type: (str) -> int
+        index = concept_indexes.get(concept_id)
+        if index is None:
+            # Not in concept_ids, which should not happen, but the entry is kept anyway.
+            index = concept_indexes[concept_id] = len(concept_indexes)
+        return index
+
+    rows = array("i")
+    columns = array("i")
+    for entry in message.matrix:
+        rows.append(index_of(get_row(entry)))
+        columns.append(index_of(get_column(entry)))
+        values.append(get_value(entry))
+
+    matrix = ConceptMatrix(
+        np.array(list(concept_indexes), dtype=str),
+        rows=np.array(rows, dtype=np.int32),
+        columns=np.array(columns, dtype=np.int32),
+        values=np.array(values, dtype=dtype),
+    )
+    if not sparse:
+        matrix.matrix = matrix.to_dense()
+        matrix.rows = matrix.columns = matrix.values = None
+    return matrix
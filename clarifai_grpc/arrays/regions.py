@@ -0,0 +1,142 @@
+"""
+Converts the regions of detection outputs to columnar arrays, one row per region concept.
+
+  arrays = regions_to_arrays(stub.PostModelOutputs(request, metadata=metadata))
+  arrays.input_ids[arrays.input_index]  # The input ID of each row.
+  arrays.boxes                          # (rows, 4) top_row, left_col, bottom_row, right_col.
+  arrays.concept_ids, arrays.values     # The concept of each row and its value.
+  people = arrays.filter(min_value=0.5, concept_ids=["ai_l8TKp2h5"])
+
+Regions without concepts get one row with a concept_index of -1 and a NaN value.
+"""
+import typing  # noqa
+
+from clarifai_grpc.arrays.embeddings import _iter_outputs
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError("clarifai_grpc.arrays requires numpy: pip install clarifai-grpc[numpy]")
+
+NO_CONCEPT = -1
+
+
+class RegionArrays:
+    def __init__(
+        self,
+        input_ids,  # type: np.ndarray
+        input_index,  # type: np.ndarray
+        region_ids,  # type: np.ndarray
+        boxes,  # type: np.ndarray
+        concepts,  # type: np.ndarray
+        concept_index,  # type: np.ndarray
+        values,  # type: np.ndarray
+    ):
+        # type: (...) -> None
+        """
+        Args:
+          input_ids: the input ID of each output, a unicode array.
+          input_index: the int32 index in input_ids of each row.
+          region_ids: the region ID of each row, a unicode array.
+          boxes: the (rows, 4) float32 bounding boxes, as top_row, left_col, bottom_row and
+            right_col.
+          concepts: the distinct concept IDs, a unicode array.
+          concept_index: the int32 index in concepts of each row, or NO_CONCEPT.
+          values: the float32 concept value of each row.
+        """
+        self.input_ids = input_ids
+        self.input_index = input_index
+        self.region_ids = region_ids
+        self.boxes = boxes
+        self.concepts = concepts
+        self.concept_index = concept_index
+        self.values = values
+
+    @property
+    def concept_ids(self):  # type: () -> np.ndarray
+        """The concept ID of each row, empty for the regions without concepts."""
+        return np.append(self.concepts, "")[self.concept_index]
+
+    def __len__(self):
+        return len(self.input_index)
+
+    def __getitem__(self, selection):  # type: (typing.Any) -> RegionArrays
+        """The rows selected by a boolean mask, an index array or a slice."""
+        return RegionArrays(
+            self.input_ids,
+            self.input_index[selection],
+            self.region_ids[selection],
+            self.boxes[selection],
+            self.concepts,
+            self.concept_index[selection],
+            self.values[selection],
+        )
+
+    def filter(self, min_value=None, concept_ids=None):
+        # type: (typing.Optional[float], typing.Optional[typing.Iterable[str]]) -> RegionArrays
+        """
+        Args:
+          min_value: if set, keeps the rows with at least this value.
+          concept_ids: if set, keeps the rows of these concepts.
+
+        Returns:
+          The kept rows.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if min_value is not None:
+            mask &= self.values >= min_value
+        if concept_ids is not None:
+            wanted = np.flatnonzero(np.isin(self.concepts, list(concept_ids)))
+            mask &= np.isin(self.concept_index, wanted)
+        return self[mask]
+
+
+def regions_to_arrays(responses):  # type: (typing.Any) -> RegionArrays
+    """
+    Args:
+      responses: a PostModelOutputsResponse or an Output, or an iterable of either, such as a
+        generator of responses.
+
+    Returns:
+      The regions' rows, in the order of the outputs, regions and concepts.
+    """
+    input_ids = []  # type: typing.List[str]
+    input_index = []  # type: typing.List[int]
+    region_ids = []  # type: typing.List[str]
+    coordinates = []  # type: typing.List[float]
+    concept_index = []  # type: typing.List[int]
+    values = []  # type: typing.List[float]
+    concept_indexes = {}  # type: typing.Dict[str, int]
+
+    for output_number, output in enumerate(_iter_outputs(responses)):
+        input_ids.append(output.input.id)
+        for region in output.data.regions:
+            box = region.region_info.bounding_box
+            box_coordinates = (box.top_row, box.left_col, box.bottom_row, box.right_col)
+            concepts = region.data.concepts
+            if not concepts:
+                input_index.append(output_number)
+                region_ids.append(region.id)
+                coordinates.extend(box_coordinates)
+                concept_index.append(NO_CONCEPT)
+                values.append(np.nan)
+                continue
+            for concept in concepts:
+                index = concept_indexes.get(concept.id)
+                if index is None:
+                    index = concept_indexes[concept.id] = len(concept_indexes)
+                input_index.append(output_number)
+                region_ids.append(region.id)
+                coordinates.extend(box_coordinates)
+                concept_index.append(index)
+                values.append(concept.value)
+
+    return RegionArrays(
+        input_ids=np.array(input_ids, dtype=str),
+        input_index=np.array(input_index, dtype=np.int32),
+        region_ids=np.array(region_ids, dtype=str),
+        boxes=np.array(coordinates, dtype=np.float32).reshape(-1, 4),
+        concepts=np.array(list(concept_indexes), dtype=str),
+        concept_index=np.array(concept_index, dtype=np.int32),
+        values=np.array(values, dtype=np.float32),
+    )
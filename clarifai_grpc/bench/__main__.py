@@ -0,0 +1,3 @@
+from clarifai_grpc.bench.load import main
+
+main()
@@ -0,0 +1,85 @@
+"""
+Measures the import time of clarifai_grpc modules with `python -X importtime` in fresh
+interpreters, and prints the results as JSON. Needs Python 3.7+, which added -X importtime.
+
+Usage:
+  python -m clarifai_grpc.bench.import_time [module ...] [--repeat N]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import typing  # noqa
+
+DEFAULT_MODULES = [
+    "clarifai_grpc.channel.clarifai_channel",
+    "clarifai_grpc.grpc.api.service_pb2_grpc",
+    "clarifai_grpc.channel.grpc_json_channel",
+]
+
+# The first version with -X importtime. Older ones ignore the option and print nothing.
+IMPORTTIME_MIN_VERSION = (3, 7)
+
+
+def import_profile(module):  # type: (str) -> typing.Dict[str, int]
+    """
+    Imports the module in a fresh interpreter.
+    :param module: The module name.
+    :return: A dict of every module that got imported to its cumulative import time in
+             microseconds.
+    """
+    if sys.version_info < IMPORTTIME_MIN_VERSION:
+        raise RuntimeError("Measuring import times needs Python 3.7+ for -X importtime")
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    profile = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        cumulative = cumulative.strip()
+        if not cumulative.isdigit():
+            continue  # The header line.
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def measure(module, repeat=5):  # type: (str, int) -> dict
+    """
+    :param module: The module name.
+    :param repeat: How many fresh interpreters to measure in.
+    :return: The median and minimum cumulative import time of the module in microseconds, and
+             the names of all the modules it imported.
+    """
+    profiles = [import_profile(module) for _ in range(repeat)]
+    times = [p[module] for p in profiles]
+    return {
+        "module": module,
+        "median_us": int(statistics.median(times)),
+        "min_us": min(times),
+        "imported_modules": sorted(profiles[0]),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure clarifai_grpc import times.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = []
+    for module in args.modules:
+        result = measure(module, args.repeat)
+        del result["imported_modules"]
+        results.append(result)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+A load generator for the V2 API through this client.
+
+Usage:
+  python -m clarifai_grpc.bench --channel json --fake --mix predict=3,list=1 --concurrency 16 \\
+      --duration 10
+
+It drives a weighted mix of calls at a fixed concurrency, optionally capped at a target QPS, and
+reports throughput, latency percentiles, error rates, and the client's CPU time and memory.
+Use --fake to run against an in-process FakeV2Server instead of a real endpoint.
+"""
+import argparse
+import collections
+import json
+import os
+import random
+import threading
+import time
+import typing  # noqa
+
+from clarifai_grpc.bench import payloads
+from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2, service_pb2_grpc
+from clarifai_grpc.grpc.api.status import status_code_pb2
+
+try:
+    import resource
+except ImportError:  # Windows.
+    resource = None
+
+CHANNEL_TYPES = ("grpc", "insecure-grpc", "json")
+
+
+def _predict(stub, metadata, rng, options):
+    return stub.PostModelOutputs(
+        service_pb2.PostModelOutputsRequest(
+            model_id=options["model_id"],
+            inputs=[payloads.input_message(rng.randrange(1000)) for _ in range(options["batch"])],
+        ),
+        metadata=metadata,
+    )
+
+
+def _list(stub, metadata, rng, options):
+    return stub.ListInputs(
+        service_pb2.ListInputsRequest(page=1, per_page=options["per_page"]), metadata=metadata
+    )
+
+
+def _search(stub, metadata, rng, options):
+    return stub.PostInputsSearches(
+        service_pb2.PostInputsSearchesRequest(
+            searches=[
+                resources_pb2.Search(
+                    query=resources_pb2.Query(
+                        ranks=[
+                            resources_pb2.Rank(
+                                annotation=resources_pb2.Annotation(
+                                    data=resources_pb2.Data(
+                                        concepts=[resources_pb2.Concept(id="dog", value=1)]
+                                    )
+                                )
+                            )
+                        ]
+                    )
+                )
+            ],
+            pagination=service_pb2.Pagination(page=1, per_page=options["per_page"]),
+        ),
+        metadata=metadata,
+    )
+
+
+def _post_inputs(stub, metadata, rng, options):
+    inputs = []
+    for _ in range(options["batch"]):
+        input_ = payloads.input_message(rng.randrange(1000))
+        input_.id = "bench-%016x" % rng.getrandbits(64)
+        inputs.append(input_)
+    return stub.PostInputs(service_pb2.PostInputsRequest(inputs=inputs), metadata=metadata)
+
+
+OPERATIONS = {
+    "predict": _predict,
+    "list": _list,
+    "search": _search,
+    "post_inputs": _post_inputs,
+}
+
+
+def parse_mix(mix):  # type: (str) -> typing.Dict[str, float]
+    """Parses e.g. "predict=3,list=1" into {"predict": 3.0, "list": 1.0}."""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError("Unknown operation %r, choose from %s" % (name, sorted(OPERATIONS)))
+        weights[name] = float(weight) if weight else 1.0
+    return weights
+
+
+def percentile(sorted_values, fraction):  # type: (typing.List[float], float) -> float
+    """The nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class _RateLimiter:
+    """Spaces out call starts to the target QPS across all the worker threads."""
+
+    def __init__(self, qps):  # type: (float) -> None
+        self._interval = 1.0 / qps
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):  # type: () -> None
+        with self._lock:
+            start_at = self._next
+            self._next = max(self._next, time.monotonic()) + self._interval
+        delay = start_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _Recorder:
+    def __init__(self):
+        self.latencies = collections.defaultdict(list)
+        self.errors = collections.defaultdict(collections.Counter)
+        self._lock = threading.Lock()
+
+    def record(self, operation, latency, error):
+        with self._lock:
+            self.latencies[operation].append(latency)
+            if error is not None:
+                self.errors[operation][error] += 1
+
+
+def _summary(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    error_count = sum(errors.values())
+    return {
+        "calls": len(latencies),
+        "errors": error_count,
+        "error_rate": error_count / len(latencies) if latencies else 0.0,
+        "error_kinds": dict(errors),
+        "throughput_per_s": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "mean": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": 1000 * percentile(latencies, 0.5),
+            "p90": 1000 * percentile(latencies, 0.9),
+            "p99": 1000 * percentile(latencies, 0.99),
+            "max": 1000 * latencies[-1] if latencies else 0.0,
+        },
+    }
+
+
+def _peak_rss_mb():  # type: () -> typing.Optional[float]
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024) if os.uname().sysname == "Darwin" else peak / 1024
+
+
+def run_load(
+    stub,  # type: service_pb2_grpc.V2Stub
+    metadata,  # type: tuple
+    mix,  # type: typing.Dict[str, float]
+    concurrency=8,  # type: int
+    duration=10.0,  # type: typing.Optional[float]
+    total_requests=None,  # type: typing.Optional[int]
+    qps=None,  # type: typing.Optional[float]
+    options=None,  # type: typing.Optional[dict]
+    seed=None,  # type: typing.Optional[int]
+):
+    # type: (...) -> dict
+    """
+    Drives the mix of calls until `duration` seconds passed or `total_requests` calls were made.
+
+    Args:
+      stub: the stub to call.
+      metadata: the call metadata.
+      mix: the relative weight of each operation, see parse_mix.
+      concurrency: the number of worker threads, each making one call at a time.
+      duration: how many seconds to run for.
+      total_requests: how many calls to make in total. Takes precedence over duration.
+      qps: an optional cap on the number of calls started per second.
+      options: per-operation options: model_id, batch and per_page.
+      seed: the seed of the random operation choices.
+    Returns:
+      The machine-readable report.
+    """
+    options = dict(
+        {"model_id": payloads.GENERAL_MODEL_ID, "batch": 1, "per_page": 20}, **(options or {})
+    )
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    rate_limiter = _RateLimiter(qps) if qps else None
+    recorder = _Recorder()
+    seeds = random.Random(seed)
+
+    remaining = [total_requests]
+    remaining_lock = threading.Lock()
+
+    def take_ticket():
+        if total_requests is None:
+            return time.monotonic() < deadline
+        with remaining_lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker(rng):
+        while take_ticket():
+            if rate_limiter is not None:
+                rate_limiter.wait()
+            name = rng.choices(names, weights)[0]
+            error = None
+            start = time.perf_counter()
+            try:
+                response = OPERATIONS[name](stub, metadata, rng, options)
+                if response.status.code != status_code_pb2.SUCCESS:
+                    error = "status_%d" % response.status.code
+            except Exception as e:
+                error = type(e).__name__
+            recorder.record(name, time.perf_counter() - start, error)
+
+    cpu_start = time.process_time()
+    start = time.monotonic()
+    deadline = start + (duration or 0)
+    threads = [
+        threading.Thread(target=worker, args=(random.Random(seeds.random()),), daemon=True)
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    cpu = time.process_time() - cpu_start
+
+    all_latencies = [t for latencies in recorder.latencies.values() for t in latencies]
+    all_errors = collections.Counter()
+    for errors in recorder.errors.values():
+        all_errors.update(errors)
+
+    return {
+        "config": {
+            "mix": mix,
+            "concurrency": concurrency,
+            "qps": qps,
+            "duration": duration,
+            "total_requests": total_requests,
+            "options": options,
+        },
+        "elapsed_s": elapsed,
+        "overall": _summary(all_latencies, all_errors, elapsed),
+        "operations": {
+            name: _summary(recorder.latencies[name], recorder.errors[name], elapsed)
+            for name in sorted(recorder.latencies)
+        },
+        "client": {
+            "cpu_s": cpu,
+            "cpu_utilization": cpu / elapsed if elapsed > 0 else 0.0,
+            "peak_rss_mb": _peak_rss_mb(),
+        },
+    }
+
+
+def make_stub(channel_type, endpoint=None, **json_options):
+    # type: (str, typing.Optional[str], typing.Any) -> service_pb2_grpc.V2Stub
+    """
+    :param channel_type: One of CHANNEL_TYPES.
+    :param endpoint: The base URL for json, host[:port] for the gRPC channels. The channel
+                     factory's default when not set.
+    :param json_options: Other arguments of ClarifaiChannel.get_json_channel.
+    """
+    if channel_type == "json":
+        if endpoint:
+            channel = ClarifaiChannel.get_json_channel(endpoint, **json_options)
+        else:
+            channel = ClarifaiChannel.get_json_channel(**json_options)
+    elif channel_type == "grpc":
+        channel = ClarifaiChannel.get_grpc_channel(endpoint)
+    elif channel_type == "insecure-grpc":
+        host, _, port = (endpoint or "").partition(":")
+        channel = ClarifaiChannel.get_insecure_grpc_channel(host or None, int(port or 18080))
+    else:
+        raise ValueError("Unknown channel type %r, choose from %s" % (channel_type, CHANNEL_TYPES))
+    return service_pb2_grpc.V2Stub(channel)
+
+
+def format_report(report):  # type: (dict) -> str
+    lines = [
+        "%-12s %8s %8s %10s %9s %9s %9s %9s"
+        % ("operation", "calls", "errors", "calls/s", "p50 ms", "p90 ms", "p99 ms", "max ms")
+    ]
+    rows = list(report["operations"].items()) + [("overall", report["overall"])]
+    for name, summary in rows:
+        latency = summary["latency_ms"]
+        lines.append(
+            "%-12s %8d %8d %10.1f %9.2f %9.2f %9.2f %9.2f"
+            % (
+                name,
+                summary["calls"],
+                summary["errors"],
+                summary["throughput_per_s"],
+                latency["p50"],
+                latency["p90"],
+                latency["p99"],
+                latency["max"],
+            )
+        )
+    client = report["client"]
+    lines.append(
+        "client: %.2fs CPU (%.0f%% of wall time), peak RSS %s MB"
+        % (
+            client["cpu_s"],
+            100 * client["cpu_utilization"],
+            "%.1f" % client["peak_rss_mb"] if client["peak_rss_mb"] is not None else "n/a",
+        )
+    )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m clarifai_grpc.bench", description="Generate load on the V2 API."
+    )
+    parser.add_argument("--channel", choices=CHANNEL_TYPES, default="grpc")
+    parser.add_argument("--endpoint", help="Base URL (json) or host[:port] (gRPC).")
+    parser.add_argument("--fake", action="store_true", help="Run against a local fake server.")
+    parser.add_argument("--fake-latency", type=float, default=0.0, help="Seconds per fake call.")
+    parser.add_argument("--api-key", default=os.environ.get("CLARIFAI_API_KEY", "bench-key"))
+    parser.add_argument("--mix", default="predict=1", help="E.g. predict=3,list=1,search=1.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--qps", type=float, help="Cap on the calls started per second.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run for.")
+    parser.add_argument("--requests", type=int, help="Total calls to make, instead of duration.")
+    parser.add_argument("--model-id", default=payloads.GENERAL_MODEL_ID)
+    parser.add_argument("--batch", type=int, default=1, help="Inputs per predict/post call.")
+    parser.add_argument("--per-page", type=int, default=20, help="Page size of list/search.")
+    parser.add_argument(
+        "--per-thread-sessions",
+        action="store_true",
+        help="Give each thread of the json channel its own HTTP session.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    options = {"model_id": args.model_id, "batch": args.batch, "per_page": args.per_page}
+    metadata = (("authorization", "Key " + args.api_key),)
+
+    server = None
+    if args.fake:
+        from clarifai_grpc.testing.fake_server import FakeV2Server, FaultInjection
+
+        server = FakeV2Server(faults=FaultInjection(latency=args.fake_latency)).start()
+        if args.channel == "json":
+            endpoint = server.base_url
+        else:
+            args.channel = "insecure-grpc"
+            endpoint = "%s:%d" % (server.grpc_host, server.grpc_port)
+    else:
+        endpoint = args.endpoint
+
+    json_options = {}
+    if args.channel == "json":
+        json_options = {
+            "concurrency": args.concurrency,
+            "per_thread_sessions": args.per_thread_sessions,
+        }
+
+    try:
+        stub = make_stub(args.channel, endpoint, **json_options)
+        report = run_load(
+            stub,
+            metadata,
+            mix,
+            concurrency=args.concurrency,
+            duration=args.duration,
+            total_requests=args.requests,
+            qps=args.qps,
+            options=options,
+        )
+    finally:
+        if server is not None:
+            server.stop()
+
+    report["config"]["channel"] = args.channel
+    report["config"]["endpoint"] = endpoint
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
@@ -0,0 +1,325 @@
+"""
+Microbenchmarks of the channels' hot paths. Everything runs against local stub servers, so no
+network access or API key is needed.
+
+Usage:
+  python -m clarifai_grpc.bench.micro [--filter SUBSTRING] [--repeat N] [--output results.json]
+                                      [--compare previous_results.json]
+
+The results are printed (or written) as JSON, so runs of different versions can be compared with
+--compare.
+"""
+import argparse
+import contextlib
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+import typing  # noqa
+from concurrent import futures
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import google.protobuf
+import grpc
+from google.protobuf.internal import api_implementation
+
+from clarifai_grpc.bench import payloads
+from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.custom_converters.custom_dict_to_message import dict_to_protobuf
+from clarifai_grpc.channel.custom_converters.custom_message_to_dict import protobuf_to_dict
+from clarifai_grpc.channel.custom_converters.custom_struct_converters import (
+    dicts_to_structs,
+    structs_to_dicts,
+)
+from clarifai_grpc.channel.grpc_json_channel import GRPCJSONChannel, _pick_proper_endpoint
+from clarifai_grpc.channel.http_client import HttpClient
+from clarifai_grpc.channel.lazy_response import LazyMessage
+from clarifai_grpc.grpc.api import service_pb2, service_pb2_grpc
+
+METADATA = (("authorization", "Key bench-key"),)
+# The benchmarks of _round_trip_benchmarks, which need local servers.
+ROUND_TRIP_BENCHMARKS = (
+    "http_client.execute_request",
+    "round_trip.json.post_model_outputs",
+    "round_trip.grpc.post_model_outputs",
+)
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _CannedJSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        body = self.server.canned_body
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalJSONServer:
+    """An HTTP server on localhost that answers every request with the same JSON body."""
+
+    def __init__(self, canned_response_dict):  # type: (dict) -> None
+        self._server = _ThreadingHTTPServer(("127.0.0.1", 0), _CannedJSONHandler)
+        self._server.canned_body = json.dumps(canned_response_dict).encode("utf-8")
+        self.base_url = "http://127.0.0.1:%d" % self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _CannedPredictServicer(service_pb2_grpc.V2Servicer):
+    def __init__(self, response):
+        self._response = response
+
+    def PostModelOutputs(self, request, context):
+        return self._response
+
+
+class LocalGRPCServer:
+    """A gRPC server on localhost whose PostModelOutputs always returns the same response."""
+
+    def __init__(self, canned_response):  # type: (service_pb2.MultiOutputResponse) -> None
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        service_pb2_grpc.add_V2Servicer_to_server(
+            _CannedPredictServicer(canned_response), self._server
+        )
+        self.address = ("127.0.0.1", self._server.add_insecure_port("127.0.0.1:0"))
+
+    def __enter__(self):
+        self._server.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.stop(None)
+
+
+def time_function(func, number, repeat):
+    # type: (typing.Callable[[], typing.Any], int, int) -> typing.List[float]
+    """:return: The mean seconds per call of each of the `repeat` runs of `number` calls."""
+    func()  # Warm up.
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+
+def _result(name, number, timings):
+    return {
+        "name": name,
+        "number": number,
+        "repeat": len(timings),
+        "mean_us": statistics.mean(timings) * 1e6,
+        "median_us": statistics.median(timings) * 1e6,
+        "min_us": min(timings) * 1e6,
+        "stdev_us": statistics.stdev(timings) * 1e6 if len(timings) > 1 else 0.0,
+    }
+
+
+def _converter_benchmarks():
+    request = payloads.post_model_outputs_request(num_inputs=8)
+    response = payloads.concept_outputs(num_outputs=8, num_concepts=20)
+    response_dict = protobuf_to_dict(response, use_integers_for_enums=False)
+    inputs_dict = protobuf_to_dict(
+        payloads.list_inputs_response(num_inputs=100), use_integers_for_enums=False
+    )
+    structs = [payloads.metadata_struct(i) for i in range(100)]
+    metadata_dicts = structs_to_dicts(structs)
+
+    return [
+        (
+            "protobuf_to_dict.post_model_outputs_request",
+            lambda: protobuf_to_dict(
+                request, use_integers_for_enums=False, ignore_show_empty=True
+            ),
+            100,
+        ),
+        (
+            "protobuf_to_dict.multi_output_response",
+            lambda: protobuf_to_dict(response, use_integers_for_enums=False),
+            20,
+        ),
+        (
+            "dict_to_protobuf.multi_output_response",
+            lambda: dict_to_protobuf(
+                service_pb2.MultiOutputResponse, response_dict, ignore_unknown_fields=True
+            ),
+            20,
+        ),
+        (
+            "dict_to_protobuf.list_inputs_response_100",
+            lambda: dict_to_protobuf(
+                service_pb2.MultiInputResponse, inputs_dict, ignore_unknown_fields=True
+            ),
+            10,
+        ),
+        (
+            "lazy_response.list_inputs_response_100_ids",
+            lambda: [
+                i.id for i in LazyMessage(service_pb2.MultiInputResponse, inputs_dict).inputs
+            ],
+            100,
+        ),
+        ("structs_to_dicts.metadata_100", lambda: structs_to_dicts(structs), 20),
+        ("dicts_to_structs.metadata_100", lambda: dicts_to_structs(metadata_dicts), 10),
+    ]
+
+
+def _channel_benchmarks():
+    channel = GRPCJSONChannel(session=None)
+    resources = channel.name_to_resources["/clarifai.api.V2/PostModelOutputs"][1]
+    params = protobuf_to_dict(
+        payloads.post_model_outputs_request(),
+        use_integers_for_enums=False,
+        ignore_show_empty=True,
+    )
+    return [
+        (
+            "pick_proper_endpoint.post_model_outputs",
+            lambda: _pick_proper_endpoint(resources, params),
+            1000,
+        ),
+        ("grpc_json_channel.construction", lambda: GRPCJSONChannel(session=None), 5),
+    ]
+
+
+def _round_trip_benchmarks(stack):  # type: (contextlib.ExitStack) -> list
+    request = payloads.post_model_outputs_request(num_inputs=8)
+    response = payloads.concept_outputs(num_outputs=8, num_concepts=20)
+    response_dict = protobuf_to_dict(response, use_integers_for_enums=False)
+
+    json_server = stack.enter_context(LocalJSONServer(response_dict))
+    grpc_server = stack.enter_context(LocalGRPCServer(response))
+
+    session = ClarifaiChannel._make_requests_session()
+    http_client = HttpClient(session, "bench-key")
+    params = protobuf_to_dict(request, use_integers_for_enums=False, ignore_show_empty=True)
+    url = json_server.base_url + "/v2/models/%s/outputs" % payloads.GENERAL_MODEL_ID
+
+    # A stub must be created right after its channel, since the channel factory decides how the
+    # stub deserializes responses.
+    json_stub = service_pb2_grpc.V2Stub(ClarifaiChannel.get_json_channel(json_server.base_url))
+    grpc_channel = stack.enter_context(
+        ClarifaiChannel.get_insecure_grpc_channel(*grpc_server.address)
+    )
+    grpc_stub = service_pb2_grpc.V2Stub(grpc_channel)
+
+    return [
+        (
+            "http_client.execute_request",
+            lambda: http_client.execute_request("POST", params, url),
+            50,
+        ),
+        (
+            "round_trip.json.post_model_outputs",
+            lambda: json_stub.PostModelOutputs(request, metadata=METADATA),
+            20,
+        ),
+        (
+            "round_trip.grpc.post_model_outputs",
+            lambda: grpc_stub.PostModelOutputs(request, metadata=METADATA),
+            50,
+        ),
+    ]
+
+
+def run(name_filter="", repeat=5, number_scale=1.0):
+    # type: (str, int, float) -> dict
+    """
+    Runs the benchmarks.
+    :param name_filter: Only run the benchmarks whose name contains this substring.
+    :param repeat: How many times each benchmark is timed.
+    :param number_scale: Scales the number of calls per timing, e.g. 0.1 for a quick smoke run.
+    :return: The machine-readable results.
+    """
+    with contextlib.ExitStack() as stack:
+        benchmarks = _converter_benchmarks() + _channel_benchmarks()
+        if any(name_filter in name for name in ROUND_TRIP_BENCHMARKS):
+            benchmarks += _round_trip_benchmarks(stack)
+
+        results = []
+        for name, func, number in benchmarks:
+            if name_filter not in name:
+                continue
+            number = max(1, int(number * number_scale))
+            results.append(_result(name, number, time_function(func, number, repeat)))
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": sys.platform,
+            "protobuf": google.protobuf.__version__,
+            "protobuf_implementation": api_implementation.Type(),
+            "grpcio": grpc.__version__ if hasattr(grpc, "__version__") else "unknown",
+        },
+        "results": results,
+    }
+
+
+def compare(current, previous):  # type: (dict, dict) -> typing.List[str]
+    """:return: One line per benchmark present in both runs, with the ratio of median times."""
+    previous_medians = {r["name"]: r["median_us"] for r in previous["results"]}
+    lines = []
+    for result in current["results"]:
+        if result["name"] not in previous_medians:
+            continue
+        ratio = result["median_us"] / previous_medians[result["name"]]
+        lines.append(
+            "%-50s %10.1fus -> %10.1fus  (x%.2f)"
+            % (result["name"], previous_medians[result["name"]], result["median_us"], ratio)
+        )
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the clarifai_grpc microbenchmarks.")
+    parser.add_argument("--filter", default="", help="Only run benchmarks containing this.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="Scales the calls per timing.")
+    parser.add_argument("--output", help="Write the JSON results to this file.")
+    parser.add_argument("--compare", help="A previous JSON results file to compare against.")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.repeat, args.scale)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        for line in compare(results, previous):
+            print(line, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Representative request and response payloads used by the benchmarks."""
+from google.protobuf.struct_pb2 import Struct
+
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+from clarifai_grpc.grpc.api.status import status_code_pb2, status_pb2
+
+GENERAL_MODEL_ID = "aaa03c23b3724a16a56b629203edc62c"
+IMAGE_URL = "https://samples.clarifai.com/dog2.jpeg"
+
+
+def metadata_struct(index):  # type: (int) -> Struct
+    metadata = Struct()
+    metadata.update(
+        {
+            "id": "video-%d" % index,
+            "group": str(index % 5),
+            "labels": ["label-a", "label-b"],
+            "score": 0.5,
+            "reviewed": index % 2 == 0,
+        }
+    )
+    return metadata
+
+
+def input_message(index):  # type: (int) -> resources_pb2.Input
+    return resources_pb2.Input(
+        id="input-%d" % index,
+        data=resources_pb2.Data(
+            image=resources_pb2.Image(url=IMAGE_URL), metadata=metadata_struct(index)
+        ),
+    )
+
+
+def post_model_outputs_request(num_inputs=8):
+    # type: (int) -> service_pb2.PostModelOutputsRequest
+    return service_pb2.PostModelOutputsRequest(
+        user_app_id=resources_pb2.UserAppIDSet(user_id="me", app_id="main"),
+        model_id=GENERAL_MODEL_ID,
+        inputs=[input_message(i) for i in range(num_inputs)],
+    )
+
+
+def success_status():  # type: () -> status_pb2.Status
+    return status_pb2.Status(code=status_code_pb2.SUCCESS, description="Ok")
+
+
+def concept_outputs(num_outputs=8, num_concepts=20):
+    # type: (int, int) -> service_pb2.MultiOutputResponse
+    return service_pb2.MultiOutputResponse(
+        status=success_status(),
+        outputs=[
+            resources_pb2.Output(
+                id="output-%d" % i,
+                status=success_status(),
+                model=resources_pb2.Model(id=GENERAL_MODEL_ID, name="general"),
+                input=resources_pb2.Input(
+                    id="input-%d" % i,
+                    data=resources_pb2.Data(image=resources_pb2.Image(url=IMAGE_URL)),
+                ),
+                data=resources_pb2.Data(
+                    concepts=[
+                        resources_pb2.Concept(
+                            id="ai_%05d" % c, name="concept %d" % c, value=1.0 / (c + 1)
+                        )
+                        for c in range(num_concepts)
+                    ]
+                ),
+            )
+            for i in range(num_outputs)
+        ],
+    )
+
+
+def list_inputs_response(num_inputs=1000):  # type: (int) -> service_pb2.MultiInputResponse
+    return service_pb2.MultiInputResponse(
+        status=success_status(), inputs=[input_message(i) for i in range(num_inputs)]
+    )
@@ -1,9 +1,8 @@
 import os
 
-import requests
-
-from clarifai_grpc.channel.grpc_json_channel import GRPCJSONChannel
-from clarifai_grpc.grpc.api import service_pb2_grpc
+# The transports (requests for the JSON channel, grpc for the gRPC channels) and the generated
+# service descriptors are imported lazily in the factory methods, so that importing this module
+# is cheap and each channel type only pays for what it uses.
 
 RETRIES = 2  # if connections fail retry a couple times.
 CONNECTIONS = 20  # number of connections to maintain in pool.
@@ -19,31 +18,178 @@ def _response_deserializer_for_grpc(response_deserializer):
     return response_deserializer.FromString
 
 
+def _intercept(channel, interceptors, api_key):
+    """Applies the interceptors, outermost first, and the bound credentials to a gRPC channel."""
+    interceptors = list(interceptors or ())
+    if api_key:
+        from clarifai_grpc.channel.interceptors import AuthorizationInterceptor
+
+        interceptors.append(AuthorizationInterceptor(api_key))
+    if not interceptors:
+        return channel
+    import grpc
+
+    return grpc.intercept_channel(channel, *interceptors)
+
+
+def _make_fork_safe(channel_factory):
+    """Makes the channel again in forked child processes. See ForkSafeChannel."""
+    from clarifai_grpc.channel.fork_safe_channel import ForkSafeChannel
+
+    return ForkSafeChannel(channel_factory)
+
+
+def _warm_up(channel, warm_up, background):
+    """Connects a gRPC channel ahead of its first call. See clarifai_grpc.channel.warm_up."""
+    if warm_up:
+        from clarifai_grpc.channel.warm_up import warm_up_grpc_channel
+
+        channel.warm_up = warm_up_grpc_channel(channel, background=background)
+    return channel
+
+
 class ClarifaiChannel:
     @classmethod
     def get_json_channel(
-        cls, base_url=os.environ.get("CLARIFAI_API_BASE", "https://api.clarifai.com")
+        cls,
+        base_url=os.environ.get("CLARIFAI_API_BASE", "https://api.clarifai.com"),
+        interceptors=None,
+        api_key=None,
+        concurrency=None,
+        per_thread_sessions=False,
+        warm_up=False,
+        warm_up_in_background=False,
+        warm_up_connections=1,
+        pool_maxsize=None,
+        pool_connections=CONNECTIONS,
+        pool_block=False,
+        max_retries=RETRIES,
+        adaptive_pool=False,
+        max_pool_size=None,
+        lazy_responses=False,
     ):
+        """
+        :param base_url: The URL of the API.
+        :param interceptors: grpc.UnaryUnaryClientInterceptor objects to run on every call.
+        :param api_key: The API key or Personal Access Token to authorize the calls with, unless
+                        they pass their own authorization metadata.
+        :param concurrency: The number of threads expected to call the channel at the same time.
+                            The shared connection pool is sized so that they don't wait for one.
+        :param per_thread_sessions: Whether each thread gets its own requests.Session, with its
+                                    own connections, instead of all sharing one.
+        :param warm_up: Whether to open connections ahead of the first calls.
+        :param warm_up_in_background: Whether to open them in a background thread instead of
+                                      waiting for them. The channel's warm_up attribute tracks
+                                      the progress and timing.
+        :param warm_up_connections: The number of connections to open when warming up.
+        :param pool_maxsize: The number of connections kept per host. Defaults to the larger of
+                             CONNECTIONS and concurrency, or 1 with per-thread sessions.
+        :param pool_connections: The number of hosts whose connection pools are kept.
+        :param pool_block: Whether requests wait for a pooled connection when all are in use,
+                           instead of opening, and then discarding, an extra one.
+        :param max_retries: The number of times failed connections are retried.
+        :param adaptive_pool: Whether the pools grow while requests wait for connections and
+                              shrink while connections are idle, starting from pool_maxsize.
+                              The pools then block, since their waits are what's measured.
+        :param max_pool_size: The largest size of an adaptive pool. Defaults to 4 * pool_maxsize.
+        :param lazy_responses: Whether calls return read-only views of the responses, which
+                               convert each field on first access. See
+                               clarifai_grpc.channel.lazy_response.
+        :return: The channel. Its pool_metrics attribute measures the waits for connections.
+        """
+        from clarifai_grpc.channel.grpc_json_channel import GRPCJSONChannel
+        from clarifai_grpc.channel.pool import PoolMetrics
+
         global wrap_response_deserializer
         wrap_response_deserializer = _response_deserializer_for_json
 
-        session = cls._make_requests_session()
+        from clarifai_grpc.channel.http_client import ThreadLocalSession
+
+        if not pool_maxsize:
+            # A thread makes one request at a time, so it needs one connection per host.
+            pool_maxsize = 1 if per_thread_sessions else max(CONNECTIONS, concurrency or 0)
+        pool_metrics = PoolMetrics()
+
+        def make_session():
+            return cls._make_requests_session(
+                pool_maxsize=pool_maxsize,
+                pool_connections=pool_connections,
+                pool_block=pool_block or adaptive_pool,
+                max_retries=max_retries,
+                pool_metrics=pool_metrics,
+                adaptive_pool=adaptive_pool,
+                max_pool_size=max_pool_size,
+            )
+
+        session = ThreadLocalSession(make_session) if per_thread_sessions else make_session()
+
+        channel = GRPCJSONChannel(
+            session=session,
+            base_url=base_url,
+            interceptors=interceptors,
+            api_key=api_key,
+            lazy_responses=lazy_responses,
+        )
+        channel.pool_metrics = pool_metrics
+        if warm_up:
+            from clarifai_grpc.channel.warm_up import warm_up_json_channel
 
-        return GRPCJSONChannel(session=session, base_url=base_url)
+            channel.warm_up = warm_up_json_channel(
+                channel, connections=warm_up_connections, background=warm_up_in_background
+            )
+        return channel
 
     @staticmethod
-    def _make_requests_session():
-        http_adapter = requests.adapters.HTTPAdapter(
-            max_retries=RETRIES, pool_connections=CONNECTIONS, pool_maxsize=CONNECTIONS
+    def _make_requests_session(
+        pool_maxsize=CONNECTIONS,
+        pool_connections=CONNECTIONS,
+        pool_block=False,
+        max_retries=RETRIES,
+        pool_metrics=None,
+        adaptive_pool=False,
+        max_pool_size=None,
+    ):
+        from clarifai_grpc.channel.http_client import ForkSafeSession
+        from clarifai_grpc.channel.pool import MeteredHTTPAdapter
+
+        http_adapter = MeteredHTTPAdapter(
+            metrics=pool_metrics,
+            adaptive=adaptive_pool,
+            max_pool_size=max_pool_size,
+            max_retries=max_retries,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
         )
 
-        session = requests.Session()
+        session = ForkSafeSession()
         session.mount("http://", http_adapter)
         session.mount("https://", http_adapter)
         return session
 
     @staticmethod
-    def get_grpc_channel(base=None):
+    def get_grpc_channel(
+        base=None,
+        interceptors=None,
+        api_key=None,
+        fork_safe=False,
+        warm_up=False,
+        warm_up_in_background=False,
+    ):
+        """
+        :param base: The host of the API.
+        :param interceptors: grpc.UnaryUnaryClientInterceptor objects to run on every call.
+        :param api_key: The API key or Personal Access Token to authorize the calls with, unless
+                        they pass their own authorization metadata.
+        :param fork_safe: Whether to make the channel again in forked child processes.
+        :param warm_up: Whether to connect ahead of the first call.
+        :param warm_up_in_background: Whether to connect in a background thread instead of
+                                      waiting for it. The channel's warm_up attribute tracks the
+                                      progress and timing.
+        :return: The channel.
+        """
+        import grpc
+
         global wrap_response_deserializer
         wrap_response_deserializer = _response_deserializer_for_grpc
 
@@ -52,16 +198,35 @@ class ClarifaiChannel:
         if not base:
             base = "api.clarifai.com"
 
-        return service_pb2_grpc.grpc.secure_channel(
-            base, service_pb2_grpc.grpc.ssl_channel_credentials()
-        )
+        def make_channel():
+            channel = grpc.secure_channel(base, grpc.ssl_channel_credentials())
+            return _intercept(channel, interceptors, api_key)
+
+        channel = _make_fork_safe(make_channel) if fork_safe else make_channel()
+        return _warm_up(channel, warm_up, warm_up_in_background)
 
     @staticmethod
-    def get_insecure_grpc_channel():
+    def get_insecure_grpc_channel(
+        base=None,
+        port=18080,
+        interceptors=None,
+        api_key=None,
+        fork_safe=False,
+        warm_up=False,
+        warm_up_in_background=False,
+    ):
+        """See get_grpc_channel. port is the port of the unencrypted gRPC API."""
+        import grpc
+
         global wrap_response_deserializer
         wrap_response_deserializer = _response_deserializer_for_grpc
-        channel_address = "{}:18080".format(
-            os.environ.get("CLARIFAI_GRPC_BASE", "api-grpc.clarifai.com")
-        )
 
-        return service_pb2_grpc.grpc.insecure_channel(channel_address)
+        if not base:
+            base = os.environ.get("CLARIFAI_GRPC_BASE", "api-grpc.clarifai.com")
+        channel_address = "{}:{}".format(base, port)
+
+        def make_channel():
+            return _intercept(grpc.insecure_channel(channel_address), interceptors, api_key)
+
+        channel = _make_fork_safe(make_channel) if fork_safe else make_channel()
+        return _warm_up(channel, warm_up, warm_up_in_background)
@@ -1,6 +1,7 @@
 from google.protobuf.json_format import _Parser
 from google.protobuf.message import Message  # noqa
 
+from clarifai_grpc.channel.custom_converters.custom_struct_converters import dict_to_struct
 from clarifai_grpc.grpc.api.utils import extensions_pb2
 
 # Python 3 deprecates getargspec and introduces getfullargspec, which Python 2 doesn't have.
@@ -9,18 +10,19 @@ try:
 except ImportError:
     from inspect import getargspec as get_args
 
+# Protobuf versions 3.6.* and 3.7.0 require a different number of parameters in the _Parser's
+# constructor. In the case of 3.6.*, we pass only the argument ignore_unknown_fields, but in
+# the case of 3.7.0, we pass in one additional None parameter. To be future proof(ish), pass in
+# None to any subsequent parameter. Subtract 2 for self and ignore_unknown_fields. Inspecting
+# the constructor is slow, so it's done once.
+_PARSER_NONE_ARGS = [None] * (len(get_args(_Parser.__init__).args) - 2)
+
 
 def dict_to_protobuf(protobuf_class, js_dict, ignore_unknown_fields=False):
     # type: (type(Message), dict, bool) -> Message
     message = protobuf_class()
 
-    # Protobuf versions 3.6.* and 3.7.0 require a different number of parameters in the _Parser's
-    # constructor. In the case of 3.6.*, we pass only the argument ignore_unknown_fields, but in
-    # the case of 3.7.0, we pass in one additional None parameter. To be future proof(ish), pass in
-    # None to any subsequent parameter.
-    num_of_args = len(get_args(_Parser.__init__).args)
-    none_args = [None] * (num_of_args - 2)  # Subtract 2 for self and ignore_unknown_fields.
-    parser = _CustomParser(ignore_unknown_fields, *none_args)
+    parser = _CustomParser(ignore_unknown_fields, *_PARSER_NONE_ARGS)
 
     parser.ConvertMessage(js_dict, message)
     return message
@@ -42,3 +44,7 @@ class _CustomParser(_Parser):
                     js[f.name] = default_float
 
         super(_CustomParser, self)._ConvertFieldValuePair(js, message)
+
+    def _ConvertStructMessage(self, value, message, *args):
+        """Converts with dict_to_struct, which skips the generic conversion of each value."""
+        dict_to_struct(value, message)
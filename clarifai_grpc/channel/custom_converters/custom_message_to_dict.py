@@ -4,6 +4,7 @@ from google.protobuf import descriptor
 from google.protobuf.json_format import _IsMapEntry, _Printer
 from google.protobuf.message import Message  # noqa
 
+from clarifai_grpc.channel.custom_converters.custom_struct_converters import struct_to_dict
 from clarifai_grpc.grpc.api.utils import extensions_pb2
 
 
@@ -82,18 +83,7 @@ class _CustomPrinter(_Printer):
         Converts Struct message according to Proto3 JSON Specification.
 
         However, by default, empty objects {} get converted to null. We overwrite this behavior so {}
-        get converted to {}.
+        get converted to {}. This is done by struct_to_dict, which also skips the generic field
+        conversion for each value.
         """
-
-        fields = message.fields
-        ret = {}
-        for key in fields:
-            # When there's a Struct with an empty Struct field, this condition will hold True.
-            # Far as I know this is the only case this condition will be true. If not, this condition
-            # needs to be amended.
-            if fields[key].WhichOneof("kind") is None:
-                json_object = {}
-            else:
-                json_object = self._ValueMessageToJsonObject(fields[key])
-            ret[key] = json_object
-        return ret
+        return struct_to_dict(message)
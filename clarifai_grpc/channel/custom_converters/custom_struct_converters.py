@@ -0,0 +1,154 @@
+"""
+Converters between Struct, Value and ListValue messages and plain Python objects, e.g. for
+input metadata, that skip the descriptor-driven machinery of json_format.
+
+They follow the JSON channel's semantics: a Struct field whose Value is not set converts to {}
+(see _CustomPrinter._StructMessageToJsonObject), non-finite numbers convert to "NaN",
+"Infinity" and "-Infinity", and converting a dict clears the Struct first.
+"""
+import math
+import typing  # noqa
+
+from google.protobuf import struct_pb2
+from google.protobuf.json_format import ParseError
+
+
+def struct_to_dict(message):  # type: (struct_pb2.Struct) -> dict
+    return {key: _struct_field_to_object(value) for key, value in message.fields.items()}
+
+
+def value_to_object(message):  # type: (struct_pb2.Value) -> typing.Any
+    """Converts a Value, which converts to None if not set."""
+    kind = message.WhichOneof("kind")
+    if kind == "string_value":
+        return message.string_value
+    if kind == "number_value":
+        return _number_to_object(message.number_value)
+    if kind == "bool_value":
+        return message.bool_value
+    if kind == "struct_value":
+        return struct_to_dict(message.struct_value)
+    if kind == "list_value":
+        return list_value_to_list(message.list_value)
+    return None
+
+
+def list_value_to_list(message):  # type: (struct_pb2.ListValue) -> list
+    return [value_to_object(value) for value in message.values]
+
+
+def dict_to_struct(js, message=None):
+    # type: (dict, typing.Optional[struct_pb2.Struct]) -> struct_pb2.Struct
+    """
+    Args:
+      js: the dict, with string keys, and dict, list, str, int, float, bool or None values.
+      message: the Struct to fill, e.g. input.data.metadata. A new one by default.
+
+    Returns:
+      The Struct.
+    """
+    if message is None:
+        message = struct_pb2.Struct()
+    _fill_struct(js, message)
+    return message
+
+
+def object_to_value(value, message=None):
+    # type: (typing.Any, typing.Optional[struct_pb2.Value]) -> struct_pb2.Value
+    if message is None:
+        message = struct_pb2.Value()
+    _fill_value(value, message)
+    return message
+
+
+def list_to_list_value(values, message=None):
+    # type: (list, typing.Optional[struct_pb2.ListValue]) -> struct_pb2.ListValue
+    if message is None:
+        message = struct_pb2.ListValue()
+    _fill_list_value(values, message)
+    return message
+
+
+def structs_to_dicts(messages):
+    # type: (typing.Iterable[struct_pb2.Struct]) -> typing.List[dict]
+    """Converts many Structs, e.g. the metadata of all the inputs of a page."""
+    return [struct_to_dict(message) for message in messages]
+
+
+def dicts_to_structs(
+    dicts,  # type: typing.Iterable[dict]
+    messages=None,  # type: typing.Optional[typing.Iterable[struct_pb2.Struct]]
+):
+    # type: (...) -> typing.List[struct_pb2.Struct]
+    """
+    Converts many dicts, e.g. the metadata of the inputs of a PostInputs or PatchInputs request.
+
+    Args:
+      dicts: the dicts.
+      messages: the Structs to fill, one per dict, e.g. the inputs' data.metadata. New ones by
+        default.
+
+    Returns:
+      The Structs.
+    """
+    if messages is None:
+        return [dict_to_struct(js) for js in dicts]
+    return [dict_to_struct(js, message) for js, message in zip(dicts, messages)]
+
+
+def _struct_field_to_object(message):  # type: (struct_pb2.Value) -> typing.Any
+    # Same as value_to_object, except for unset values, as in the JSON channel.
+    if message.WhichOneof("kind") is None:
+        return {}
+    return value_to_object(message)
+
+
+def _number_to_object(number):  # type: (float) -> typing.Union[float, str]
+    if number - number == 0:
+        return number
+    if math.isnan(number):
+        return "NaN"
+    return "Infinity" if number > 0 else "-Infinity"
+
+
+def _fill_struct(js, message):  # type: (dict, struct_pb2.Struct) -> None
+    if not isinstance(js, dict):
+        raise ParseError("Struct must be in a dict which is {0}.".format(js))
+    message.Clear()
+    fields = message.fields
+    for key, value in js.items():
+        _fill_value(value, fields[key])
+
+
+def _fill_list_value(values, message):  # type: (list, struct_pb2.ListValue) -> None
+    if not isinstance(values, list):
+        raise ParseError("ListValue must be in [] which is {0}.".format(values))
+    message.ClearField("values")
+    add = message.values.add
+    for value in values:
+        _fill_value(value, add())
+
+
+def _fill_value(value, message):  # type: (typing.Any, struct_pb2.Value) -> None
+    # The most common types of metadata values first. bool must be tested before int.
+    value_type = type(value)
+    if value_type is str:
+        message.string_value = value
+    elif value_type is bool:
+        message.bool_value = value
+    elif value_type is float or value_type is int:
+        message.number_value = value
+    elif isinstance(value, dict):
+        _fill_struct(value, message.struct_value)
+    elif isinstance(value, list):
+        _fill_list_value(value, message.list_value)
+    elif value is None:
+        message.null_value = 0
+    elif isinstance(value, bool):
+        message.bool_value = value
+    elif isinstance(value, str):
+        message.string_value = value
+    elif isinstance(value, (int, float)):
+        message.number_value = value
+    else:
+        raise ParseError("Value {0} has unexpected type {1}.".format(value, type(value)))
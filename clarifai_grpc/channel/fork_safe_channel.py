@@ -0,0 +1,83 @@
+"""
+A gRPC channel that can be used both before and after os.fork().
+
+gRPC channels made before a fork can't be used by the child process. ForkSafeChannel makes a
+new channel with the same factory the first time it's used in a child, and the stub methods
+bound to it follow along, so a stub made in the parent keeps working in the children:
+
+  channel = ClarifaiChannel.get_grpc_channel(fork_safe=True)
+  stub = service_pb2_grpc.V2Stub(channel)
+
+gRPC's own fork support has to be enabled for a child to use gRPC after the parent has, by
+setting the GRPC_ENABLE_FORK_SUPPORT=true and GRPC_POLL_STRATEGY=poll environment variables.
+"""
+import os
+import typing  # noqa
+
+
+class ForkSafeChannel:
+    def __init__(self, channel_factory):  # type: (typing.Callable[[], typing.Any]) -> None
+        """
+        Args:
+          channel_factory: makes the underlying channel, once per process.
+        """
+        self._channel_factory = channel_factory
+        self._channel = channel_factory()
+        self._pid = os.getpid()
+
+    @property
+    def channel(self):
+        """The underlying channel of the current process."""
+        if self._pid != os.getpid():
+            # The inherited channel is dropped without being closed, since it's the parent's.
+            # Threads racing here right after the fork at worst make a channel that is discarded.
+            self._channel = self._channel_factory()
+            self._pid = os.getpid()
+        return self._channel
+
+    def unary_unary(self, method, request_serializer=None, response_deserializer=None):
+        return _ForkSafeMultiCallable(self, method, request_serializer, response_deserializer)
+
+    def subscribe(self, callback, try_to_connect=False):
+        self.channel.subscribe(callback, try_to_connect=try_to_connect)
+
+    def unsubscribe(self, callback):
+        self.channel.unsubscribe(callback)
+
+    def close(self):  # type: () -> None
+        if self._pid == os.getpid():
+            self._channel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _ForkSafeMultiCallable:
+    def __init__(self, fork_safe_channel, method, request_serializer, response_deserializer):
+        self._fork_safe_channel = fork_safe_channel
+        self._method = method
+        self._request_serializer = request_serializer
+        self._response_deserializer = response_deserializer
+        self._channel = None
+        self._multicallable = None
+
+    def _current(self):
+        channel = self._fork_safe_channel.channel
+        if channel is not self._channel:
+            self._multicallable = channel.unary_unary(
+                self._method, self._request_serializer, self._response_deserializer
+            )
+            self._channel = channel
+        return self._multicallable
+
+    def __call__(self, request, *args, **kwargs):
+        return self._current()(request, *args, **kwargs)
+
+    def with_call(self, request, *args, **kwargs):
+        return self._current().with_call(request, *args, **kwargs)
+
+    def future(self, request, *args, **kwargs):
+        return self._current().future(request, *args, **kwargs)
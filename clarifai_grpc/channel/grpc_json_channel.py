@@ -12,10 +12,14 @@ from clarifai_grpc.channel.custom_converters.custom_dict_to_message import dict_
 from clarifai_grpc.channel.custom_converters.custom_message_to_dict import protobuf_to_dict
 from clarifai_grpc.channel.errors import UsageError
 from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.channel.interceptors import ClientCallDetails, UnaryOutcome
+from clarifai_grpc.channel.lazy_response import LazyMessage
 from clarifai_grpc.grpc.api.service_pb2 import _V2
 
 BASE_URL = "https://api.clarifai.com"
 URL_TEMPLATE_PARAM_REGEX = re.compile(r"\{{1}(.*?)\}{1}")
+# The number of distinct call metadata tuples per method whose headers are cached.
+MAX_CACHED_METADATA = 32
 
 logger = logging.getLogger("clarifai")
 
@@ -46,16 +50,34 @@ class GRPCJSONChannel(object):
         session: requests.Session,
         base_url: str = BASE_URL,
         service_descriptor: typing.Any = _V2,
+        interceptors: typing.Optional[typing.Sequence[typing.Any]] = None,
+        api_key: typing.Optional[str] = None,
+        lazy_responses: bool = False,
     ) -> None:
         """
         Args:
-          session: a request session
+          session: a request session, or a ThreadLocalSession for a session per thread
           base_url: if you want to point at a different url than the default.
           service_descriptor: This is a ServiceDescriptor object found in the compiled grpc-gateway
         .proto results. For example if your proto defining the endpoints is in endpoint.proto then look
         in endpoint_pb2.py file for ServiceDescriptor and use that.
+          interceptors: grpc.UnaryUnaryClientInterceptor objects to run on every call, outermost
+            first. See clarifai_grpc.channel.interceptors.
+          api_key: the API key or Personal Access Token used by calls without an authorization
+            metadata entry.
+          lazy_responses: whether calls return read-only views which convert the response's
+            fields on first access, instead of response messages. See
+            clarifai_grpc.channel.lazy_response.
         """
         self.session = session
+        self.base_url = base_url
+        self.interceptors = tuple(interceptors or ())
+        self.lazy_responses = lazy_responses
+        # The WarmUp, if the channel was warmed up. See clarifai_grpc.channel.warm_up.
+        self.warm_up = None
+        # The PoolMetrics of the session's connection pools. See clarifai_grpc.channel.pool.
+        self.pool_metrics = None
+        self.http_client = http_client.HttpClient(session, api_key)
         self.name_to_resources = {}
 
         for m in service_descriptor.methods:
@@ -110,8 +132,22 @@ class GRPCJSONChannel(object):
             resources,
             request_serializer,
             response_deserializer,
+            method_name=name,
+            interceptors=self.interceptors,
+            http=self.http_client,
+            lazy_responses=self.lazy_responses,
         )
 
+    def close(self):  # type: () -> None
+        """Closes the session's pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
 
 class JSONUnaryUnary(object):
     """This mimics the unary_unary calls and is actually the thing doing the http requests."""
@@ -123,16 +159,25 @@ class JSONUnaryUnary(object):
         resources,  # type: typing.List[typing.Tuple[str, typing.Any]]
         request_serializer,  # type: typing.Callable
         response_deserializer,  # type: typing.Callable
+        method_name=None,  # type: typing.Optional[str]
+        interceptors=(),  # type: typing.Sequence[typing.Any]
+        http=None,  # type: typing.Optional[http_client.HttpClient]
+        lazy_responses=False,  # type: bool
     ):
         # type: (...) -> None
         """
         Args:
-          session: a request session
+          session: a request session, or a ThreadLocalSession for a session per thread
           request_message_descriptor: this is a MessageDescriptor for the input type.
           resources: a list of available resource endpoints
           request_serializer: the method to use to serialize the request proto
           response_deserializer: the response proto deserializer which will be used to convert the http
                                  response will be parsed into this.
+          method_name: the full gRPC method name, e.g. /clarifai.api.V2/PostInputs, that
+                       interceptors see in the call details.
+          interceptors: the interceptors to run on every call, outermost first.
+          http: the HTTP client, possibly with the channel's credentials bound to it.
+          lazy_responses: whether to return a LazyMessage view of the response.
 
         Returns:
           response: a proto object of class response_deserializer filled in with the response.
@@ -142,6 +187,13 @@ class JSONUnaryUnary(object):
         self.resources = resources
         self.request_serializer = request_serializer
         self.response_deserializer = response_deserializer
+        self.method_name = method_name
+        self.interceptors = tuple(interceptors)
+        # The continuation that runs the interceptors, then the call, made once.
+        self._intercepted = self._intercepted_call(0) if self.interceptors else None
+        self.http = http or http_client.HttpClient(session)
+        self.lazy_responses = lazy_responses
+        self._metadata_headers = {}  # type: typing.Dict[tuple, typing.Dict[str, str]]
 
     def __call__(self, request, metadata=None):  # type: (Message, tuple) -> Message
         """This is where the actually calls come through when the stub is called such as
@@ -151,11 +203,39 @@ class JSONUnaryUnary(object):
           request: the proto object for the request. It must be the proper type for the request or the
             server will complain. Note: this doesn't type check the incoming request in the client but
             does make sure it can serialize before sending to the server atleast.
-          metadata: the authorization string (either API key or Personal Access Token)
+          metadata: the authorization string (either API key or Personal Access Token). Optional if
+            the channel has credentials bound to it, which it then overrides.
 
         Returns:
           response: the proto object that this method returns.
         """
+        if self._intercepted is None:
+            return self._invoke(request, metadata)
+
+        call_details = ClientCallDetails(self.method_name, None, metadata, None, None, None)
+        return self._intercepted(call_details, request).result()
+
+    def _intercepted_call(self, index):  # type: (int) -> typing.Callable
+        """Returns the continuation that runs the interceptors from index onwards, then the call."""
+        if index == len(self.interceptors):
+
+            def invoke(call_details, request):
+                try:
+                    return UnaryOutcome(response=self._invoke(request, call_details.metadata))
+                except Exception as e:
+                    return UnaryOutcome(exception=e)
+
+            return invoke
+
+        interceptor = self.interceptors[index]
+        continuation = self._intercepted_call(index + 1)
+
+        def intercept(call_details, request):
+            return interceptor.intercept_unary_unary(continuation, call_details, request)
+
+        return intercept
+
+    def _invoke(self, request, metadata):  # type: (Message, tuple) -> Message
         # if metadata is not None:
         #   raise Exception("No support currently for metadata field.")
 
@@ -175,17 +255,41 @@ class JSONUnaryUnary(object):
             if url_field in params:
                 del params[url_field]
 
-        auth_string = self._read_auth_string(metadata)
-
-        http = http_client.HttpClient(self.session, auth_string)
-        response_json = http.execute_request(method, params, url)
+        headers = self._headers_for_metadata(metadata) if metadata else None
+        response_json = self.http.execute_request(method, params, url, headers=headers)
 
         # Get the actual message object to construct
         message = self.response_deserializer
+        if self.lazy_responses:
+            return LazyMessage(message, response_json)
         result = dict_to_protobuf(message, response_json, ignore_unknown_fields=True)
 
         return result
 
+    def _headers_for_metadata(self, metadata):
+        # type: (typing.Sequence[typing.Tuple[str, str]]) -> typing.Optional[typing.Dict[str, str]]
+        """
+        :param metadata: The call metadata.
+        :return: The HTTP headers for the metadata's authorization, or None to use the channel's.
+        """
+        try:
+            return self._metadata_headers[metadata]
+        except KeyError:
+            key = metadata
+        except TypeError:
+            # Unhashable metadata, e.g. a list of lists, is cached by a tuple of its entries.
+            key = tuple(map(tuple, metadata))
+            if key in self._metadata_headers:
+                return self._metadata_headers[key]
+
+        if self.http.has_auth and not any(k.lower() == "authorization" for k, _ in metadata):
+            headers = None
+        else:
+            headers = http_client.HttpClient.make_headers(self._read_auth_string(metadata))
+        if len(self._metadata_headers) < MAX_CACHED_METADATA:
+            self._metadata_headers[key] = headers
+        return headers
+
     def _read_auth_string(self, metadata: typing.Tuple) -> str:
         """
         The auth string returned is either an API key or a PAT (Personal Access Token).
@@ -2,11 +2,13 @@ import copy
 import json
 import logging
 import os
+import threading
 import typing  # noqa
+import weakref
 
 import requests
 
-from clarifai_grpc.channel.errors import ApiError
+from clarifai_grpc.channel.errors import ApiError, UsageError
 
 CLIENT_VERSION = "6.8.1"
 OS_VER = os.sys.platform
@@ -24,32 +26,171 @@ PYTHON_VERSION = ".".join(
 logger = logging.getLogger("clarifai")
 
 
+class ForkSafeSession(requests.Session):
+    """
+    A requests.Session whose connection pools are remade in a forked child process, so that the
+    child doesn't use the pooled connections it inherited from its parent. The inherited pools
+    are dropped without being closed, since their sockets are still in use by the parent. The
+    rest of the session, e.g. its headers and mounted adapters, is kept.
+    """
+
+    __attrs__ = requests.Session.__attrs__ + ["_pid"]
+
+    def __init__(self):
+        super(ForkSafeSession, self).__init__()
+        self._pid = os.getpid()
+
+    def get_adapter(self, url):  # type: (str) -> requests.adapters.BaseAdapter
+        # Every request gets its connection through here.
+        if self._pid != os.getpid():
+            self._remake_pools()
+        return super(ForkSafeSession, self).get_adapter(url)
+
+    def close(self):  # type: () -> None
+        if self._pid != os.getpid():
+            self._remake_pools()
+        super(ForkSafeSession, self).close()
+
+    def _remake_pools(self):  # type: () -> None
+        # Threads racing here right after the fork at worst make pools that are discarded.
+        adapters = {id(adapter): adapter for adapter in self.adapters.values()}
+        for adapter in adapters.values():
+            if isinstance(adapter, requests.adapters.HTTPAdapter):
+                # As HTTPAdapter does when unpickled.
+                adapter.proxy_manager = {}
+                adapter.init_poolmanager(
+                    adapter._pool_connections, adapter._pool_maxsize, block=adapter._pool_block
+                )
+        self._pid = os.getpid()
+
+
+class ThreadLocalSession:
+    """
+    Gives each thread its own requests.Session, made by session_factory on the thread's first
+    request. requests.Session isn't guaranteed to be thread-safe, and threads sharing one contend
+    for its connection pool. A forked child makes new sessions.
+
+    Other attributes are those of the calling thread's session, e.g. session.headers or
+    session.mount. Assigned attributes, e.g. session.verify = False, apply to the sessions of all
+    the threads, including those made later.
+    """
+
+    def __init__(self, session_factory):  # type: (typing.Callable[[], requests.Session]) -> None
+        self._session_factory = session_factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Weak, so that the sessions of finished threads can be garbage collected.
+        self._sessions = weakref.WeakSet()  # type: weakref.WeakSet
+        self._attributes = {}  # type: typing.Dict[str, typing.Any]
+        self._pid = os.getpid()
+
+    @property
+    def session(self):  # type: () -> requests.Session
+        """The calling thread's session."""
+        if self._pid != os.getpid():
+            self._forget_sessions()
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._session_factory()
+            with self._lock:
+                for name, value in self._attributes.items():
+                    setattr(session, name, value)
+                self._sessions.add(session)
+            self._local.session = session
+        return session
+
+    def __getattr__(self, name):  # type: (str) -> typing.Any
+        if name.startswith("_"):
+            # Not set yet, e.g. while copying.
+            raise AttributeError(name)
+        return getattr(self.session, name)
+
+    def __setattr__(self, name, value):  # type: (str, typing.Any) -> None
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+            return
+        with self._lock:
+            self._attributes[name] = value
+            for session in list(self._sessions):
+                setattr(session, name, value)
+
+    def close(self):  # type: () -> None
+        """Closes the sessions of all the threads."""
+        if self._pid != os.getpid():
+            self._forget_sessions()
+            return
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions = weakref.WeakSet()
+        self._local = threading.local()
+        for session in sessions:
+            session.close()
+
+    def _forget_sessions(self):  # type: () -> None
+        """Drops the sessions inherited from the parent process, without closing them."""
+        # The lock may have been held by another thread of the parent at the time of the fork.
+        self._lock = threading.Lock()
+        self._sessions = weakref.WeakSet()
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+
 class HttpClient:
-    def __init__(self, session, auth_string):  # type: (requests.Session, str) -> None
+    def __init__(self, session, auth_string=None):
+        # type: (requests.Session, typing.Optional[str]) -> None
         """
         :param session: The requests session object.
-        :param auth_string: Either Clarifai's API key or Personal Access Token.
+        :param auth_string: Either Clarifai's API key or Personal Access Token. If not set, every
+                            request has to pass its own headers.
         """
         self._auth_string = auth_string
         self._session = session
+        self._headers = self.make_headers(auth_string) if auth_string else None
 
-    def execute_request(self, method, params, url):
-        # type: (str, typing.Optional[dict], str) -> dict
-        headers = {
+    @property
+    def has_auth(self):  # type: () -> bool
+        return self._headers is not None
+
+    @staticmethod
+    def make_headers(auth_string):  # type: (str) -> typing.Dict[str, str]
+        """
+        :param auth_string: Either Clarifai's API key or Personal Access Token.
+        :return: The HTTP headers of a request authorized by auth_string.
+        """
+        return {
             "Content-Type": "application/json",
             "X-Clarifai-gRPC-Client": "python:%s" % CLIENT_VERSION,
             "Python-Client": "%s:%s" % (OS_VER, PYTHON_VERSION),
-            "Authorization": "Key %s" % self._auth_string,
+            "Authorization": "Key %s" % auth_string,
         }
-        logger.debug("=" * 100)
-        succinct_payload = self._mangle_base64_values(params)
-        logger.debug(
-            "%s %s\nHEADERS:\n%s\nPAYLOAD:\n%s",
-            method,
-            url,
-            json.dumps(headers, indent=2),
-            json.dumps(succinct_payload, indent=2),
-        )
+
+    def execute_request(self, method, params, url, headers=None):
+        # type: (str, typing.Optional[dict], str, typing.Optional[dict]) -> dict
+        """
+        :param method: The HTTP method.
+        :param params: The request body, or the query parameters for GET.
+        :param url: The URL.
+        :param headers: The headers to use instead of the ones bound to this client.
+        :return: The response JSON.
+        """
+        if headers is None:
+            headers = self._headers
+        if headers is None:
+            raise UsageError(
+                "Please provide metadata with the format of "
+                "(('authorization', 'Key YOUR_CLARIFAI_API_KEY'),)"
+            )
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("=" * 100)
+            succinct_payload = self._mangle_base64_values(params)
+            logger.debug(
+                "%s %s\nHEADERS:\n%s\nPAYLOAD:\n%s",
+                method,
+                url,
+                json.dumps(self._redacted(headers), indent=2),
+                json.dumps(succinct_payload, indent=2),
+            )
         try:
             if method == "GET":
                 res = self._session.get(
@@ -74,10 +215,14 @@ class HttpClient:
             logger.debug("\nRESULT:\n%s", json.dumps(res.text, indent=2))
             error = ApiError(url, params, method, res)
             raise error
-        else:
+        if debug:
             logger.debug("\nRESULT:\n%s", json.dumps(response_json, indent=2))
         return response_json
 
+    @staticmethod
+    def _redacted(headers):  # type: (dict) -> dict
+        return dict(headers, Authorization="Key ...")
+
     def _mangle_base64_values(self, params):  # type: (dict) -> dict
         """ Mangle (shorten) the base64 values because they are too long for output. """
         inputs = (params or {}).get("inputs")
@@ -91,7 +236,7 @@ class HttpClient:
     def _mangle_base64_values_in_inputs(self, params):  # type: (dict) -> dict
         params_copy = copy.deepcopy(params)
         for data in params_copy["inputs"]:
-            data = data["data"]
+            data = data.get("data", {})
             image = data.get("image")
             if image and image.get("base64"):
                 image["base64"] = self._shortened_base64_value(image["base64"])
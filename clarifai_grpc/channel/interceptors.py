@@ -0,0 +1,125 @@
+"""
+Client interceptors shared by all the channel types.
+
+Interceptors implement grpc.UnaryUnaryClientInterceptor and are passed to the ClarifaiChannel
+factories, e.g. ClarifaiChannel.get_json_channel(interceptors=[...]). The same interceptor works
+on the gRPC channels, where grpc.intercept_channel applies it, and on the JSON channel, which
+runs the chain itself.
+
+An interceptor's intercept_unary_unary(continuation, client_call_details, request) either calls
+continuation(client_call_details, request) to proceed, or returns a UnaryOutcome to answer the
+call itself, e.g. from a cache. Either way, the returned object's result() is the response.
+"""
+import collections
+import threading
+import time
+import typing  # noqa
+
+import grpc
+
+
+class ClientCallDetails(
+    collections.namedtuple(
+        "ClientCallDetails",
+        ("method", "timeout", "metadata", "credentials", "wait_for_ready", "compression"),
+    ),
+    grpc.ClientCallDetails,
+):
+    pass
+
+
+class UnaryOutcome(grpc.Future):
+    """A completed unary call: either its response or the exception it raised."""
+
+    def __init__(self, response=None, exception=None):
+        self._response = response
+        self._exception = exception
+
+    def result(self, timeout=None):
+        if self._exception is not None:
+            raise self._exception
+        return self._response
+
+    def exception(self, timeout=None):
+        return self._exception
+
+    def traceback(self, timeout=None):
+        return self._exception.__traceback__ if self._exception is not None else None
+
+    def add_done_callback(self, fn):
+        fn(self)
+
+    def cancel(self):
+        return False
+
+    def cancelled(self):
+        return False
+
+    def running(self):
+        return False
+
+    def done(self):
+        return True
+
+
+class AuthorizationInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """
+    Adds the channel's authorization metadata to the calls that don't have their own.
+
+    This is used instead of grpc.metadata_call_credentials, whose plugin runs on a separate thread
+    for every call, requires TLS and can't be overridden by a call's own metadata.
+    """
+
+    def __init__(self, api_key):  # type: (str) -> None
+        """
+        Args:
+          api_key: either Clarifai's API key or Personal Access Token.
+        """
+        self._metadata = (("authorization", "Key " + api_key),)
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        metadata = client_call_details.metadata
+        if metadata:
+            if any(key.lower() == "authorization" for key, _ in metadata):
+                return continuation(client_call_details, request)
+            metadata = tuple(metadata) + self._metadata
+        else:
+            metadata = self._metadata
+
+        call_details = ClientCallDetails(
+            client_call_details.method,
+            client_call_details.timeout,
+            metadata,
+            client_call_details.credentials,
+            client_call_details.wait_for_ready,
+            client_call_details.compression,
+        )
+        return continuation(call_details, request)
+
+
+class CallMetricsInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """Counts the calls, failed calls and total latency per method."""
+
+    def __init__(self):
+        self.calls = collections.Counter()  # type: typing.Counter[str]
+        self.errors = collections.Counter()  # type: typing.Counter[str]
+        self.total_latency = collections.defaultdict(float)  # type: typing.Dict[str, float]
+        self._lock = threading.Lock()
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        start = time.perf_counter()
+        outcome = continuation(client_call_details, request)
+        failed = outcome.exception() is not None
+        latency = time.perf_counter() - start
+
+        method = client_call_details.method
+        with self._lock:
+            self.calls[method] += 1
+            self.total_latency[method] += latency
+            if failed:
+                self.errors[method] += 1
+        return outcome
+
+    def mean_latency(self, method):  # type: (str) -> float
+        with self._lock:
+            return self.total_latency[method] / self.calls[method] if self.calls[method] else 0.0
@@ -0,0 +1,151 @@
+"""
+Read-only views of JSON responses that convert each field to protobuf on first access, for the
+JSON channel's lazy_responses mode.
+
+  channel = ClarifaiChannel.get_json_channel(lazy_responses=True)
+  response = V2Stub(channel).ListInputs(ListInputsRequest(per_page=1000), metadata=metadata)
+  response.status.code         # Converts only the status.
+  response.inputs[0].id        # Converts only the first input, and only its ID.
+
+Fields read like those of the generated message. Message fields, including each element of
+repeated message fields, are views themselves; other fields are converted with the JSON
+channel's parser. Any other attribute, e.g. HasField or SerializeToString, is that of the whole
+message, which is then converted once. materialize() returns the whole message.
+"""
+import typing  # noqa
+
+from google.protobuf import symbol_database
+from google.protobuf.descriptor import Descriptor, FieldDescriptor  # noqa
+from google.protobuf.message import Message  # noqa
+
+from clarifai_grpc.channel.custom_converters.custom_dict_to_message import dict_to_protobuf
+
+# The full names of the message types converted as a whole, as they have special JSON forms.
+_WELL_KNOWN_TYPES_PREFIX = "google.protobuf."
+_INTERNAL_ATTRIBUTES = frozenset(["_message_class", "_js", "_message"])
+
+
+class LazyMessage(object):
+    def __init__(self, message_class, js):  # type: (type, dict) -> None
+        """
+        Args:
+          message_class: the generated message class.
+          js: the message's JSON object, as parsed from the response.
+        """
+        object.__setattr__(self, "_message_class", message_class)
+        object.__setattr__(self, "_js", js)
+        object.__setattr__(self, "_message", None)
+
+    @property
+    def DESCRIPTOR(self):  # type: () -> Descriptor
+        return self._message_class.DESCRIPTOR
+
+    def __getattr__(self, name):  # type: (str) -> typing.Any
+        if name in _INTERNAL_ATTRIBUTES or name.startswith("__"):
+            # Not set yet, e.g. while copying.
+            raise AttributeError(name)
+        field = self._message_class.DESCRIPTOR.fields_by_name.get(name)
+        if field is None:
+            return getattr(materialize(self), name)
+        value = self._field_value(field)
+        # Cached as an instance attribute, so __getattr__ is not called for it again.
+        object.__setattr__(self, name, value)
+        return value
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            "Lazy responses are read-only, materialize() the response to modify it"
+        )
+
+    def __eq__(self, other):
+        return materialize(self) == materialize(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __str__(self):
+        return str(materialize(self))
+
+    def __repr__(self):
+        return "<LazyMessage of %s>" % self._message_class.DESCRIPTOR.full_name
+
+    def _field_value(self, field):  # type: (FieldDescriptor) -> typing.Any
+        raw = self._js.get(field.name)
+        if raw is None:
+            raw = self._js.get(field.json_name)
+        message_type = field.message_type
+        lazy = message_type is not None and not (
+            message_type.full_name.startswith(_WELL_KNOWN_TYPES_PREFIX)
+            or message_type.GetOptions().map_entry
+        )
+        if lazy and field.label == FieldDescriptor.LABEL_REPEATED:
+            return LazyRepeated(_message_class(message_type), raw or [])
+        if lazy:
+            return LazyMessage(_message_class(message_type), raw or {})
+        if (
+            type(raw) is str
+            and field.type == FieldDescriptor.TYPE_STRING
+            and field.label != FieldDescriptor.LABEL_REPEATED
+        ):
+            # The most common field, e.g. IDs, is the same in JSON.
+            return raw
+        # The other fields are converted by themselves, in a message without the other fields.
+        js = {} if raw is None else {field.name: raw}
+        return getattr(
+            dict_to_protobuf(self._message_class, js, ignore_unknown_fields=True), field.name
+        )
+
+
+class LazyRepeated(object):
+    """A read-only sequence of LazyMessage, made on first access."""
+
+    def __init__(self, message_class, js):  # type: (type, list) -> None
+        self._message_class = message_class
+        self._js = js
+        self._views = [None] * len(js)  # type: typing.List[typing.Optional[LazyMessage]]
+
+    def __len__(self):
+        return len(self._js)
+
+    def __getitem__(self, index):  # type: (typing.Union[int, slice]) -> typing.Any
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        view = self._views[index]
+        if view is None:
+            view = self._views[index] = LazyMessage(self._message_class, self._js[index])
+        return view
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other):
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<LazyRepeated of %d %s>" % (len(self), self._message_class.DESCRIPTOR.full_name)
+
+
+def materialize(message):  # type: (typing.Any) -> Message
+    """The whole message of a LazyMessage, converted once. Other messages are returned as is."""
+    if not isinstance(message, LazyMessage):
+        return message
+    converted = message.__dict__["_message"]
+    if converted is None:
+        converted = dict_to_protobuf(
+            message._message_class, message._js, ignore_unknown_fields=True
+        )
+        object.__setattr__(message, "_message", converted)
+    return converted
+
+
+def _message_class(descriptor):  # type: (Descriptor) -> type
+    """The generated class of a message type."""
+    return symbol_database.Default().GetSymbol(descriptor.full_name)
@@ -0,0 +1,222 @@
+"""
+HTTP connection pools for the JSON channel that measure how long requests wait for a connection,
+and can adapt their size to those waits.
+
+ClarifaiChannel.get_json_channel uses these. The measurements are exposed as the channel's
+pool_metrics attribute:
+
+  channel = ClarifaiChannel.get_json_channel(pool_maxsize=8, pool_block=True, adaptive_pool=True)
+  ...
+  print(channel.pool_metrics.snapshot())
+"""
+import queue
+import threading
+import time
+import typing  # noqa
+
+import requests
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# The adaptive pools reconsider their size after this many connection acquisitions.
+ADAPT_WINDOW = 32
+# The adaptive pools grow when more than this fraction of a window's acquisitions waited.
+GROW_WAIT_FRACTION = 0.1
+
+
+class PoolMetrics:
+    """Connection pool measurements, shared by all the pools of a channel."""
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.connections_opened = 0
+        self.resizes = 0
+        self.pool_sizes = {}  # type: typing.Dict[str, int]
+        self._lock = threading.Lock()
+
+    @property
+    def mean_wait(self):  # type: () -> float
+        return self.total_wait / self.acquisitions if self.acquisitions else 0.0
+
+    def snapshot(self):  # type: () -> dict
+        with self._lock:
+            return {
+                "acquisitions": self.acquisitions,
+                "waits": self.waits,
+                "total_wait": self.total_wait,
+                "mean_wait": self.mean_wait,
+                "max_wait": self.max_wait,
+                "connections_opened": self.connections_opened,
+                "resizes": self.resizes,
+                "pool_sizes": dict(self.pool_sizes),
+            }
+
+    def record_acquisition(self, wait, waited):  # type: (float, bool) -> None
+        """
+        Args:
+          wait: the time taken to get the connection.
+          waited: whether getting it had to wait for another request to return a connection.
+        """
+        with self._lock:
+            self.acquisitions += 1
+            self.total_wait += wait
+            if waited:
+                self.waits += 1
+            if wait > self.max_wait:
+                self.max_wait = wait
+
+    def record_new_connection(self):  # type: () -> None
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_size(self, host, size, resized):  # type: (str, int, bool) -> None
+        with self._lock:
+            self.pool_sizes[host] = size
+            if resized:
+                self.resizes += 1
+
+
+class _MeteredPoolMixin:
+    """
+    Measures the time _get_conn waits for a connection. An acquisition waits only if the pool
+    blocks and had no idle connection or free slot; the time taken by the others, e.g. to check
+    the connection, is not a wait. With adaptive sizing, a pool grows, up to max_size, while many
+    acquisitions wait, and shrinks, down to min_size, to the peak number of connections it used
+    while none wait.
+    """
+
+    metrics = None  # type: PoolMetrics
+    adaptive = False
+    min_size = 1
+    max_size = 1
+
+    def __init__(self, *args, **kwargs):
+        super(_MeteredPoolMixin, self).__init__(*args, **kwargs)
+        self._resize_lock = threading.Lock()
+        self._window_acquisitions = 0
+        self._window_waits = 0
+        self._window_min_idle = None  # type: typing.Optional[int]
+        # The connections to close rather than return, left over from shrinking.
+        self._excess = 0
+        self.metrics.record_size(self.host, self.pool.maxsize, resized=False)
+
+    def _get_conn(self, timeout=None):
+        idle = self.pool.qsize() if self.pool is not None else 0
+        start = time.perf_counter()
+        conn = super(_MeteredPoolMixin, self)._get_conn(timeout=timeout)
+        wait = time.perf_counter() - start
+        # A non-blocking pool opens a new connection instead of waiting.
+        waited = bool(self.block) and idle == 0
+        self.metrics.record_acquisition(wait, waited)
+        if self.adaptive:
+            self._adapt(waited, idle)
+        return conn
+
+    def _new_conn(self):
+        self.metrics.record_new_connection()
+        return super(_MeteredPoolMixin, self)._new_conn()
+
+    def _put_conn(self, conn):
+        if self._excess:
+            with self._resize_lock:
+                if self._excess:
+                    self._excess -= 1
+                    if conn:
+                        conn.close()
+                    return
+        super(_MeteredPoolMixin, self)._put_conn(conn)
+
+    def _adapt(self, waited, idle):  # type: (bool, int) -> None
+        with self._resize_lock:
+            self._window_acquisitions += 1
+            if waited:
+                self._window_waits += 1
+            if self._window_min_idle is None or idle < self._window_min_idle:
+                self._window_min_idle = idle
+            if self._window_acquisitions < ADAPT_WINDOW:
+                return
+
+            size = self.pool.maxsize
+            if self._window_waits > GROW_WAIT_FRACTION * self._window_acquisitions:
+                new_size = min(self.max_size, size * 2)
+            elif self._window_waits == 0:
+                # The slots that stayed idle through the whole window weren't needed.
+                new_size = max(self.min_size, size - self._window_min_idle)
+            else:
+                new_size = size
+            self._window_acquisitions = 0
+            self._window_waits = 0
+            self._window_min_idle = None
+            if new_size != size:
+                self._resize(new_size)
+
+    def _resize(self, new_size):  # type: (int) -> None
+        """Must be called with the resize lock held."""
+        pool = self.pool
+        if pool is None:
+            return
+        with pool.mutex:
+            old_size = pool.maxsize
+            pool.maxsize = new_size
+        if new_size > old_size:
+            # Connections still to be closed from shrinking can be kept instead.
+            kept = min(self._excess, new_size - old_size)
+            self._excess -= kept
+            # Empty slots let blocked requests open new connections.
+            for _ in range(new_size - old_size - kept):
+                pool.put(None, block=False)
+        else:
+            for _ in range(old_size - new_size):
+                try:
+                    conn = pool.get(block=False)
+                except queue.Empty:
+                    # The remaining connections are in use; close them when they're returned.
+                    self._excess += 1
+                    continue
+                if conn:
+                    conn.close()
+        self.metrics.record_size(self.host, new_size, resized=True)
+
+
+class MeteredHTTPAdapter(requests.adapters.HTTPAdapter):
+    """An HTTPAdapter whose connection pools record PoolMetrics, and may size adaptively."""
+
+    def __init__(
+        self, metrics=None, adaptive=False, min_pool_size=1, max_pool_size=None, **kwargs
+    ):
+        # type: (typing.Optional[PoolMetrics], bool, int, typing.Optional[int], typing.Any) -> None
+        """
+        Args:
+          metrics: the metrics to record to. A new PoolMetrics if not set.
+          adaptive: whether the pools adapt their size to the waits, between min_pool_size and
+            max_pool_size, starting from pool_maxsize.
+          min_pool_size: the smallest size of an adaptive pool.
+          max_pool_size: the largest size of an adaptive pool. Defaults to 4 * pool_maxsize.
+          **kwargs: the HTTPAdapter arguments.
+        """
+        self.metrics = metrics or PoolMetrics()
+        self.adaptive = adaptive
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        super(MeteredHTTPAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super(MeteredHTTPAdapter, self).init_poolmanager(
+            connections, maxsize, block, **pool_kwargs
+        )
+        attributes = {
+            "metrics": self.metrics,
+            "adaptive": self.adaptive,
+            "min_size": max(1, min(self.min_pool_size, maxsize)),
+            "max_size": max(maxsize, self.max_pool_size or 4 * maxsize),
+        }
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "MeteredHTTPConnectionPool", (_MeteredPoolMixin, HTTPConnectionPool), attributes
+            ),
+            "https": type(
+                "MeteredHTTPSConnectionPool", (_MeteredPoolMixin, HTTPSConnectionPool), attributes
+            ),
+        }
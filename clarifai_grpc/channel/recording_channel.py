@@ -0,0 +1,249 @@
+"""
+Channels that record real request/response pairs to a file, and replay them without network.
+
+Record:
+  with RecordingChannel(ClarifaiChannel.get_grpc_channel(), "traffic.rec") as channel:
+    stub = service_pb2_grpc.V2Stub(channel)
+    ...
+
+Replay:
+  stub = service_pb2_grpc.V2Stub(ReplayChannel("traffic.rec", simulate_latency=True))
+
+The file is a sequence of length-prefixed records holding the method name, the serialized request
+and response protobufs, the call latency, and the call metadata with the credentials redacted. If
+the path ends with .gz, the file is gzip-compressed.
+"""
+import collections
+import gzip
+import json
+import struct
+import threading
+import time
+import typing  # noqa
+
+from google.protobuf.message import Message  # noqa
+
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.channel.exceptions import ClarifaiException
+
+MAGIC = b"CLREC1\n"
+REDACTED = "REDACTED"
+REDACTED_METADATA_KEYS = {"authorization", "x-clarifai-session-token"}
+
+_HEADER = struct.Struct("<BdIIII")  # kind, latency, and the lengths of the 4 variable fields.
+_KIND_RESPONSE = 0
+_KIND_ERROR = 1
+
+
+class RecordedCall:
+    def __init__(self, method, request, response, latency, metadata, error=None):
+        # type: (str, bytes, bytes, float, list, typing.Optional[str]) -> None
+        """
+        Args:
+          method: the full method name, e.g. /clarifai.api.V2/PostModelOutputs.
+          request: the deterministically serialized request.
+          response: the serialized response. Empty if the call raised.
+          latency: the duration of the call in seconds.
+          metadata: the call metadata as a list of [key, value] pairs, credentials redacted.
+          error: the string of the exception raised by the call, if any.
+        """
+        self.method = method
+        self.request = request
+        self.response = response
+        self.latency = latency
+        self.metadata = metadata
+        self.error = error
+
+
+def redact_metadata(metadata):  # type: (typing.Optional[tuple]) -> list
+    return [
+        [k, REDACTED if k.lower() in REDACTED_METADATA_KEYS else v] for k, v in (metadata or ())
+    ]
+
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode)
+    return open(path, mode)
+
+
+def write_call(f, call):  # type: (typing.BinaryIO, RecordedCall) -> None
+    method = call.method.encode("utf-8")
+    metadata = json.dumps(call.metadata, separators=(",", ":")).encode("utf-8")
+    error = (call.error or "").encode("utf-8")
+    kind = _KIND_ERROR if call.error is not None else _KIND_RESPONSE
+    f.write(
+        _HEADER.pack(
+            kind, call.latency, len(method), len(call.request), len(call.response), len(metadata)
+        )
+    )
+    f.write(struct.pack("<I", len(error)))
+    for part in (method, call.request, call.response, metadata, error):
+        f.write(part)
+
+
+def read_recording(path):  # type: (str) -> typing.List[RecordedCall]
+    """:return: All the calls in a recording file, in the order they finished."""
+    calls = []
+    with _open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise UsageError("%s is not a recording file" % path)
+        while True:
+            header = f.read(_HEADER.size)
+            if not header:
+                break
+            kind, latency, method_len, request_len, response_len, metadata_len = _HEADER.unpack(
+                header
+            )
+            (error_len,) = struct.unpack("<I", f.read(4))
+            method = f.read(method_len).decode("utf-8")
+            request = f.read(request_len)
+            response = f.read(response_len)
+            metadata = json.loads(f.read(metadata_len).decode("utf-8"))
+            error = f.read(error_len).decode("utf-8") if kind == _KIND_ERROR else None
+            calls.append(RecordedCall(method, request, response, latency, metadata, error))
+    return calls
+
+
+class RecordingChannel:
+    """
+    Wraps a channel (gRPC or JSON) and records every unary-unary call made through it. The
+    overhead per call is serializing the request and the response, and one buffered write.
+    """
+
+    def __init__(self, channel, path):  # type: (typing.Any, str) -> None
+        """
+        Args:
+          channel: the channel to wrap, e.g. ClarifaiChannel.get_grpc_channel().
+          path: the recording file to create.
+        """
+        self._channel = channel
+        self._file = _open(path, "wb")
+        self._file.write(MAGIC)
+        self._lock = threading.Lock()
+
+    def unary_unary(self, name, request_serializer=None, response_deserializer=None):
+        return _RecordingUnaryUnary(
+            self, name, self._channel.unary_unary(name, request_serializer, response_deserializer)
+        )
+
+    def record(self, call):  # type: (RecordedCall) -> None
+        with self._lock:
+            if not self._file.closed:
+                write_call(self._file, call)
+
+    def close(self):  # type: () -> None
+        with self._lock:
+            self._file.close()
+        if hasattr(self._channel, "close"):
+            self._channel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _RecordingUnaryUnary:
+    def __init__(self, recorder, name, multicallable):
+        self._recorder = recorder
+        self._name = name
+        self._multicallable = multicallable
+
+    def __call__(self, request, metadata=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self._multicallable(request, metadata=metadata, **kwargs)
+        except Exception as e:
+            self._recorder.record(
+                RecordedCall(
+                    self._name,
+                    request.SerializeToString(deterministic=True),
+                    b"",
+                    time.perf_counter() - start,
+                    redact_metadata(metadata),
+                    error=str(e),
+                )
+            )
+            raise
+        self._recorder.record(
+            RecordedCall(
+                self._name,
+                request.SerializeToString(deterministic=True),
+                response.SerializeToString(),
+                time.perf_counter() - start,
+                redact_metadata(metadata),
+            )
+        )
+        return response
+
+
+class ReplayChannel:
+    """
+    A channel that answers calls from a recording file instead of the network.
+
+    A call is matched to a recorded call of the same method with the same serialized request.
+    Identical requests recorded several times are answered in the recorded order, cycling when
+    exhausted. With strict=False, a request that was never recorded is answered with the next
+    recorded response of the same method.
+    """
+
+    def __init__(self, path, simulate_latency=False, latency_scale=1.0, strict=True):
+        # type: (str, bool, float, bool) -> None
+        """
+        Args:
+          path: the recording file.
+          simulate_latency: whether to sleep for the recorded latency of each call.
+          latency_scale: multiplies the simulated latency.
+          strict: whether unrecorded requests fail, rather than get another response.
+        """
+        self.simulate_latency = simulate_latency
+        self.latency_scale = latency_scale
+        self.strict = strict
+
+        self._by_request = collections.defaultdict(list)
+        self._by_method = collections.defaultdict(list)
+        for call in read_recording(path):
+            self._by_request[(call.method, call.request)].append(call)
+            self._by_method[call.method].append(call)
+        self._positions = collections.Counter()
+        self._lock = threading.Lock()
+
+    def unary_unary(self, name, request_serializer=None, response_deserializer=None):
+        return _ReplayUnaryUnary(self, name, response_deserializer)
+
+    def next_call(self, name, request):  # type: (str, Message) -> RecordedCall
+        key = (name, request.SerializeToString(deterministic=True))
+        calls = self._by_request.get(key)
+        if not calls:
+            if self.strict or not self._by_method.get(name):
+                raise ClarifaiException("No recorded response for a %s request" % name)
+            key = name
+            calls = self._by_method[name]
+        with self._lock:
+            position = self._positions[key]
+            self._positions[key] += 1
+        return calls[position % len(calls)]
+
+    def close(self):  # type: () -> None
+        pass
+
+
+class _ReplayUnaryUnary:
+    def __init__(self, replay_channel, name, response_deserializer):
+        self._replay_channel = replay_channel
+        self._name = name
+        # Depending on the channel factory last used, the stub passes either the response class
+        # (JSON) or its FromString (gRPC).
+        if isinstance(response_deserializer, type):
+            response_deserializer = response_deserializer.FromString
+        self._response_deserializer = response_deserializer
+
+    def __call__(self, request, metadata=None, **kwargs):
+        call = self._replay_channel.next_call(self._name, request)
+        if self._replay_channel.simulate_latency:
+            time.sleep(call.latency * self._replay_channel.latency_scale)
+        if call.error is not None:
+            raise ClarifaiException(call.error)
+        return self._response_deserializer(call.response)
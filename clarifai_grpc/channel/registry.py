@@ -0,0 +1,184 @@
+"""
+A process-wide registry of shared channels.
+
+Every ClarifaiChannel factory call makes a new channel with its own connection pool, so the
+components of a process that each make their own channel repeat the connection and TLS setup.
+get_shared_channel instead returns one channel per (transport, endpoint, options) key, so that
+all components share the connections:
+
+  from clarifai_grpc.channel.registry import get_shared_channel
+  stub = service_pb2_grpc.V2Stub(get_shared_channel("json", api_key=YOUR_CLARIFAI_API_KEY))
+
+Shared channels must not be closed directly, since other components may be using them. Use
+close_shared_channel or close_shared_channels instead.
+
+In a forked child process, the channels inherited from the parent are dropped, without being
+closed, and new ones are made on first use. For process pools, init_shared_channel makes each
+worker's channel up front:
+
+  with ProcessPoolExecutor(initializer=init_shared_channel, initargs=("json",)) as executor:
+    ...  # The workers call get_shared_stub("json").
+"""
+import os
+import threading
+import typing  # noqa
+import weakref
+
+from clarifai_grpc.channel import clarifai_channel
+from clarifai_grpc.channel.errors import UsageError
+
+TRANSPORTS = ("json", "grpc", "insecure-grpc")
+
+
+def _default_endpoint(transport):  # type: (str) -> str
+    if transport == "json":
+        return os.environ.get("CLARIFAI_API_BASE", "https://api.clarifai.com")
+    if transport == "grpc":
+        return os.environ.get("CLARIFAI_GRPC_BASE") or "api.clarifai.com"
+    return os.environ.get("CLARIFAI_GRPC_BASE", "api-grpc.clarifai.com")
+
+
+def _freeze(value):  # type: (typing.Any) -> typing.Hashable
+    """Makes option values such as interceptor lists usable in a registry key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class ChannelRegistry:
+    """Thread-safe map from (transport, endpoint, options) to a shared channel."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = {}  # type: typing.Dict[tuple, typing.Any]
+        self._pid = os.getpid()
+        _registries.add(self)
+
+    def get(self, transport="grpc", endpoint=None, **options):
+        """
+        Args:
+          transport: one of "json", "grpc" and "insecure-grpc".
+          endpoint: the base URL (json) or host (grpc, insecure-grpc). Defaults to the one the
+            matching ClarifaiChannel factory uses.
+          **options: the other arguments of the matching ClarifaiChannel factory, e.g. api_key,
+            interceptors, or port for insecure-grpc.
+
+        Returns:
+          The shared channel, made by the ClarifaiChannel factory on first use.
+        """
+        key = self._key(transport, endpoint, options)
+        with self._lock:
+            self._drop_if_forked()
+            channel = self._channels.get(key)
+            if channel is None:
+                channel = self._make_channel(key[0], key[1], options)
+                self._channels[key] = channel
+            else:
+                # V2Stub picks the response deserializer the last factory call selected.
+                _select_response_deserializer(transport)
+        return channel
+
+    def close(self, transport="grpc", endpoint=None, **options):  # type: (...) -> bool
+        """Closes and forgets the shared channel of this key. Returns whether there was one."""
+        key = self._key(transport, endpoint, options)
+        with self._lock:
+            self._drop_if_forked()
+            channel = self._channels.pop(key, None)
+        if channel is None:
+            return False
+        channel.close()
+        return True
+
+    def close_all(self):  # type: () -> None
+        with self._lock:
+            self._drop_if_forked()
+            channels = list(self._channels.values())
+            self._channels.clear()
+        for channel in channels:
+            channel.close()
+
+    def __len__(self):
+        with self._lock:
+            self._drop_if_forked()
+            return len(self._channels)
+
+    @staticmethod
+    def _key(transport, endpoint, options):  # type: (str, typing.Optional[str], dict) -> tuple
+        if transport not in TRANSPORTS:
+            raise UsageError(
+                "Unknown transport '%s', expected one of %s" % (transport, ", ".join(TRANSPORTS))
+            )
+        return transport, endpoint or _default_endpoint(transport), _freeze(options)
+
+    @staticmethod
+    def _make_channel(transport, endpoint, options):  # type: (str, str, dict) -> typing.Any
+        if transport == "json":
+            return clarifai_channel.ClarifaiChannel.get_json_channel(endpoint, **options)
+        if transport == "grpc":
+            return clarifai_channel.ClarifaiChannel.get_grpc_channel(endpoint, **options)
+        return clarifai_channel.ClarifaiChannel.get_insecure_grpc_channel(endpoint, **options)
+
+    def _drop_if_forked(self):  # type: () -> None
+        """Must be called with the lock held."""
+        if self._pid != os.getpid():
+            self._channels = {}
+            self._pid = os.getpid()
+
+    def _reset_after_fork(self):  # type: () -> None
+        # The lock may have been held by another thread of the parent at the time of the fork.
+        self._lock = threading.Lock()
+        self._channels = {}
+        self._pid = os.getpid()
+
+
+def _select_response_deserializer(transport):  # type: (str) -> None
+    if transport == "json":
+        deserializer = clarifai_channel._response_deserializer_for_json
+    else:
+        deserializer = clarifai_channel._response_deserializer_for_grpc
+    clarifai_channel.wrap_response_deserializer = deserializer
+
+
+_registries = weakref.WeakSet()  # type: weakref.WeakSet
+
+
+def _reset_registries_after_fork():  # type: () -> None
+    for registry in list(_registries):
+        registry._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_registries_after_fork)
+
+_default_registry = ChannelRegistry()
+
+
+def get_shared_channel(transport="grpc", endpoint=None, **options):
+    """Returns the process-wide shared channel. See ChannelRegistry.get for the arguments."""
+    return _default_registry.get(transport, endpoint, **options)
+
+
+def get_shared_stub(transport="grpc", endpoint=None, **options):
+    """Returns a V2Stub of the process-wide shared channel. See ChannelRegistry.get."""
+    from clarifai_grpc.grpc.api import service_pb2_grpc
+
+    return service_pb2_grpc.V2Stub(get_shared_channel(transport, endpoint, **options))
+
+
+def init_shared_channel(transport="grpc", endpoint=None, options=None):
+    # type: (str, typing.Optional[str], typing.Optional[dict]) -> None
+    """
+    Makes the process's shared channel. Meant as the initializer of multiprocessing pools and
+    ProcessPoolExecutor, whose initargs can't hold keyword arguments, hence the options dict.
+    """
+    get_shared_channel(transport, endpoint, **(options or {}))
+
+
+def close_shared_channel(transport="grpc", endpoint=None, **options):  # type: (...) -> bool
+    return _default_registry.close(transport, endpoint, **options)
+
+
+def close_shared_channels():  # type: () -> None
+    _default_registry.close_all()
@@ -0,0 +1,150 @@
+"""
+Opens a channel's connections ahead of its first call, so that the call doesn't pay for the DNS
+lookup and the TCP, TLS and HTTP/2 setup.
+
+The channel factories do this when passed warm_up, and expose the result as the channel's
+warm_up attribute:
+
+  channel = ClarifaiChannel.get_json_channel(
+      warm_up=True, warm_up_in_background=True, warm_up_connections=4
+  )
+  ...
+  channel.warm_up.wait()
+  print(channel.warm_up.connections, channel.warm_up.seconds)
+"""
+import logging
+import threading
+import time
+import typing  # noqa
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_TIMEOUT = 10.0
+
+logger = logging.getLogger("clarifai")
+
+
+class WarmUp:
+    """The progress and timing of a channel's warm-up."""
+
+    def __init__(self):
+        self.connections = 0  # The number of connections opened.
+        self.seconds = None  # type: typing.Optional[float]
+        self.error = None  # type: typing.Optional[Exception]
+        self._done = threading.Event()
+
+    @property
+    def done(self):  # type: () -> bool
+        return self._done.is_set()
+
+    def wait(self, timeout=None):  # type: (typing.Optional[float]) -> bool
+        """Waits for the warm-up to finish. Returns whether it did within the timeout."""
+        return self._done.wait(timeout)
+
+    def _run(self, open_connections):  # type: (typing.Callable[[], int]) -> None
+        start = time.perf_counter()
+        try:
+            self.connections = open_connections()
+        except Exception as e:
+            logger.warning("Failed to warm up the channel: %s", e)
+            self.error = e
+        finally:
+            self.seconds = time.perf_counter() - start
+            self._done.set()
+
+    def _start(self, open_connections, background):
+        # type: (typing.Callable[[], int], bool) -> WarmUp
+        if background:
+            thread = threading.Thread(
+                target=self._run, args=(open_connections,), name="clarifai-warm-up", daemon=True
+            )
+            thread.start()
+        else:
+            self._run(open_connections)
+        return self
+
+
+def warm_up_grpc_channel(channel, timeout=DEFAULT_TIMEOUT, background=False):
+    # type: (typing.Any, float, bool) -> WarmUp
+    """
+    Connects a gRPC channel.
+    :param channel: The gRPC channel.
+    :param timeout: The seconds to wait for the channel to be ready.
+    :param background: Whether to connect in a background thread instead of waiting for it.
+    :return: The warm-up, with connections set to 1 once connected.
+    """
+    import grpc
+
+    def connect():
+        grpc.channel_ready_future(channel).result(timeout=timeout)
+        return 1
+
+    return WarmUp()._start(connect, background)
+
+
+def warm_up_json_channel(channel, connections=1, timeout=DEFAULT_TIMEOUT, background=False):
+    # type: (typing.Any, int, float, bool) -> WarmUp
+    """
+    Opens connections to the JSON channel's API in its session's connection pool, where the
+    first calls pick them up. With per-thread sessions, only the calling thread's session is
+    warmed up. This relies on the _get_conn and _put_conn methods of urllib3's connection pools;
+    with a urllib3 that lacks them, the warm-up logs a warning and opens no connections.
+    :param channel: The GRPCJSONChannel.
+    :param connections: The number of connections to open in parallel, at most the pool's size.
+    :param timeout: The seconds to wait for each connection.
+    :param background: Whether to connect in a background thread instead of waiting for it.
+    :return: The warm-up.
+    """
+    # With per-thread sessions, the calling thread's, even when connecting in the background.
+    session = getattr(channel.session, "session", channel.session)
+    url = channel.base_url
+
+    def connect():
+        from urllib3.connectionpool import HTTPConnectionPool
+
+        # Checked on urllib3's class, since the metered pools override these.
+        if not (
+            hasattr(HTTPConnectionPool, "_get_conn") and hasattr(HTTPConnectionPool, "_put_conn")
+        ):
+            logger.warning(
+                "Not warming up the channel: this urllib3 version's connection pools have no "
+                "_get_conn and _put_conn methods"
+            )
+            return 0
+        from urllib3.exceptions import EmptyPoolError
+
+        pool = _connection_pool(session, url)
+        pooled_connections = []
+        try:
+            for _ in range(min(connections, pool.pool.maxsize)):
+                try:
+                    # Doesn't wait, so that a blocking pool whose slots are all taken, e.g. by
+                    # concurrent calls, doesn't stall the warm-up.
+                    connection = pool._get_conn(timeout=0)
+                except EmptyPoolError:
+                    break
+                connection.timeout = timeout
+                pooled_connections.append(connection)
+            if pooled_connections:
+                with ThreadPoolExecutor(len(pooled_connections)) as executor:
+                    list(executor.map(lambda connection: connection.connect(), pooled_connections))
+        finally:
+            for connection in pooled_connections:
+                pool._put_conn(connection)
+        return len(pooled_connections)
+
+    return WarmUp()._start(connect, background)
+
+
+def _connection_pool(session, url):  # type: (typing.Any, str) -> typing.Any
+    """The urllib3 connection pool the session sends requests to url through."""
+    import requests
+
+    adapter = session.get_adapter(url)
+    if hasattr(adapter, "get_connection_with_tls_context"):
+        # As in Session.request, e.g. with REQUESTS_CA_BUNDLE set, so that the pool is the same.
+        settings = session.merge_environment_settings(url, {}, None, session.verify, session.cert)
+        request = requests.Request("GET", url).prepare()
+        return adapter.get_connection_with_tls_context(
+            request, verify=settings["verify"], cert=settings["cert"]
+        )
+    return adapter.get_connection(url)
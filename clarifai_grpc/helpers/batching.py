@@ -0,0 +1,218 @@
+import threading
+import time
+import typing  # noqa
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2  # noqa
+
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT = 0.01  # seconds a request may wait for others to join its batch.
+DEFAULT_MAX_WORKERS = 4  # number of batched requests in flight at the same time.
+
+
+class BatchingMetrics:
+    """Counters of a PostModelOutputsBatcher. Safe to read from any thread."""
+
+    def __init__(self, max_batch_size):  # type: (int) -> None
+        self.max_batch_size = max_batch_size
+        self.submitted = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.batched_inputs = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def mean_batch_size(self):  # type: () -> float
+        return self.batched_inputs / self.batches if self.batches else 0.0
+
+    @property
+    def batch_fill(self):  # type: () -> float
+        """The mean batch size as a fraction of max_batch_size."""
+        return self.mean_batch_size / self.max_batch_size
+
+    @property
+    def throughput(self):  # type: () -> float
+        """Inputs sent per second since the batcher was created."""
+        elapsed = time.monotonic() - self.started_at
+        return self.batched_inputs / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (
+            "BatchingMetrics(submitted=%d, batches=%d, failed_batches=%d, batch_fill=%.2f, "
+            "throughput=%.1f/s)"
+            % (
+                self.submitted,
+                self.batches,
+                self.failed_batches,
+                self.batch_fill,
+                self.throughput,
+            )
+        )
+
+
+class _PendingBatch:
+    def __init__(self, template):  # type: (service_pb2.PostModelOutputsRequest) -> None
+        self.template = template
+        self.inputs = []  # type: typing.List[resources_pb2.Input]
+        self.futures = []  # type: typing.List[Future]
+        self.deadline = None  # type: typing.Optional[float]
+
+
+class PostModelOutputsBatcher:
+    """
+    Collects concurrent single-input PostModelOutputs calls and sends them as batched requests.
+
+    Requests are grouped by everything except their inputs, i.e. by user_app_id, model_id,
+    version_id and the model's output_config. A group is sent as soon as it holds max_batch_size
+    inputs, or when its oldest input has waited max_wait seconds. Each caller gets back the
+    Output that corresponds to its own input, which carries that input's own status.
+
+    Example:
+      with PostModelOutputsBatcher(stub.PostModelOutputs, metadata=metadata) as batcher:
+        output = batcher.predict(
+          PostModelOutputsRequest(model_id=GENERAL_MODEL_ID, inputs=[input_])
+        )
+    """
+
+    def __init__(
+        self,
+        stub_method,  # type: typing.Callable
+        metadata=None,  # type: typing.Optional[tuple]
+        max_batch_size=DEFAULT_MAX_BATCH_SIZE,  # type: int
+        max_wait=DEFAULT_MAX_WAIT,  # type: float
+        max_workers=DEFAULT_MAX_WORKERS,  # type: int
+    ):
+        # type: (...) -> None
+        """
+        Args:
+          stub_method: the V2Stub's PostModelOutputs method.
+          metadata: the call metadata, passed to each batched call.
+          max_batch_size: the maximum number of inputs in one batched request.
+          max_wait: the maximum number of seconds an input waits before its batch is sent.
+          max_workers: the maximum number of batched requests in flight.
+        """
+        if max_batch_size < 1:
+            raise UsageError("max_batch_size must be a positive integer")
+
+        self._stub_method = stub_method
+        self._metadata = metadata
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+
+        self.metrics = BatchingMetrics(max_batch_size)
+
+        self._pending = {}  # type: typing.Dict[bytes, _PendingBatch]
+        self._condition = threading.Condition()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._flusher = threading.Thread(target=self._flush_expired_batches, daemon=True)
+        self._flusher.start()
+
+    def submit(self, request):  # type: (service_pb2.PostModelOutputsRequest) -> Future
+        """
+        Queues a single-input PostModelOutputsRequest.
+        :param request: The request. It must contain exactly one input.
+        :return: A future resolving to the resources_pb2.Output of that input.
+        """
+        if len(request.inputs) != 1:
+            raise UsageError("Each batched request must contain exactly one input")
+
+        template = service_pb2.PostModelOutputsRequest()
+        template.CopyFrom(request)
+        del template.inputs[:]
+        key = template.SerializeToString(deterministic=True)
+
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise UsageError("Cannot submit to a closed batcher")
+            self.metrics.submitted += 1
+
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _PendingBatch(template)
+                batch.deadline = time.monotonic() + self._max_wait
+                self._condition.notify()
+            batch.inputs.append(request.inputs[0])
+            batch.futures.append(future)
+
+            if len(batch.inputs) >= self._max_batch_size:
+                del self._pending[key]
+                self._send(batch)
+        return future
+
+    def predict(self, request, timeout=None):
+        # type: (service_pb2.PostModelOutputsRequest, typing.Optional[float]) -> resources_pb2.Output
+        """Same as submit, but blocks until the Output is available."""
+        return self.submit(request).result(timeout)
+
+    def flush(self):  # type: () -> None
+        """Sends all the pending batches right away."""
+        with self._condition:
+            batches = list(self._pending.values())
+            self._pending.clear()
+            for batch in batches:
+                self._send(batch)
+
+    def close(self):  # type: () -> None
+        """Sends the pending batches and waits for all the batched requests to finish."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._flusher.join()
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _flush_expired_batches(self):  # type: () -> None
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                next_deadline = None
+                for key, batch in list(self._pending.items()):
+                    if batch.deadline <= now:
+                        del self._pending[key]
+                        self._send(batch)
+                    elif next_deadline is None or batch.deadline < next_deadline:
+                        next_deadline = batch.deadline
+                timeout = None if next_deadline is None else next_deadline - now
+                self._condition.wait(timeout)
+
+    def _send(self, batch):  # type: (_PendingBatch) -> None
+        # Must be called while holding self._condition.
+        self.metrics.batches += 1
+        self.metrics.batched_inputs += len(batch.inputs)
+        self._executor.submit(self._call, batch)
+
+    def _call(self, batch):  # type: (_PendingBatch) -> None
+        request = batch.template
+        request.inputs.extend(batch.inputs)
+        try:
+            response = self._stub_method(request, metadata=self._metadata)
+            if len(response.outputs) != len(batch.inputs):
+                raise ClarifaiException(
+                    "Expected %d outputs, got %d. Status %s %s %s"
+                    % (
+                        len(batch.inputs),
+                        len(response.outputs),
+                        response.status.code,
+                        response.status.description,
+                        response.status.details,
+                    )
+                )
+        except Exception as e:
+            with self._condition:
+                self.metrics.failed_batches += 1
+            for future in batch.futures:
+                future.set_exception(e)
+            return
+
+        for future, output in zip(batch.futures, response.outputs):
+            future.set_result(output)
@@ -0,0 +1,141 @@
+import collections
+import typing  # noqa
+from concurrent.futures import ThreadPoolExecutor
+
+from google.protobuf import descriptor
+from google.protobuf.message import Message  # noqa
+
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.helpers.responses import raise_on_failure
+
+DEFAULT_PER_PAGE = 128  # the API's own default page size.
+DEFAULT_PREFETCH = 2  # number of pages requested ahead of the one being consumed.
+
+
+def paginate(
+    stub_method,  # type: typing.Callable
+    request,  # type: Message
+    metadata=None,  # type: typing.Optional[tuple]
+    prefetch=DEFAULT_PREFETCH,  # type: int
+    *,
+    max_pages=None,  # type: typing.Optional[int]
+    items_field=None,  # type: typing.Optional[str]
+):
+    # type: (...) -> typing.Iterator[Message]
+    """
+    Lazily yields all the items of a paginated List* method, e.g. all inputs of an app:
+
+      for input_ in paginate(stub.ListInputs, ListInputsRequest(per_page=1000), metadata):
+        ...
+
+    Args:
+      stub_method: a V2Stub method taking a request with `page` and `per_page` fields, or with a
+                   `pagination` field holding them, like the Post*Searches methods.
+      request: the first request. Its `page` is the starting page (default 1), and its `per_page`
+               is the page size (default DEFAULT_PER_PAGE).
+      metadata: the call metadata, passed to each call.
+      prefetch: how many of the following pages to request concurrently while the current page is
+                being consumed. Set to 0 to fetch pages serially.
+      max_pages: an optional upper bound on the number of pages to request.
+      items_field: the name of the repeated field in the response holding the items. Only
+                   required when the response has more than one repeated message field.
+    Returns:
+      An iterator over the items. It stops after the first page that has fewer items than
+      `per_page`.
+    """
+    responses = paginate_responses(
+        stub_method, request, metadata, prefetch, max_pages=max_pages, items_field=items_field
+    )
+    for response in responses:
+        if items_field is None:
+            items_field = _find_items_field(response)
+        for item in getattr(response, items_field):
+            yield item
+
+
+def paginate_responses(
+    stub_method,  # type: typing.Callable
+    request,  # type: Message
+    metadata=None,  # type: typing.Optional[tuple]
+    prefetch=DEFAULT_PREFETCH,  # type: int
+    *,
+    max_pages=None,  # type: typing.Optional[int]
+    items_field=None,  # type: typing.Optional[str]
+):
+    # type: (...) -> typing.Iterator[Message]
+    """
+    Same as `paginate`, but yields whole page responses instead of single items. Each response's
+    status is checked and a ClarifaiException is raised on failure. As in `paginate`, max_pages
+    and items_field are keyword-only.
+    """
+    if prefetch < 0:
+        raise UsageError("prefetch must be a non-negative integer")
+
+    first_page = _page_fields(request).page or 1
+    per_page = _page_fields(request).per_page or DEFAULT_PER_PAGE
+
+    def fetch(page):
+        page_request = type(request)()
+        page_request.CopyFrom(request)
+        page_fields = _page_fields(page_request)
+        page_fields.page = page
+        page_fields.per_page = per_page
+        return stub_method(page_request, metadata=metadata)
+
+    def page_numbers():
+        page = first_page
+        while max_pages is None or page < first_page + max_pages:
+            yield page
+            page += 1
+
+    pages = page_numbers()
+    executor = ThreadPoolExecutor(max_workers=prefetch + 1)
+    in_flight = collections.deque()
+    try:
+        for page in pages:
+            in_flight.append(executor.submit(fetch, page))
+            if len(in_flight) > prefetch:
+                break
+
+        while in_flight:
+            response = in_flight.popleft().result()
+            raise_on_failure(response)
+            if items_field is None:
+                items_field = _find_items_field(response)
+
+            yield response
+
+            if len(getattr(response, items_field)) < per_page:
+                return
+            for page in pages:
+                in_flight.append(executor.submit(fetch, page))
+                break
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _page_fields(request):  # type: (Message) -> Message
+    """The message holding the request's page and per_page fields."""
+    fields = request.DESCRIPTOR.fields_by_name
+    if "page" in fields:
+        return request
+    if "pagination" in fields:
+        return request.pagination
+    raise UsageError("%s is not a paginated request" % request.DESCRIPTOR.name)
+
+
+def _find_items_field(response):  # type: (Message) -> str
+    repeated_fields = [
+        f.name
+        for f in response.DESCRIPTOR.fields
+        if f.label == descriptor.FieldDescriptor.LABEL_REPEATED
+        and f.cpp_type == descriptor.FieldDescriptor.CPPTYPE_MESSAGE
+    ]
+    if len(repeated_fields) != 1:
+        raise UsageError(
+            "Cannot infer which field of %s holds the items, please pass items_field (one of %s)"
+            % (response.DESCRIPTOR.name, repeated_fields)
+        )
+    return repeated_fields[0]
@@ -0,0 +1,16 @@
+from google.protobuf.message import Message  # noqa
+
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.grpc.api.status import status_code_pb2
+
+
+def raise_on_failure(response):  # type: (Message) -> None
+    """
+    Raises a ClarifaiException if the response's status is not SUCCESS.
+    :param response: Any V2 response message with a `status` field.
+    """
+    if response.status.code != status_code_pb2.SUCCESS:
+        raise ClarifaiException(
+            "Request failed with status %s %s %s"
+            % (response.status.code, response.status.description, response.status.details)
+        )
@@ -0,0 +1,206 @@
+import typing  # noqa
+from concurrent.futures import ThreadPoolExecutor
+
+from google.protobuf import descriptor
+from google.protobuf.message import Message  # noqa
+
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.grpc.api.status import status_code_pb2, status_pb2
+
+DEFAULT_MAX_ITEMS = 128  # the API's maximum number of items in one batch request.
+# gRPC's default maximum message size is 4MiB, leave some headroom for the rest of the request.
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024 - 64 * 1024
+DEFAULT_MAX_WORKERS = 4
+
+# The item statuses of a successful item, e.g. INPUT_DOWNLOAD_SUCCESS or ANNOTATION_PENDING.
+ITEM_SUCCESS_CODES = frozenset(
+    code
+    for name, code in status_code_pb2.StatusCode.items()
+    if name.endswith(("SUCCESS", "_PENDING", "_IN_PROGRESS"))
+)
+
+
+class SplitCallResult:
+    """The merged result of a batch request that was split into several chunks."""
+
+    def __init__(
+        self,
+        response,  # type: Message
+        item_statuses,  # type: typing.List[status_pb2.Status]
+        errors,  # type: typing.List[Exception]
+        failed_indices,  # type: typing.List[int]
+    ):
+        # type: (...) -> None
+        """
+        Args:
+          response: a response of the method's type, holding the items of all successful chunks,
+                    and the overall status (SUCCESS, MIXED_STATUS, or the failure status).
+          item_statuses: one status per item of the original request, in the same order.
+          errors: the exceptions raised by chunk calls that did not return a response.
+          failed_indices: the indices of the original request's items that did not succeed.
+        """
+        self.response = response
+        self.item_statuses = item_statuses
+        self.errors = errors
+        self.failed_indices = failed_indices
+
+
+def split_request(
+    request,  # type: Message
+    max_items=DEFAULT_MAX_ITEMS,  # type: int
+    max_bytes=DEFAULT_MAX_BYTES,  # type: int
+    items_field=None,  # type: typing.Optional[str]
+):
+    # type: (...) -> typing.List[Message]
+    """
+    Splits a batch request, such as PostInputsRequest or DeleteInputsRequest, into several
+    requests of the same type so that each one has at most max_items items and (unless a single
+    item is larger than that) at most max_bytes serialized bytes. All the other fields are copied
+    to every chunk.
+
+    Args:
+      request: the request to split.
+      max_items: the maximum number of items per chunk.
+      max_bytes: the maximum serialized size of each chunk.
+      items_field: the name of the repeated field to split. Only required when the request has
+                   more than one repeated field.
+    Returns:
+      The chunk requests, in order.
+    """
+    if max_items < 1:
+        raise UsageError("max_items must be a positive integer")
+    items_field = items_field or _find_items_field(request)
+    field = request.DESCRIPTOR.fields_by_name[items_field]
+    is_message = field.cpp_type == descriptor.FieldDescriptor.CPPTYPE_MESSAGE
+
+    template = type(request)()
+    template.CopyFrom(request)
+    template.ClearField(items_field)
+    base_size = template.ByteSize()
+
+    chunks = []
+    chunk_items = []
+    chunk_size = base_size
+    for item in getattr(request, items_field):
+        # The 5 bytes account for the field tag and the varint length prefix of each item.
+        item_size = (item.ByteSize() if is_message else len(_to_bytes(item))) + 5
+        if chunk_items and (len(chunk_items) >= max_items or chunk_size + item_size > max_bytes):
+            chunks.append(_make_chunk(template, items_field, chunk_items))
+            chunk_items = []
+            chunk_size = base_size
+        chunk_items.append(item)
+        chunk_size += item_size
+    if chunk_items or not chunks:
+        chunks.append(_make_chunk(template, items_field, chunk_items))
+    return chunks
+
+
+def call_in_chunks(
+    stub_method,  # type: typing.Callable
+    request,  # type: Message
+    metadata=None,  # type: typing.Optional[tuple]
+    max_items=DEFAULT_MAX_ITEMS,  # type: int
+    max_bytes=DEFAULT_MAX_BYTES,  # type: int
+    max_workers=DEFAULT_MAX_WORKERS,  # type: int
+    items_field=None,  # type: typing.Optional[str]
+):
+    # type: (...) -> SplitCallResult
+    """
+    Calls a batch method, e.g. PostInputs, PostAnnotations, PatchInputs or DeleteInputs, with
+    a request of any size: the request is split with split_request, at most max_workers chunks are
+    sent concurrently, and the responses are merged.
+
+    Example:
+      result = call_in_chunks(stub.PostInputs, PostInputsRequest(inputs=inputs), metadata)
+      for i in result.failed_indices:
+        print(inputs[i].id, result.item_statuses[i].description)
+
+    Returns:
+      A SplitCallResult.
+    """
+    items_field = items_field or _find_items_field(request)
+    chunks = split_request(request, max_items, max_bytes, items_field)
+
+    def call(chunk):
+        try:
+            return stub_method(chunk, metadata=metadata), None
+        except Exception as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(call, chunks))
+
+    responses = [response for response, _ in results if response is not None]
+    errors = [error for _, error in results if error is not None]
+    if not responses:
+        raise errors[0]
+
+    merged = type(responses[0])()
+    item_statuses = []
+    failed_indices = []
+    for chunk, (response, error) in zip(chunks, results):
+        chunk_size = len(getattr(chunk, items_field))
+        if response is None:
+            failure = status_pb2.Status(
+                code=status_code_pb2.FAILURE, description="Request failed", details=str(error)
+            )
+            failed_indices.extend(range(len(item_statuses), len(item_statuses) + chunk_size))
+            item_statuses.extend([failure] * chunk_size)
+            continue
+
+        response_items = []
+        for field in response.DESCRIPTOR.fields:
+            if field.label == descriptor.FieldDescriptor.LABEL_REPEATED:
+                getattr(merged, field.name).extend(getattr(response, field.name))
+                if field.name == items_field:
+                    response_items = getattr(response, field.name)
+
+        chunk_succeeded = response.status.code == status_code_pb2.SUCCESS
+        for i in range(chunk_size):
+            item_status = None
+            if i < len(response_items) and "status" in response_items[i].DESCRIPTOR.fields_by_name:
+                item_status = response_items[i].status
+            if item_status is None or not item_status.code:
+                item_status = response.status
+            # The items of a successful chunk all succeeded, whatever their own status. Those of
+            # a MIXED_STATUS or failed chunk are told apart by their status.
+            if not chunk_succeeded and item_status.code not in ITEM_SUCCESS_CODES:
+                failed_indices.append(len(item_statuses))
+            item_statuses.append(item_status)
+
+    merged.status.CopyFrom(_merge_statuses(item_statuses, failed_indices))
+    return SplitCallResult(merged, item_statuses, errors, failed_indices)
+
+
+def _merge_statuses(statuses, failed_indices):
+    # type: (typing.List[status_pb2.Status], typing.List[int]) -> status_pb2.Status
+    if not failed_indices:
+        return status_pb2.Status(code=status_code_pb2.SUCCESS, description="Ok")
+    if len(failed_indices) == len(statuses):
+        return statuses[failed_indices[0]]
+    return status_pb2.Status(code=status_code_pb2.MIXED_STATUS, description="Mixed Success")
+
+
+def _make_chunk(template, items_field, items):
+    chunk = type(template)()
+    chunk.CopyFrom(template)
+    getattr(chunk, items_field).extend(items)
+    return chunk
+
+
+def _to_bytes(value):
+    return value.encode("utf-8") if isinstance(value, str) else value
+
+
+def _find_items_field(request):  # type: (Message) -> str
+    repeated_fields = [
+        f.name
+        for f in request.DESCRIPTOR.fields
+        if f.label == descriptor.FieldDescriptor.LABEL_REPEATED
+    ]
+    if len(repeated_fields) != 1:
+        raise UsageError(
+            "Cannot infer which field of %s to split, please pass items_field (one of %s)"
+            % (request.DESCRIPTOR.name, repeated_fields)
+        )
+    return repeated_fields[0]
@@ -0,0 +1,119 @@
+import time
+import typing  # noqa
+from concurrent.futures import ThreadPoolExecutor
+
+from google.protobuf.message import Message  # noqa
+
+from clarifai_grpc.grpc.api import service_pb2
+from clarifai_grpc.helpers.responses import raise_on_failure
+
+DEFAULT_PER_PAGE = 1000
+
+
+class PageStats:
+    """Latency statistics of the pages fetched so far by a StreamInputsIterator."""
+
+    def __init__(self):
+        self.latencies = []  # type: typing.List[float]
+        self.item_count = 0
+
+    @property
+    def page_count(self):  # type: () -> int
+        return len(self.latencies)
+
+    @property
+    def total_latency(self):  # type: () -> float
+        return sum(self.latencies)
+
+    @property
+    def mean_latency(self):  # type: () -> float
+        return self.total_latency / len(self.latencies) if self.latencies else 0.0
+
+    @property
+    def max_latency(self):  # type: () -> float
+        return max(self.latencies) if self.latencies else 0.0
+
+    def __repr__(self):
+        return "PageStats(pages=%d, items=%d, mean_latency=%.3fs, max_latency=%.3fs)" % (
+            self.page_count,
+            self.item_count,
+            self.mean_latency,
+            self.max_latency,
+        )
+
+
+class StreamInputsIterator:
+    """
+    Iterates over all inputs of an app using StreamInputs' `last_id` cursor. As soon as a page
+    arrives, the request for the next page is sent in the background, so the network round-trip
+    overlaps with the consumption of the current page.
+
+    Example:
+      inputs = StreamInputsIterator(stub.StreamInputs, metadata=metadata)
+      for input_ in inputs:
+        ...
+      print(inputs.stats)
+
+    If the iteration is interrupted, `last_id` holds the ID of the last input that was yielded and
+    can be passed as `last_id` to a new iterator to resume from there.
+    """
+
+    def __init__(
+        self,
+        stub_method,  # type: typing.Callable
+        request=None,  # type: typing.Optional[service_pb2.StreamInputsRequest]
+        metadata=None,  # type: typing.Optional[tuple]
+        last_id=None,  # type: typing.Optional[str]
+    ):
+        # type: (...) -> None
+        """
+        Args:
+          stub_method: the V2Stub's StreamInputs method.
+          request: an optional template request, e.g. to set user_app_id, per_page or descending.
+          metadata: the call metadata, passed to each call.
+          last_id: the cursor to start after. Overrides the request's last_id.
+        """
+        self._stub_method = stub_method
+        self._request = service_pb2.StreamInputsRequest()
+        if request is not None:
+            self._request.CopyFrom(request)
+        if not self._request.per_page:
+            self._request.per_page = DEFAULT_PER_PAGE
+        if last_id is not None:
+            self._request.last_id = last_id
+        self._metadata = metadata
+
+        self.last_id = self._request.last_id
+        self.stats = PageStats()
+
+    def __iter__(self):  # type: () -> typing.Iterator[Message]
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(self._fetch, self._request.last_id)
+        try:
+            while True:
+                response, latency = future.result()
+                raise_on_failure(response)
+                self.stats.latencies.append(latency)
+                self.stats.item_count += len(response.inputs)
+
+                if not response.inputs:
+                    return
+
+                # Pipeline the next page while the caller consumes this one.
+                future = executor.submit(self._fetch, response.inputs[-1].id)
+
+                for input_ in response.inputs:
+                    self.last_id = input_.id
+                    yield input_
+        finally:
+            future.cancel()
+            executor.shutdown(wait=False)
+
+    def _fetch(self, last_id):  # type: (str) -> typing.Tuple[Message, float]
+        request = service_pb2.StreamInputsRequest()
+        request.CopyFrom(self._request)
+        request.last_id = last_id
+
+        start = time.perf_counter()
+        response = self._stub_method(request, metadata=self._metadata)
+        return response, time.perf_counter() - start
@@ -0,0 +1,650 @@
+"""
+An in-process fake of the V2 API, for offline tests, load tests and benchmarks.
+
+The same in-memory backend is served both as a gRPC servicer and as HTTP JSON routes derived from
+the methods' google.api.http bindings, so it works with all of ClarifaiChannel's channels:
+
+  with FakeV2Server() as server:
+    stub = server.grpc_stub()  # or server.json_stub()
+    stub.PostInputs(PostInputsRequest(inputs=[...]), metadata=metadata)
+
+Only a subset of the methods is implemented (see FakeV2Backend); the others fail with
+UNIMPLEMENTED on gRPC and a 501 HTTP status on JSON. Latency and errors can be injected with
+FaultInjection.
+"""
+import json
+import random
+import re
+import threading
+import time
+import typing  # noqa
+import uuid
+from concurrent import futures
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qsl, urlsplit
+
+import grpc
+from google.protobuf import symbol_database
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.message import Message  # noqa
+
+from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.custom_converters.custom_dict_to_message import dict_to_protobuf
+from clarifai_grpc.channel.custom_converters.custom_message_to_dict import protobuf_to_dict
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2, service_pb2_grpc
+from clarifai_grpc.grpc.api.status import status_code_pb2, status_pb2
+
+DEFAULT_PER_PAGE = 128
+HTTP_METHODS = ("get", "post", "patch", "put", "delete")
+
+DEFAULT_CONCEPTS = [
+    resources_pb2.Concept(id="ai_dog", name="dog", value=0.98),
+    resources_pb2.Concept(id="ai_animal", name="animal", value=0.95),
+    resources_pb2.Concept(id="ai_pet", name="pet", value=0.9),
+]
+
+
+class FaultInjection:
+    """
+    Latency and errors added to every call served by a FakeV2Server. The attributes may be
+    changed while the server is running.
+
+    Attributes:
+      latency: seconds added to each call.
+      jitter: up to this many random seconds added on top of latency.
+      error_rate: fraction of calls answered with a response whose status is error_status_code.
+      error_status_code: the status code of injected API errors.
+      transport_error_rate: fraction of calls failing at the transport level: UNAVAILABLE on
+                            gRPC, and a non-JSON 503 response on HTTP.
+    """
+
+    def __init__(
+        self,
+        latency=0.0,  # type: float
+        jitter=0.0,  # type: float
+        error_rate=0.0,  # type: float
+        error_status_code=status_code_pb2.INTERNAL_UNCATEGORIZED,  # type: int
+        transport_error_rate=0.0,  # type: float
+        seed=None,  # type: typing.Optional[int]
+    ):
+        # type: (...) -> None
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status_code = error_status_code
+        self.transport_error_rate = transport_error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self):  # type: () -> float
+        with self._lock:
+            return self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+
+    def should_fail_transport(self):  # type: () -> bool
+        with self._lock:
+            return self._random.random() < self.transport_error_rate
+
+    def should_fail(self):  # type: () -> bool
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+
+class _TransportError(Exception):
+    pass
+
+
+def _status(code, description=""):  # type: (int, str) -> status_pb2.Status
+    return status_pb2.Status(code=code, description=description)
+
+
+def _success():  # type: () -> status_pb2.Status
+    return _status(status_code_pb2.SUCCESS, "Ok")
+
+
+def _page(items, page, per_page):
+    page = page or 1
+    per_page = per_page or DEFAULT_PER_PAGE
+    return items[(page - 1) * per_page : page * per_page]
+
+
+def _new_id():  # type: () -> str
+    return uuid.uuid4().hex
+
+
+class FakeV2Backend:
+    """
+    The in-memory implementation of the V2 methods the fake server supports. Each method takes a
+    request message and returns a response message. All the apps share the same storage.
+    """
+
+    METHODS = (
+        "PostInputs",
+        "GetInput",
+        "ListInputs",
+        "StreamInputs",
+        "PatchInputs",
+        "DeleteInput",
+        "DeleteInputs",
+        "PostInputsSearches",
+        "PostAnnotations",
+        "GetAnnotation",
+        "ListAnnotations",
+        "PatchAnnotations",
+        "DeleteAnnotation",
+        "DeleteAnnotations",
+        "PostConcepts",
+        "GetConcept",
+        "ListConcepts",
+        "PatchConcepts",
+        "PostModelOutputs",
+    )
+
+    def __init__(self):
+        self.inputs = {}  # type: typing.Dict[str, resources_pb2.Input]
+        self.annotations = {}  # type: typing.Dict[str, resources_pb2.Annotation]
+        self.concepts = {}  # type: typing.Dict[str, resources_pb2.Concept]
+        # Canned PostModelOutputs data per model ID: either a resources_pb2.Data, or a callable
+        # taking the resources_pb2.Input and returning a resources_pb2.Data.
+        self.model_outputs = {}  # type: typing.Dict[str, typing.Any]
+        self._lock = threading.RLock()
+
+    def set_model_output(self, model_id, data):
+        # type: (str, typing.Union[resources_pb2.Data, typing.Callable]) -> None
+        """Sets what PostModelOutputs returns for the model's inputs."""
+        self.model_outputs[model_id] = data
+
+    def call(self, method_name, request):  # type: (str, Message) -> Message
+        with self._lock:
+            return getattr(self, "_" + method_name)(request)
+
+    # Inputs.
+
+    def _PostInputs(self, request):
+        response = service_pb2.MultiInputResponse(status=_success())
+        for input_ in request.inputs:
+            stored = resources_pb2.Input()
+            stored.CopyFrom(input_)
+            if not stored.id:
+                stored.id = _new_id()
+            if stored.id in self.inputs:
+                stored.status.CopyFrom(_status(status_code_pb2.INPUT_DUPLICATE, "Duplicate"))
+                response.status.CopyFrom(_status(status_code_pb2.FAILURE, "Failure"))
+            else:
+                stored.status.CopyFrom(_status(status_code_pb2.INPUT_DOWNLOAD_SUCCESS))
+                stored.created_at.GetCurrentTime()
+                self.inputs[stored.id] = stored
+            response.inputs.append(stored)
+        return response
+
+    def _GetInput(self, request):
+        if request.input_id not in self.inputs:
+            return service_pb2.SingleInputResponse(
+                status=_status(status_code_pb2.INPUT_DOES_NOT_EXIST, "Input does not exist")
+            )
+        return service_pb2.SingleInputResponse(
+            status=_success(), input=self.inputs[request.input_id]
+        )
+
+    def _ListInputs(self, request):
+        inputs = list(self.inputs.values())
+        if request.ids:
+            inputs = [i for i in inputs if i.id in request.ids]
+        return service_pb2.MultiInputResponse(
+            status=_success(), inputs=_page(inputs, request.page, request.per_page)
+        )
+
+    def _StreamInputs(self, request):
+        ids = sorted(self.inputs, reverse=request.descending)
+        if request.last_id:
+            if request.descending:
+                ids = [i for i in ids if i < request.last_id]
+            else:
+                ids = [i for i in ids if i > request.last_id]
+        ids = ids[: request.per_page or DEFAULT_PER_PAGE]
+        return service_pb2.MultiInputResponse(
+            status=_success(), inputs=[self.inputs[i] for i in ids]
+        )
+
+    def _PatchInputs(self, request):
+        response = service_pb2.MultiInputResponse(status=_success())
+        for patch in request.inputs:
+            stored = self.inputs.get(patch.id)
+            if stored is None:
+                return service_pb2.MultiInputResponse(
+                    status=_status(status_code_pb2.INPUT_DOES_NOT_EXIST, "Input does not exist")
+                )
+            _patch_data(stored.data, patch.data, request.action)
+            stored.modified_at.GetCurrentTime()
+            response.inputs.append(stored)
+        return response
+
+    def _DeleteInput(self, request):
+        return self._DeleteInputs(service_pb2.DeleteInputsRequest(ids=[request.input_id]))
+
+    def _DeleteInputs(self, request):
+        for input_id in request.ids:
+            self.inputs.pop(input_id, None)
+            for annotation in list(self.annotations.values()):
+                if annotation.input_id == input_id:
+                    del self.annotations[annotation.id]
+        return status_pb2.BaseResponse(status=_success())
+
+    def _PostInputsSearches(self, request):
+        # Only the concepts of the ranks are searched for, in the inputs' data.concepts. A hit's
+        # score is the highest value of those concepts, and a query without any matches every
+        # input with a score of 1.
+        concept_ids = {
+            concept.id
+            for search in request.searches
+            for rank in search.query.ranks
+            for concept in rank.annotation.data.concepts
+        }
+        hits = []
+        for input_ in self.inputs.values():
+            if concept_ids:
+                values = [c.value for c in input_.data.concepts if c.id in concept_ids]
+                if not values:
+                    continue
+                score = max(values)
+            else:
+                score = 1.0
+            hits.append(resources_pb2.Hit(score=score, input=input_))
+        hits.sort(key=lambda hit: -hit.score)
+        return service_pb2.MultiSearchResponse(
+            status=_success(),
+            hits=_page(hits, request.pagination.page, request.pagination.per_page),
+        )
+
+    # Annotations.
+
+    def _PostAnnotations(self, request):
+        response = service_pb2.MultiAnnotationResponse(status=_success())
+        for annotation in request.annotations:
+            if annotation.input_id not in self.inputs:
+                return service_pb2.MultiAnnotationResponse(
+                    status=_status(status_code_pb2.INPUT_DOES_NOT_EXIST, "Input does not exist")
+                )
+            stored = resources_pb2.Annotation()
+            stored.CopyFrom(annotation)
+            if not stored.id:
+                stored.id = _new_id()
+            stored.status.CopyFrom(_status(status_code_pb2.ANNOTATION_SUCCESS))
+            stored.created_at.GetCurrentTime()
+            self.annotations[stored.id] = stored
+            response.annotations.append(stored)
+        return response
+
+    def _GetAnnotation(self, request):
+        annotation = self.annotations.get(request.annotation_id)
+        if annotation is None:
+            return service_pb2.SingleAnnotationResponse(
+                status=_status(status_code_pb2.FAILURE, "Annotation does not exist")
+            )
+        return service_pb2.SingleAnnotationResponse(status=_success(), annotation=annotation)
+
+    def _ListAnnotations(self, request):
+        annotations = list(self.annotations.values())
+        if request.ids:
+            annotations = [a for a in annotations if a.id in request.ids]
+        if request.input_ids:
+            annotations = [a for a in annotations if a.input_id in request.input_ids]
+        return service_pb2.MultiAnnotationResponse(
+            status=_success(), annotations=_page(annotations, request.page, request.per_page)
+        )
+
+    def _PatchAnnotations(self, request):
+        response = service_pb2.MultiAnnotationResponse(status=_success())
+        for patch in request.annotations:
+            stored = self.annotations.get(patch.id)
+            if stored is None:
+                return service_pb2.MultiAnnotationResponse(
+                    status=_status(status_code_pb2.FAILURE, "Annotation does not exist")
+                )
+            _patch_data(stored.data, patch.data, request.action)
+            stored.modified_at.GetCurrentTime()
+            response.annotations.append(stored)
+        return response
+
+    def _DeleteAnnotation(self, request):
+        self.annotations.pop(request.annotation_id, None)
+        return status_pb2.BaseResponse(status=_success())
+
+    def _DeleteAnnotations(self, request):
+        for annotation in list(self.annotations.values()):
+            if annotation.id in request.ids or annotation.input_id in request.input_ids:
+                del self.annotations[annotation.id]
+        return status_pb2.BaseResponse(status=_success())
+
+    # Concepts.
+
+    def _PostConcepts(self, request):
+        response = service_pb2.MultiConceptResponse(status=_success())
+        for concept in request.concepts:
+            stored = resources_pb2.Concept()
+            stored.CopyFrom(concept)
+            if not stored.name:
+                stored.name = stored.id
+            stored.created_at.GetCurrentTime()
+            self.concepts[stored.id] = stored
+            response.concepts.append(stored)
+        return response
+
+    def _GetConcept(self, request):
+        concept = self.concepts.get(request.concept_id)
+        if concept is None:
+            return service_pb2.SingleConceptResponse(
+                status=_status(status_code_pb2.FAILURE, "Concept does not exist")
+            )
+        return service_pb2.SingleConceptResponse(status=_success(), concept=concept)
+
+    def _ListConcepts(self, request):
+        return service_pb2.MultiConceptResponse(
+            status=_success(),
+            concepts=_page(list(self.concepts.values()), request.page, request.per_page),
+        )
+
+    def _PatchConcepts(self, request):
+        response = service_pb2.MultiConceptResponse(status=_success())
+        for patch in request.concepts:
+            stored = self.concepts.get(patch.id)
+            if stored is None:
+                return service_pb2.MultiConceptResponse(
+                    status=_status(status_code_pb2.FAILURE, "Concept does not exist")
+                )
+            if patch.name:
+                stored.name = patch.name
+            response.concepts.append(stored)
+        return response
+
+    # Predict.
+
+    def _PostModelOutputs(self, request):
+        canned = self.model_outputs.get(request.model_id)
+        response = service_pb2.MultiOutputResponse(status=_success())
+        for input_ in request.inputs:
+            if callable(canned):
+                data = canned(input_)
+            elif canned is not None:
+                data = canned
+            else:
+                data = resources_pb2.Data(concepts=DEFAULT_CONCEPTS)
+            output = response.outputs.add(id=_new_id(), status=_success(), data=data)
+            output.model.id = request.model_id
+            output.model.model_version.id = request.version_id
+            output.input.CopyFrom(input_)
+            output.created_at.GetCurrentTime()
+        return response
+
+
+def _patch_data(stored, patch, action):
+    # type: (resources_pb2.Data, resources_pb2.Data, str) -> None
+    if action == "overwrite":
+        for field, value in patch.ListFields():
+            stored.ClearField(field.name)
+            getattr(stored, field.name).MergeFrom(value)
+    elif action == "remove":
+        for key in patch.metadata.fields:
+            if key in stored.metadata.fields:
+                del stored.metadata.fields[key]
+        removed_ids = {c.id for c in patch.concepts}
+        kept = [c for c in stored.concepts if c.id not in removed_ids]
+        del stored.concepts[:]
+        stored.concepts.extend(kept)
+    else:  # merge
+        concepts = {c.id: c for c in stored.concepts}
+        for concept in patch.concepts:
+            concepts[concept.id] = concept
+        merged_concepts = list(concepts.values())
+        stored.MergeFrom(patch)
+        del stored.concepts[:]
+        stored.concepts.extend(merged_concepts)
+
+
+class _MethodRoute:
+    def __init__(self, method_name, http_method, template):
+        self.method_name = method_name
+        self.http_method = http_method
+        self.fields = re.findall(r"\{(.*?)\}", template)
+        pattern = re.escape(template)
+        for field in self.fields:
+            pattern = pattern.replace(re.escape("{" + field + "}"), "([^/]+)")
+        self.regex = re.compile("^" + pattern + "$")
+
+    def match(self, http_method, path):  # type: (str, str) -> typing.Optional[dict]
+        if http_method != self.http_method:
+            return None
+        match = self.regex.match(path)
+        if not match:
+            return None
+        return dict(zip(self.fields, match.groups()))
+
+
+def _http_routes(service_descriptor=service_pb2._V2):  # type: (typing.Any) -> list
+    """
+    :return: A _MethodRoute for each of the google.api.http bindings (the main binding and all
+             the additional ones) of every method. Templates with fewer path parameters come first,
+             so literal paths like /v2/inputs/searches win over /v2/inputs/{input_id}.
+    """
+    routes = []
+    for m in service_descriptor.methods:
+        for field, value in m.GetOptions().ListFields():
+            if field.name == "http":
+                break
+        else:
+            continue
+        for http_rule in [value] + list(value.additional_bindings):
+            for http_method in HTTP_METHODS:
+                template = getattr(http_rule, http_method)
+                if template:
+                    routes.append(_MethodRoute(m.name, http_method.upper(), template))
+    routes.sort(key=lambda r: len(r.fields))
+    return routes
+
+
+def _set_nested(js, dotted_key, value):  # type: (dict, str, typing.Any) -> None
+    keys = dotted_key.split(".")
+    for key in keys[:-1]:
+        js = js.setdefault(key, {})
+    js[keys[-1]] = value
+
+
+def _query_to_dict(query):  # type: (str) -> dict
+    js = {}
+    values = {}
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        # HttpClient encodes Python booleans with str().
+        if value in ("True", "False"):
+            value = value.lower()
+        values.setdefault(key, []).append(value)
+    for key, key_values in values.items():
+        _set_nested(js, key, key_values if len(key_values) > 1 else key_values[0])
+    return js
+
+
+def _wrap_repeated_query_values(js, message_descriptor):  # type: (dict, typing.Any) -> None
+    """A repeated field given only once in the query string is parsed as a single value."""
+    for key, value in js.items():
+        field = message_descriptor.fields_by_name.get(key)
+        if field is None:
+            continue
+        if field.label == FieldDescriptor.LABEL_REPEATED and not isinstance(value, list):
+            js[key] = [value]
+        elif (
+            field.message_type is not None
+            and not field.message_type.full_name.startswith("google.protobuf.")
+            and isinstance(value, dict)
+        ):
+            _wrap_repeated_query_values(value, field.message_type)
+
+
+class FakeV2Server:
+    """Serves a FakeV2Backend over gRPC and over HTTP JSON on localhost."""
+
+    def __init__(self, backend=None, faults=None, api_key=None, max_workers=16, host="127.0.0.1"):
+        # type: (FakeV2Backend, FaultInjection, typing.Optional[str], int, str) -> None
+        """
+        Args:
+          backend: the backend to serve. A new, empty one by default.
+          faults: the latency and errors to inject. None by default.
+          api_key: if set, calls with any other key fail with CONN_KEY_INVALID.
+          max_workers: the number of threads of the gRPC server.
+          host: the interface to listen on.
+        """
+        self.backend = backend or FakeV2Backend()
+        self.faults = faults or FaultInjection()
+        self.api_key = api_key
+
+        self._method_descriptors = service_pb2._V2.methods_by_name
+        self._symbol_database = symbol_database.Default()
+
+        self._grpc_server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+        service_pb2_grpc.add_V2Servicer_to_server(_Servicer(self), self._grpc_server)
+        self.grpc_host = host
+        self.grpc_port = self._grpc_server.add_insecure_port("%s:0" % host)
+
+        self._http_server = _ThreadingHTTPServer((host, 0), _JSONHandler)
+        self._http_server.fake = self
+        self._http_server.routes = _http_routes()
+        self.base_url = "http://%s:%d" % (host, self._http_server.server_address[1])
+        self._http_thread = threading.Thread(
+            target=self._http_server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    def start(self):  # type: () -> FakeV2Server
+        self._grpc_server.start()
+        self._http_thread.start()
+        return self
+
+    def stop(self):  # type: () -> None
+        self._http_server.shutdown()
+        self._http_server.server_close()
+        self._grpc_server.stop(None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def grpc_channel(self, interceptors=None, api_key=None):
+        return ClarifaiChannel.get_insecure_grpc_channel(
+            self.grpc_host, self.grpc_port, interceptors=interceptors, api_key=api_key
+        )
+
+    def json_channel(self, interceptors=None, api_key=None, **options):
+        """options are other arguments of ClarifaiChannel.get_json_channel."""
+        return ClarifaiChannel.get_json_channel(
+            self.base_url, interceptors=interceptors, api_key=api_key, **options
+        )
+
+    def grpc_stub(self, interceptors=None, api_key=None):  # type: (...) -> service_pb2_grpc.V2Stub
+        return service_pb2_grpc.V2Stub(self.grpc_channel(interceptors, api_key))
+
+    def json_stub(self, interceptors=None, api_key=None):  # type: (...) -> service_pb2_grpc.V2Stub
+        return service_pb2_grpc.V2Stub(self.json_channel(interceptors, api_key))
+
+    def response_class(self, method_name):  # type: (str) -> type
+        output_type = self._method_descriptors[method_name].output_type
+        return self._symbol_database.GetSymbol(output_type.full_name)
+
+    def request_class(self, method_name):  # type: (str) -> type
+        input_type = self._method_descriptors[method_name].input_type
+        return self._symbol_database.GetSymbol(input_type.full_name)
+
+    def handle(self, method_name, request, authorization):
+        # type: (str, Message, typing.Optional[str]) -> Message
+        """Runs a call through the fault injection, the auth check and the backend."""
+        delay = self.faults.delay()
+        if delay:
+            time.sleep(delay)
+        if self.faults.should_fail_transport():
+            raise _TransportError("Injected transport error")
+
+        if self.api_key is not None and authorization != "Key " + self.api_key:
+            return self.response_class(method_name)(
+                status=_status(status_code_pb2.CONN_KEY_INVALID, "API key not found")
+            )
+        if self.faults.should_fail():
+            return self.response_class(method_name)(
+                status=_status(self.faults.error_status_code, "Injected error")
+            )
+        return self.backend.call(method_name, request)
+
+
+class _Servicer(service_pb2_grpc.V2Servicer):
+    def __init__(self, fake):  # type: (FakeV2Server) -> None
+        self._fake = fake
+        for method_name in FakeV2Backend.METHODS:
+            setattr(self, method_name, self._make_handler(method_name))
+
+    def _make_handler(self, method_name):
+        def handler(request, context):
+            authorization = dict(context.invocation_metadata()).get("authorization")
+            try:
+                return self._fake.handle(method_name, request, authorization)
+            except _TransportError as e:
+                context.abort(grpc.StatusCode.UNAVAILABLE, str(e))
+
+        return handler
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _handle(self):
+        fake = self.server.fake  # type: FakeV2Server
+        url = urlsplit(self.path)
+
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        for route in self.server.routes:
+            path_params = route.match(self.command, url.path)
+            if path_params is not None:
+                break
+        else:
+            self._send(404, b'{"status": {"code": 10020, "description": "Resource not found"}}')
+            return
+
+        if route.method_name not in FakeV2Backend.METHODS:
+            self._send(501, b'{"status": {"code": 10020, "description": "Not implemented"}}')
+            return
+
+        request_class = fake.request_class(route.method_name)
+        js = json.loads(body.decode("utf-8")) if body else {}
+        js.update(_query_to_dict(url.query))
+        for field, value in path_params.items():
+            _set_nested(js, field, value)
+        _wrap_repeated_query_values(js, request_class.DESCRIPTOR)
+        try:
+            request = dict_to_protobuf(request_class, js, ignore_unknown_fields=True)
+        except Exception as e:
+            body = json.dumps({"status": {"code": 10020, "description": str(e)}})
+            self._send(400, body.encode("utf-8"))
+            return
+
+        try:
+            response = fake.handle(route.method_name, request, self.headers.get("Authorization"))
+        except _TransportError:
+            self._send(503, b"Service Unavailable", content_type="text/plain")
+            return
+        response_js = protobuf_to_dict(response, use_integers_for_enums=False)
+        self._send(200, json.dumps(response_js).encode("utf-8"))
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+    def _send(self, code, body, content_type="application/json"):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
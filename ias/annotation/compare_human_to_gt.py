@@ -14,7 +14,7 @@ from sklearn.metrics import accuracy_score
 from sklearn.preprocessing import MultiLabelBinarizer
 
 # Import in the Clarifai gRPC based objects needed
-from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.registry import get_shared_channel
 from clarifai_grpc.grpc.api import service_pb2, service_pb2_grpc
 from google.protobuf.json_format import MessageToDict
 
@@ -23,7 +23,7 @@ from google.protobuf.json_format import MessageToDict
 logger = utils.setup_logging()
 
 # Construct the communications channel and the object stub to call requests on.
-channel = ClarifaiChannel.get_json_channel()
+channel = get_shared_channel("json")
 stub = service_pb2_grpc.V2Stub(channel)
 
 MAX_ANNOT_PER_VIDEO = 25
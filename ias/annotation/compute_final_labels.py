@@ -6,7 +6,7 @@ from save_labels import add_final_labels_to_metadata
 from taxonomy import get_taxonomy_object, SPECIAL_USE_LABELS
 
 # Import in the Clarifai gRPC based objects needed
-from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.registry import get_shared_channel
 from clarifai_grpc.grpc.api import resources_pb2, service_pb2, service_pb2_grpc
 from google.protobuf.json_format import MessageToDict
 from google.protobuf.struct_pb2 import Struct
@@ -15,7 +15,7 @@ from google.protobuf.struct_pb2 import Struct
 logger = utils.setup_logging()
 
 # Construct the communications channel and the object stub to call requests on.
-channel = ClarifaiChannel.get_json_channel()
+channel = get_shared_channel("json")
 stub = service_pb2_grpc.V2Stub(channel)
 
 
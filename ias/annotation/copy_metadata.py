@@ -6,7 +6,7 @@ import logging
 import random
 
 # Import in the Clarifai gRPC based objects needed
-from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.registry import get_shared_channel
 from clarifai_grpc.grpc.api import resources_pb2, service_pb2, service_pb2_grpc
 from clarifai_grpc.grpc.api.status import status_code_pb2
 from google.protobuf.struct_pb2 import Struct
@@ -17,7 +17,7 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 # Construct the communications channel and the object stub to call requests on.
-channel = ClarifaiChannel.get_json_channel()
+channel = get_shared_channel("json")
 stub = service_pb2_grpc.V2Stub(channel)
 
 
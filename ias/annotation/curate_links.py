@@ -8,7 +8,7 @@ from tqdm import tqdm
 import ground_truth as gt
 
 # Import in the Clarifai gRPC based objects needed
-from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.registry import get_shared_channel
 from clarifai_grpc.grpc.api import resources_pb2, service_pb2, service_pb2_grpc
 from clarifai_grpc.grpc.api.status import status_code_pb2
 from google.protobuf.json_format import MessageToDict
@@ -17,7 +17,7 @@ from google.protobuf.json_format import MessageToDict
 logger = utils.setup_logging()
 
 # Construct the communications channel and the object stub to call requests on.
-channel = ClarifaiChannel.get_json_channel()
+channel = get_shared_channel("json")
 stub = service_pb2_grpc.V2Stub(channel)
 
 GT_LABELS = gt.GT_LABELS + ['safe']
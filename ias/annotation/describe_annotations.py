@@ -6,7 +6,7 @@ from save_labels import save_labels_csv
 from taxonomy import get_taxonomy_object, SPECIAL_USE_LABELS
 
 # Import in the Clarifai gRPC based objects needed
-from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.registry import get_shared_channel
 from clarifai_grpc.grpc.api import service_pb2, service_pb2_grpc
 from google.protobuf.json_format import MessageToDict
 
@@ -14,7 +14,7 @@ from google.protobuf.json_format import MessageToDict
 logger = utils.setup_logging()
 
 # Construct the communications channel and the object stub to call requests on.
-channel = ClarifaiChannel.get_json_channel()
+channel = get_shared_channel("json")
 stub = service_pb2_grpc.V2Stub(channel)
 
 
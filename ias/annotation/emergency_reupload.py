@@ -8,15 +8,16 @@ import ground_truth as gt
 from taxonomy import GT_SAFE_LABEL
 
 # Import in the Clarifai gRPC based objects needed
-from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.registry import get_shared_channel
 from clarifai_grpc.grpc.api import resources_pb2, service_pb2, service_pb2_grpc
 from clarifai_grpc.grpc.api.status import status_code_pb2
+from clarifai_grpc.helpers.streaming import StreamInputsIterator
 from google.protobuf.struct_pb2 import Struct
 from google.protobuf.json_format import MessageToDict
 
 
 # Construct the communications channel and the object stub to call requests on.
-channel = ClarifaiChannel.get_json_channel()
+channel = get_shared_channel("json")
 stub = service_pb2_grpc.V2Stub(channel)
 
 
@@ -33,25 +34,11 @@ def get_input_ids(args):
   print("Retrieving inputs...")
   input_ids = {}
 
-  last_id = ''
-  while True:
-    # Make request
-    req = service_pb2.StreamInputsRequest(per_page=1000, last_id=last_id)
-    response = stub.StreamInputs(req, metadata=args.input_metadata)
-    process_response(response)
-
-    # Process inputs
-    if len(response.inputs) == 0:
-      break
-    else:
-      for input in response.inputs:
-        hosted = input.data.video.hosted
-        input_ids[input.id] = {'url': f"{hosted.prefix}/orig/{hosted.suffix}",
-                               'video_id': MessageToDict(input.data.metadata)['id'],
-                               'metadata': input.data.metadata}
-
-    # Set id for next stream
-    last_id = response.inputs[-1].id
+  for input in StreamInputsIterator(stub.StreamInputs, metadata=args.input_metadata):
+    hosted = input.data.video.hosted
+    input_ids[input.id] = {'url': f"{hosted.prefix}/orig/{hosted.suffix}",
+                           'video_id': MessageToDict(input.data.metadata)['id'],
+                           'metadata': input.data.metadata}
 
 #   # # ------ DEBUG CODE
 #   input_ids_ = {}
@@ -3,14 +3,15 @@ from tqdm import tqdm
 import numpy as np
 
 # Import in the Clarifai gRPC based objects needed
-from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.registry import get_shared_channel
 from clarifai_grpc.grpc.api import resources_pb2, service_pb2, service_pb2_grpc
 from clarifai_grpc.grpc.api.status import status_code_pb2
+from clarifai_grpc.helpers.streaming import StreamInputsIterator
 from google.protobuf.struct_pb2 import Struct
 
 
 # Construct the communications channel and the object stub to call requests on.
-channel = ClarifaiChannel.get_json_channel()
+channel = get_shared_channel("json")
 stub = service_pb2_grpc.V2Stub(channel)
 
 
@@ -24,24 +25,8 @@ def process_response(response):
 
 def get_input_ids(args):
   print("Retrieving inputs...")
-  input_ids = []
-
-  last_id = ''
-  while True:
-    # Make request
-    req = service_pb2.StreamInputsRequest(per_page=1000, last_id=last_id)
-    response = stub.StreamInputs(req, metadata=args.metadata)
-    process_response(response)
-
-    # Process inputs
-    if len(response.inputs) == 0:
-      break
-    else:
-      for input in response.inputs:
-        input_ids.append(input.id)
-
-    # Set id for next stream
-    last_id = response.inputs[-1].id
+  inputs = StreamInputsIterator(stub.StreamInputs, metadata=args.metadata)
+  input_ids = [input.id for input in inputs]
 
   print(f"Total of {len(input_ids)} inputs retrieved")
   return input_ids
@@ -29,6 +29,10 @@ setuptools.setup(
         "googleapis-common-protos>=1.53.0",
         "requests>=2.25.1",
     ],
+    extras_require={
+        "numpy": ["numpy>=1.17"],
+        "images": ["numpy>=1.17", "Pillow"],
+    },
     package_data={p: ["*.pyi"] for p in packages},
     include_package_data=True
 )
@@ -7,6 +7,7 @@ from grpc._channel import _Rendezvous
 from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
 from clarifai_grpc.grpc.api import service_pb2, service_pb2_grpc
 from clarifai_grpc.grpc.api.status import status_code_pb2
+from clarifai_grpc.testing.fake_server import FakeV2Server
 
 DOG_IMAGE_URL = "https://samples.clarifai.com/dog2.jpeg"
 TRUCK_IMAGE_URL = "https://s3.amazonaws.com/samples.clarifai.com/red-truck.png"
@@ -56,6 +57,24 @@ def both_channels(func):
     return func_wrapper
 
 
+def both_fake_channels(func):
+    """
+    A decorator that runs the test against a local FakeV2Server, first using the gRPC channel and
+    then using the JSON channel. Each run gets a fresh server.
+    :param func: The test function, taking the stub and the server.
+    :return: A function wrapper.
+    """
+
+    def func_wrapper():
+        with FakeV2Server() as server:
+            func(server.grpc_stub(), server)
+
+        with FakeV2Server() as server:
+            func(server.json_stub(), server)
+
+    return func_wrapper
+
+
 def wait_for_inputs_upload(stub, metadata, input_ids):
     for input_id in input_ids:
         while True:
@@ -0,0 +1,102 @@
+import pytest
+
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+
+np = pytest.importorskip("numpy")
+
+from clarifai_grpc.arrays import embeddings  # noqa: E402
+from clarifai_grpc.arrays.embeddings import embeddings_to_arrays  # noqa: E402
+
+
+def _output(input_id, vector, num_dimensions=None):
+    return resources_pb2.Output(
+        input=resources_pb2.Input(id=input_id),
+        data=resources_pb2.Data(
+            embeddings=[
+                resources_pb2.Embedding(
+                    vector=vector,
+                    num_dimensions=len(vector) if num_dimensions is None else num_dimensions,
+                )
+            ]
+        ),
+    )
+
+
+def _response(first_id, count, dimensions=4):
+    return service_pb2.MultiOutputResponse(
+        outputs=[
+            _output("input-%d" % i, [i + d / 10.0 for d in range(dimensions)])
+            for i in range(first_id, first_id + count)
+        ]
+    )
+
+
+def _expected(count, dimensions=4):
+    return np.array(
+        [[i + d / 10.0 for d in range(dimensions)] for i in range(count)], dtype=np.float32
+    )
+
+
+def test_single_response():
+    arrays = embeddings_to_arrays(_response(0, 3))
+
+    assert list(arrays.ids) == ["input-0", "input-1", "input-2"]
+    assert arrays.vectors.dtype == np.float32
+    assert arrays.vectors.flags["C_CONTIGUOUS"]
+    assert arrays.num_dimensions == 4
+    np.testing.assert_array_equal(arrays.vectors, _expected(3))
+
+
+def test_stream_of_responses_grows_the_matrix(monkeypatch):
+    monkeypatch.setattr(embeddings, "INITIAL_ROWS", 2)
+    responses = (_response(i * 3, 3) for i in range(3))
+
+    arrays = embeddings_to_arrays(responses)
+
+    assert len(arrays) == 9
+    assert arrays.vectors.shape == (9, 4)
+    np.testing.assert_array_equal(arrays.vectors, _expected(9))
+
+
+def test_write_to_memory_mapped_file(tmp_path):
+    path = str(tmp_path / "embeddings.npy")
+    responses = (_response(i * 5, 5) for i in range(4))
+
+    arrays = embeddings_to_arrays(responses, path=path)
+
+    assert isinstance(arrays.vectors, np.memmap)
+    np.testing.assert_array_equal(arrays.vectors, _expected(20))
+    np.testing.assert_array_equal(np.load(path), _expected(20))
+
+
+def test_file_must_be_npy(tmp_path):
+    with pytest.raises(UsageError):
+        embeddings_to_arrays(_response(0, 1), path=str(tmp_path / "embeddings.bin"))
+
+
+def test_missing_embeddings():
+    outputs = [_output("a", [1.0, 2.0]), resources_pb2.Output(input=resources_pb2.Input(id="b"))]
+
+    with pytest.raises(ClarifaiException):
+        embeddings_to_arrays(outputs)
+    arrays = embeddings_to_arrays(outputs, skip_missing=True)
+    assert list(arrays.ids) == ["a"]
+    assert arrays.vectors.shape == (1, 2)
+
+
+def test_mismatched_dimensions():
+    with pytest.raises(ClarifaiException):
+        embeddings_to_arrays([_output("a", [1.0, 2.0]), _output("b", [1.0, 2.0, 3.0])])
+    with pytest.raises(ClarifaiException):
+        embeddings_to_arrays([_output("a", [1.0, 2.0], num_dimensions=3)])
+
+
+def test_packed_vector_bytes():
+    embedding = resources_pb2.Embedding(vector=[0.5, -1.25, 3.0], num_dimensions=3)
+
+    vector = np.frombuffer(embeddings._packed_vector_bytes(embedding), dtype="<f4")
+
+    np.testing.assert_array_equal(vector, [0.5, -1.25, 3.0])
+    assert embeddings._packed_vector_bytes(resources_pb2.Embedding(num_dimensions=3)) == b""
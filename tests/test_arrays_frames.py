@@ -0,0 +1,92 @@
+import pytest
+
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+
+np = pytest.importorskip("numpy")
+
+from clarifai_grpc.arrays.frames import frames_to_arrays, iter_frames_arrays  # noqa: E402
+
+
+def _frame(index, time, concepts):
+    return resources_pb2.Frame(
+        frame_info=resources_pb2.FrameInfo(index=index, time=time),
+        data=resources_pb2.Data(
+            concepts=[resources_pb2.Concept(id=c, value=v) for c, v in concepts]
+        ),
+    )
+
+
+def _output(input_id, frames):
+    return resources_pb2.Output(
+        input=resources_pb2.Input(id=input_id), data=resources_pb2.Data(frames=frames)
+    )
+
+
+def _response():
+    return service_pb2.MultiOutputResponse(
+        outputs=[
+            _output(
+                "video-0",
+                [
+                    _frame(0, 500, [("car", 0.75), ("road", 0.5)]),
+                    _frame(1, 1500, [("road", 0.25)]),
+                ],
+            ),
+            _output("video-1", [_frame(0, 1000, [("dog", 1.0), ("car", 0.5)])]),
+        ]
+    )
+
+
+EXPECTED_SCORES = [[0.75, 0.5, 0.0], [0.0, 0.25, 0.0], [0.5, 0.0, 1.0]]
+
+
+def test_dense_timeline():
+    arrays = frames_to_arrays(_response())
+
+    assert not arrays.is_sparse
+    assert len(arrays) == 3
+    assert list(arrays.input_ids) == ["video-0", "video-1"]
+    assert list(arrays.frame_offsets) == [0, 2, 3]
+    assert arrays.times.dtype == np.int64
+    assert list(arrays.times) == [500, 1500, 1000]
+    assert list(arrays.frame_indexes) == [0, 1, 0]
+    assert list(arrays.concepts) == ["car", "road", "dog"]
+    assert arrays.scores.dtype == np.float32
+    np.testing.assert_array_equal(arrays.scores, EXPECTED_SCORES)
+
+
+def test_sparse_timeline():
+    arrays = frames_to_arrays(_response(), sparse=True)
+
+    assert arrays.is_sparse
+    assert arrays.scores is None
+    assert list(arrays.frame_rows) == [0, 0, 1, 2, 2]
+    assert list(arrays.concept_index) == [0, 1, 1, 2, 0]
+    np.testing.assert_array_equal(arrays.values, [0.75, 0.5, 0.25, 1.0, 0.5])
+    np.testing.assert_array_equal(arrays.to_dense(), EXPECTED_SCORES)
+
+
+def test_fixed_concepts():
+    arrays = frames_to_arrays(_response(), concepts=["dog", "car"])
+
+    assert list(arrays.concepts) == ["dog", "car"]
+    np.testing.assert_array_equal(arrays.scores, [[0.0, 0.75], [0.0, 0.0], [1.0, 0.5]])
+
+
+def test_iter_frames_arrays():
+    responses = (_response() for _ in range(2))
+
+    videos = list(iter_frames_arrays(responses, concepts=["car", "road"]))
+
+    assert [list(video.input_ids) for video in videos] == [["video-0"], ["video-1"]] * 2
+    assert [len(video) for video in videos] == [2, 1, 2, 1]
+    np.testing.assert_array_equal(videos[0].scores, [[0.75, 0.5], [0.0, 0.25]])
+    assert list(videos[1].frame_offsets) == [0, 1]
+
+
+def test_no_frames():
+    arrays = frames_to_arrays([])
+
+    assert len(arrays) == 0
+    assert arrays.scores.shape == (0, 0)
+    assert list(arrays.frame_offsets) == [0]
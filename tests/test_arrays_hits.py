@@ -0,0 +1,70 @@
+import pytest
+
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+from clarifai_grpc.grpc.api.status import status_code_pb2, status_pb2
+from tests.common import both_fake_channels
+
+np = pytest.importorskip("numpy")
+
+from clarifai_grpc.arrays.hits import hits_to_arrays, search_to_arrays  # noqa: E402
+
+METADATA = (("authorization", "Key fake-key"),)
+
+
+def _search_response(start, end):
+    return service_pb2.MultiSearchResponse(
+        status=status_pb2.Status(code=status_code_pb2.SUCCESS),
+        hits=[
+            resources_pb2.Hit(score=1.0 - i / 100.0, input=resources_pb2.Input(id="input-%d" % i))
+            for i in range(start, end)
+        ],
+    )
+
+
+def test_hits_to_arrays():
+    response = _search_response(0, 3)
+    response.hits.append(
+        resources_pb2.Hit(
+            score=0.5, annotation=resources_pb2.Annotation(id="annotation", input_id="input-9")
+        )
+    )
+
+    hits = hits_to_arrays(response)
+
+    assert list(hits.input_ids) == ["input-0", "input-1", "input-2", "input-9"]
+    assert list(hits.annotation_ids) == ["", "", "", "annotation"]
+    assert hits.scores.dtype == np.float32
+    np.testing.assert_allclose(hits.scores, [1.0, 0.99, 0.98, 0.5])
+
+
+def test_search_to_arrays_reads_all_pages():
+    def post_inputs_searches(request, metadata=None):
+        start = (request.pagination.page - 1) * request.pagination.per_page
+        return _search_response(start, min(start + request.pagination.per_page, 45))
+
+    request = service_pb2.PostInputsSearchesRequest(pagination=service_pb2.Pagination(per_page=10))
+
+    hits = search_to_arrays(post_inputs_searches, request)
+
+    assert len(hits) == 45
+    assert list(hits.input_ids) == ["input-%d" % i for i in range(45)]
+    assert list(hits[hits.scores > 0.975].input_ids) == ["input-0", "input-1", "input-2"]
+
+
+@both_fake_channels
+def test_fetch_inputs_of_kept_hits(stub, server):
+    stub.PostInputs(
+        service_pb2.PostInputsRequest(
+            inputs=[resources_pb2.Input(id="input-%d" % i) for i in range(5)]
+        ),
+        metadata=METADATA,
+    )
+    hits = hits_to_arrays(_search_response(0, 5))[np.array([3, 1, 3])]
+
+    inputs = hits.fetch_inputs(stub, METADATA, per_page=1)
+
+    assert [input_.id for input_ in inputs] == ["input-3", "input-1", "input-3"]
+
+    with pytest.raises(ClarifaiException):
+        hits_to_arrays(_search_response(7, 8)).fetch_inputs(stub, METADATA)
@@ -0,0 +1,155 @@
+import pytest
+
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.grpc.api import resources_pb2
+
+np = pytest.importorskip("numpy")
+
+from clarifai_grpc.arrays import index as index_module  # noqa: E402
+from clarifai_grpc.arrays.index import (  # noqa: E402
+    ExactIndex,
+    PartitionedIndex,
+    build_index,
+    load_index,
+)
+
+
+def _clustered_vectors(count, dimensions=32, clusters=20, seed=0):
+    random = np.random.RandomState(seed)
+    centers = random.normal(size=(clusters, dimensions))
+    vectors = centers[random.randint(clusters, size=count)]
+    vectors += 0.3 * random.normal(size=(count, dimensions))
+    ids = np.array(["input-%d" % i for i in range(count)])
+    return ids, vectors.astype(np.float32)
+
+
+def _brute_force(vectors, queries, k):
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    return np.argsort(-(queries @ vectors.T), axis=1)[:, :k]
+
+
+def _recall(found_ids, expected_rows, ids):
+    expected_ids = ids[expected_rows]
+    return np.mean([len(set(f) & set(e)) / len(e) for f, e in zip(found_ids, expected_ids)])
+
+
+def test_exact_index_finds_the_nearest_neighbours():
+    ids, vectors = _clustered_vectors(500)
+    queries = vectors[:10] + 0.01
+
+    found_ids, scores = ExactIndex(ids, vectors).search(queries, k=5)
+
+    assert found_ids.shape == scores.shape == (10, 5)
+    assert scores.dtype == np.float32
+    assert (np.diff(scores, axis=1) <= 0).all()
+    np.testing.assert_array_equal(found_ids, ids[_brute_force(vectors, queries, 5)])
+    assert list(found_ids[:, 0]) == list(ids[:10])
+
+
+def test_exact_index_dot_metric_and_single_query():
+    ids = np.array(["small", "large"])
+    vectors = np.array([[1.0, 0.0], [2.0, 0.0]])
+
+    found_ids, scores = ExactIndex(ids, vectors, metric="dot").search([1.0, 0.0], k=5)
+
+    assert list(found_ids[0]) == ["large", "small"]
+    np.testing.assert_allclose(scores[0], [2.0, 1.0])
+
+
+def test_unknown_metric():
+    with pytest.raises(UsageError):
+        ExactIndex(["a"], [[1.0]], metric="l3")
+
+
+def test_partitioned_index_recall():
+    ids, vectors = _clustered_vectors(5000)
+    queries = vectors[::100] + 0.05
+    expected = _brute_force(vectors, queries, 10)
+
+    index = PartitionedIndex.build(ids, vectors, partitions=40)
+    found_ids, scores = index.search(queries, k=10)
+
+    assert found_ids.shape == (50, 10)
+    assert (np.diff(scores, axis=1) <= 1e-6).all()
+    assert _recall(found_ids, expected, ids) >= 0.9
+
+    approximate = PartitionedIndex.build(ids, vectors, partitions=40, keep_vectors=False)
+    approximate_ids, _ = approximate.search(queries, k=10)
+    assert approximate.vectors is None
+    assert _recall(approximate_ids, expected, ids) >= 0.7
+
+
+def test_partitioned_index_fills_results_from_other_partitions():
+    ids, vectors = _clustered_vectors(60)
+    index = PartitionedIndex.build(ids, vectors, partitions=30)
+    index.probes = 1
+
+    found_ids, _ = index.search(vectors[:3], k=20)
+
+    assert found_ids.shape == (3, 20)
+    assert all(len(set(row)) == 20 for row in found_ids)
+
+
+def test_partitioned_index_with_a_sample_smaller_than_the_partitions():
+    ids, vectors = _clustered_vectors(200)
+
+    index = PartitionedIndex.build(ids, vectors, partitions=30, sample_size=10)
+
+    assert len(index.centroids) == 30
+    assert index.search(vectors[:2], k=5)[0].shape == (2, 5)
+
+
+def test_partitioned_index_searches_queries_in_blocks(monkeypatch):
+    ids, vectors = _clustered_vectors(500)
+    queries = vectors[:20] + 0.05
+    index = PartitionedIndex.build(ids, vectors, partitions=10)
+    expected_ids, expected_scores = index.search(queries, k=5)
+
+    # Blocks of 3 queries, of 5 * rerank candidates of 32 dimensions.
+    monkeypatch.setattr(index_module, "MAX_SCORES_PER_BLOCK", 3 * 5 * index.rerank * 32)
+    found_ids, scores = index.search(queries, k=5)
+
+    np.testing.assert_array_equal(found_ids, expected_ids)
+    np.testing.assert_allclose(scores, expected_scores)
+
+
+@pytest.mark.parametrize("kind", ["exact", "partitioned"])
+def test_save_and_load(tmp_path, kind):
+    ids, vectors = _clustered_vectors(300)
+    if kind == "exact":
+        index = ExactIndex(ids, vectors)
+    else:
+        index = PartitionedIndex.build(ids, vectors, partitions=10)
+        index.probes = 3
+    directory = str(tmp_path / "index")
+
+    index.save(directory)
+    loaded = load_index(directory)
+
+    assert type(loaded) is type(index)
+    assert isinstance(loaded.ids, np.memmap)
+    expected_ids, expected_scores = index.search(vectors[:5], k=7)
+    loaded_ids, loaded_scores = loaded.search(vectors[:5], k=7)
+    np.testing.assert_array_equal(loaded_ids, expected_ids)
+    np.testing.assert_allclose(loaded_scores, expected_scores)
+
+
+def test_search_hits():
+    ids, vectors = _clustered_vectors(50)
+
+    hits = ExactIndex(ids, vectors).search_hits(vectors[:2], k=3)
+
+    assert len(hits) == 2
+    assert all(len(query_hits) == 3 for query_hits in hits)
+    assert isinstance(hits[0][0], resources_pb2.Hit)
+    assert hits[0][0].input.id == "input-0"
+    assert hits[0][0].score == pytest.approx(1.0, abs=1e-5)
+
+
+def test_build_index_picks_the_kind(monkeypatch):
+    ids, vectors = _clustered_vectors(100)
+    assert isinstance(build_index(ids, vectors), ExactIndex)
+
+    monkeypatch.setattr(index_module, "EXACT_SEARCH_MAX_VECTORS", 10)
+    assert isinstance(build_index(ids, vectors, partitions=5), PartitionedIndex)
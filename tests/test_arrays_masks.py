@@ -0,0 +1,123 @@
+import io
+import threading
+
+import pytest
+
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+
+np = pytest.importorskip("numpy")
+
+from clarifai_grpc.arrays.masks import lazy_masks  # noqa: E402
+
+
+class _Decoder:
+    """Decodes a first byte of height followed by the pixels, counting the calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, data):
+        with self._lock:
+            self.calls += 1
+            self.threads.add(threading.current_thread().name)
+        return np.frombuffer(data[1:], dtype=np.uint8).reshape(data[0], -1)
+
+
+def _encode(value, size=4):
+    return bytes([size]) + bytes([value]) * (size * size)
+
+
+def _region(region_id, data):
+    return resources_pb2.Region(
+        id=region_id,
+        region_info=resources_pb2.RegionInfo(
+            mask=resources_pb2.Mask(image=resources_pb2.Image(base64=data))
+        ),
+    )
+
+
+def _response(count):
+    return service_pb2.MultiOutputResponse(
+        outputs=[
+            resources_pb2.Output(
+                input=resources_pb2.Input(id="input-%d" % i),
+                data=resources_pb2.Data(
+                    regions=[_region("r%d" % i, _encode(i)), _region("no-mask", b"")]
+                ),
+            )
+            for i in range(count)
+        ]
+    )
+
+
+def test_decodes_on_access_and_caches():
+    decoder = _Decoder()
+    masks = lazy_masks(_response(3), decoder=decoder)
+
+    assert len(masks) == 3
+    assert list(masks.region_ids) == ["r0", "r1", "r2"]
+    assert list(masks.input_ids[masks.input_index]) == ["input-0", "input-1", "input-2"]
+    assert decoder.calls == 0
+
+    mask = masks[1]
+    assert mask.shape == (4, 4)
+    assert (mask == 1).all()
+    assert not mask.flags.writeable
+    assert masks[1] is mask
+    assert decoder.calls == 1
+    assert masks.cached_bytes == 16
+
+
+def test_cache_is_bounded_by_bytes():
+    decoder = _Decoder()
+    masks = lazy_masks(_response(4), cache_bytes=40, decoder=decoder)
+
+    for index in [0, 1, 0, 2]:
+        masks[index]
+    assert decoder.calls == 3
+    assert masks.cached_bytes == 32
+
+    masks[0]
+    assert decoder.calls == 3
+    masks[1]
+    assert decoder.calls == 4
+
+
+def test_uncached():
+    decoder = _Decoder()
+    masks = lazy_masks(_response(2), cache_bytes=0, decoder=decoder)
+
+    masks[0]
+    masks[0]
+    assert decoder.calls == 2
+    assert masks.cached_bytes == 0
+
+
+def test_iter_decoded_in_a_thread_pool():
+    decoder = _Decoder()
+    masks = lazy_masks(_response(20), decoder=decoder)
+
+    decoded = list(masks.iter_decoded(workers=4))
+
+    assert [int(mask[0, 0]) for mask in decoded] == list(range(20))
+    assert all(name != threading.current_thread().name for name in decoder.threads)
+    assert masks.cached_bytes == 0
+
+    assert [int(mask[0, 0]) for mask in masks.decode_all([5, 2], workers=2)] == [5, 2]
+
+
+def test_decode_png():
+    image_module = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    image_module.fromarray(np.eye(3, dtype=np.uint8) * 255).save(buffer, format="PNG")
+    response = service_pb2.MultiOutputResponse(
+        outputs=[
+            resources_pb2.Output(
+                data=resources_pb2.Data(regions=[_region("r", buffer.getvalue())])
+            )
+        ]
+    )
+
+    np.testing.assert_array_equal(lazy_masks(response)[0], np.eye(3) * 255)
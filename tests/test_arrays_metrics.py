@@ -0,0 +1,152 @@
+import pytest
+
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+
+np = pytest.importorskip("numpy")
+
+from clarifai_grpc.arrays.metrics import eval_metrics_to_arrays  # noqa: E402
+
+
+def _binary_metrics(concept_id, roc_auc, points, area_name=""):
+    curve = [i / float(points) for i in range(points)]
+    return resources_pb2.BinaryMetrics(
+        concept=resources_pb2.Concept(id=concept_id),
+        area_name=area_name,
+        num_pos=points,
+        num_neg=2 * points,
+        num_tot=3 * points,
+        roc_auc=roc_auc,
+        f1=roc_auc / 2,
+        roc_curve=resources_pb2.ROC(fpr=curve, tpr=curve[::-1], thresholds=curve),
+        precision_recall_curve=resources_pb2.PrecisionRecallCurve(
+            precision=curve, recall=curve, thresholds=curve[::-1]
+        ),
+    )
+
+
+def _confusion_matrix(concept_ids, values):
+    return resources_pb2.ConfusionMatrix(
+        concept_ids=concept_ids,
+        matrix=[
+            resources_pb2.ConfusionMatrixEntry(actual=actual, predicted=predicted, value=value)
+            for (actual, predicted), value in values.items()
+        ],
+    )
+
+
+def _eval_metrics():
+    return resources_pb2.EvalMetrics(
+        binary_metrics=[
+            _binary_metrics("cat", 0.75, 3),
+            _binary_metrics("dog", 0.5, 2),
+            _binary_metrics("dog", 0.25, 4, area_name="small"),
+        ],
+        confusion_matrix=_confusion_matrix(
+            ["cat", "dog"], {("cat", "cat"): 0.75, ("cat", "dog"): 0.25, ("dog", "dog"): 1.0}
+        ),
+        cooccurrence_matrix=resources_pb2.CooccurrenceMatrix(
+            concept_ids=["cat", "dog"],
+            matrix=[
+                resources_pb2.CooccurrenceMatrixEntry(row="cat", col="cat", count=10),
+                resources_pb2.CooccurrenceMatrixEntry(row="cat", col="dog", count=3),
+            ],
+        ),
+    )
+
+
+def test_binary_metrics():
+    response = service_pb2.SingleModelVersionResponse(
+        model_version=resources_pb2.ModelVersion(metrics=_eval_metrics())
+    )
+
+    binary = eval_metrics_to_arrays(response).binary
+
+    assert len(binary) == 3
+    assert list(binary.concept_ids) == ["cat", "dog", "dog"]
+    assert list(binary.area_names) == ["", "", "small"]
+    np.testing.assert_array_equal(binary.roc_auc, [0.75, 0.5, 0.25])
+    assert binary.roc_auc.dtype == np.float32
+    assert list(binary.num_pos) == [3, 2, 4]
+    assert list(binary.num_tot) == [9, 6, 12]
+    assert list(binary.roc_offsets) == [0, 3, 5, 9]
+
+    small_dog = binary.index("dog", area_name="small")
+    assert small_dog == 2
+    fpr, tpr, thresholds = binary.roc_curve(small_dog)
+    np.testing.assert_array_equal(fpr, [0.0, 0.25, 0.5, 0.75])
+    np.testing.assert_array_equal(tpr, [0.75, 0.5, 0.25, 0.0])
+    precision, recall, thresholds = binary.precision_recall_curve(binary.index("dog"))
+    np.testing.assert_array_equal(precision, [0.0, 0.5])
+    np.testing.assert_array_equal(thresholds, [0.5, 0.0])
+    with pytest.raises(KeyError):
+        binary.index("bird")
+
+
+def test_curves_with_fewer_thresholds():
+    metrics = _binary_metrics("cat", 0.5, 3)
+    # As in scikit-learn, a precision-recall curve may have one threshold fewer than points.
+    del metrics.precision_recall_curve.thresholds[-1]
+    binary = eval_metrics_to_arrays(
+        resources_pb2.EvalMetrics(binary_metrics=[metrics, _binary_metrics("dog", 0.5, 2)])
+    ).binary
+
+    precision, recall, thresholds = binary.precision_recall_curve(1)
+    np.testing.assert_array_equal(precision, [0.0, 0.5])
+    np.testing.assert_array_equal(thresholds, [0.5, 0.0])
+    assert len(binary.precision_recall_curve(0)[2]) == 2
+
+    del metrics.roc_curve.tpr[-1]
+    with pytest.raises(ClarifaiException):
+        eval_metrics_to_arrays(resources_pb2.EvalMetrics(binary_metrics=[metrics]))
+
+
+def test_dense_matrices():
+    arrays = eval_metrics_to_arrays(_eval_metrics())
+
+    assert list(arrays.confusion.concept_ids) == ["cat", "dog"]
+    assert not arrays.confusion.is_sparse
+    np.testing.assert_array_equal(arrays.confusion.matrix, [[0.75, 0.25], [0.0, 1.0]])
+    assert arrays.cooccurrence.matrix.dtype == np.int64
+    np.testing.assert_array_equal(arrays.cooccurrence.matrix, [[10, 3], [0, 0]])
+    assert arrays.confusion.index("dog") == 1
+
+
+def test_sparse_matrices():
+    confusion = eval_metrics_to_arrays(_eval_metrics(), sparse=True).confusion
+
+    assert confusion.is_sparse
+    assert list(confusion.rows) == [0, 0, 1]
+    assert list(confusion.columns) == [0, 1, 1]
+    np.testing.assert_array_equal(confusion.values, [0.75, 0.25, 1.0])
+    np.testing.assert_array_equal(confusion.to_dense(), [[0.75, 0.25], [0.0, 1.0]])
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_reindex_to_compare_model_versions(sparse):
+    old = eval_metrics_to_arrays(_eval_metrics(), sparse=sparse).confusion
+    new = eval_metrics_to_arrays(
+        resources_pb2.EvalMetrics(
+            confusion_matrix=_confusion_matrix(
+                ["bird", "dog", "cat"], {("dog", "dog"): 0.5, ("cat", "cat"): 1.0}
+            )
+        ),
+        sparse=sparse,
+    ).confusion
+
+    aligned = old.reindex(new.concept_ids)
+
+    assert aligned.is_sparse == sparse
+    assert list(aligned.concept_ids) == ["bird", "dog", "cat"]
+    np.testing.assert_array_equal(
+        new.to_dense() - aligned.to_dense(),
+        [[0.0, 0.0, 0.0], [0.0, -0.5, 0.0], [0.0, -0.25, 0.25]],
+    )
+
+
+def test_empty_metrics():
+    arrays = eval_metrics_to_arrays(resources_pb2.EvalMetrics())
+
+    assert len(arrays.binary) == 0
+    assert list(arrays.binary.roc_offsets) == [0]
+    assert arrays.confusion.matrix.shape == (0, 0)
@@ -0,0 +1,102 @@
+import pytest
+
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+
+np = pytest.importorskip("numpy")
+
+from clarifai_grpc.arrays.regions import NO_CONCEPT, regions_to_arrays  # noqa: E402
+
+
+def _region(region_id, box, concepts):
+    top_row, left_col, bottom_row, right_col = box
+    return resources_pb2.Region(
+        id=region_id,
+        region_info=resources_pb2.RegionInfo(
+            bounding_box=resources_pb2.BoundingBox(
+                top_row=top_row, left_col=left_col, bottom_row=bottom_row, right_col=right_col
+            )
+        ),
+        data=resources_pb2.Data(
+            concepts=[resources_pb2.Concept(id=c, value=v) for c, v in concepts]
+        ),
+    )
+
+
+def _output(input_id, regions):
+    return resources_pb2.Output(
+        input=resources_pb2.Input(id=input_id), data=resources_pb2.Data(regions=regions)
+    )
+
+
+def _responses():
+    return [
+        service_pb2.MultiOutputResponse(
+            outputs=[
+                _output(
+                    "input-0",
+                    [
+                        _region("r0", (0.1, 0.2, 0.3, 0.4), [("person", 0.9), ("face", 0.25)]),
+                        _region("r1", (0.5, 0.5, 1.0, 1.0), [("dog", 0.75)]),
+                    ],
+                ),
+                _output("input-1", []),
+            ]
+        ),
+        service_pb2.MultiOutputResponse(
+            outputs=[_output("input-2", [_region("r2", (0.0, 0.0, 0.5, 0.5), [("person", 0.5)])])]
+        ),
+    ]
+
+
+def test_regions_to_arrays():
+    arrays = regions_to_arrays(_responses())
+
+    assert len(arrays) == 4
+    assert list(arrays.input_ids) == ["input-0", "input-1", "input-2"]
+    assert list(arrays.input_ids[arrays.input_index]) == [
+        "input-0",
+        "input-0",
+        "input-0",
+        "input-2",
+    ]
+    assert list(arrays.region_ids) == ["r0", "r0", "r1", "r2"]
+    assert arrays.boxes.dtype == np.float32
+    np.testing.assert_allclose(
+        arrays.boxes,
+        [[0.1, 0.2, 0.3, 0.4], [0.1, 0.2, 0.3, 0.4], [0.5, 0.5, 1.0, 1.0], [0.0, 0.0, 0.5, 0.5]],
+    )
+    assert list(arrays.concepts) == ["person", "face", "dog"]
+    assert list(arrays.concept_index) == [0, 1, 2, 0]
+    assert list(arrays.concept_ids) == ["person", "face", "dog", "person"]
+    np.testing.assert_allclose(arrays.values, [0.9, 0.25, 0.75, 0.5])
+
+
+def test_filter():
+    arrays = regions_to_arrays(_responses())
+
+    assert list(arrays.filter(min_value=0.5).region_ids) == ["r0", "r1", "r2"]
+    people = arrays.filter(concept_ids=["person"])
+    assert list(people.input_ids[people.input_index]) == ["input-0", "input-2"]
+    assert list(arrays.filter(min_value=0.6, concept_ids=["person", "dog"]).values) == [
+        pytest.approx(0.9),
+        pytest.approx(0.75),
+    ]
+    assert len(arrays.filter(concept_ids=["cat"])) == 0
+    assert list(arrays[arrays.boxes[:, 0] >= 0.5].region_ids) == ["r1"]
+
+
+def test_region_without_concepts():
+    arrays = regions_to_arrays(_output("input-0", [_region("r0", (0.1, 0.1, 0.2, 0.2), [])]))
+
+    assert list(arrays.concept_index) == [NO_CONCEPT]
+    assert list(arrays.concept_ids) == [""]
+    assert np.isnan(arrays.values[0])
+    assert len(arrays.filter(min_value=0.0)) == 0
+
+
+def test_no_regions():
+    arrays = regions_to_arrays([])
+
+    assert len(arrays) == 0
+    assert arrays.boxes.shape == (0, 4)
+    assert len(arrays.filter(min_value=0.5, concept_ids=["person"])) == 0
@@ -0,0 +1,95 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+from clarifai_grpc.grpc.api.status import status_code_pb2, status_pb2
+from clarifai_grpc.helpers.batching import PostModelOutputsBatcher
+
+
+class FakePostModelOutputs:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request, metadata=None):
+        with self._lock:
+            self.requests.append(request)
+        if self.fail:
+            return service_pb2.MultiOutputResponse(
+                status=status_pb2.Status(code=status_code_pb2.FAILURE, description="Failure")
+            )
+        return service_pb2.MultiOutputResponse(
+            status=status_pb2.Status(code=status_code_pb2.SUCCESS),
+            outputs=[
+                resources_pb2.Output(
+                    input=input_,
+                    data=resources_pb2.Data(
+                        concepts=[resources_pb2.Concept(id=request.model_id + "-" + input_.id)]
+                    ),
+                )
+                for input_ in request.inputs
+            ],
+        )
+
+
+def _request(input_id, model_id="model"):
+    return service_pb2.PostModelOutputsRequest(
+        model_id=model_id, inputs=[resources_pb2.Input(id=input_id)]
+    )
+
+
+def test_batcher_fans_outputs_back_to_callers():
+    stub_method = FakePostModelOutputs()
+
+    with PostModelOutputsBatcher(stub_method, max_batch_size=8, max_wait=0.05) as batcher:
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            outputs = list(
+                executor.map(lambda i: batcher.predict(_request("input-%d" % i)), range(16))
+            )
+
+    assert [o.input.id for o in outputs] == ["input-%d" % i for i in range(16)]
+    assert [o.data.concepts[0].id for o in outputs] == ["model-input-%d" % i for i in range(16)]
+    assert len(stub_method.requests) < 16
+    assert all(len(r.inputs) <= 8 for r in stub_method.requests)
+    assert batcher.metrics.submitted == 16
+    assert batcher.metrics.batched_inputs == 16
+    assert 0 < batcher.metrics.batch_fill <= 1
+
+
+def test_batcher_groups_by_model():
+    stub_method = FakePostModelOutputs()
+
+    with PostModelOutputsBatcher(stub_method, max_batch_size=2, max_wait=10) as batcher:
+        futures = [
+            batcher.submit(_request("a", model_id="model-1")),
+            batcher.submit(_request("b", model_id="model-2")),
+            batcher.submit(_request("c", model_id="model-1")),
+        ]
+        assert futures[0].result(timeout=5).data.concepts[0].id == "model-1-a"
+        assert futures[2].result(timeout=5).data.concepts[0].id == "model-1-c"
+        assert not futures[1].done()
+
+    assert futures[1].result().data.concepts[0].id == "model-2-b"
+    assert sorted(len(r.inputs) for r in stub_method.requests) == [1, 2]
+
+
+def test_batcher_propagates_failures():
+    batcher = PostModelOutputsBatcher(FakePostModelOutputs(fail=True), max_wait=0)
+    future = batcher.submit(_request("a"))
+    batcher.close()
+
+    with pytest.raises(ClarifaiException) as e:
+        future.result()
+    assert "Status %d Failure" % status_code_pb2.FAILURE in str(e.value)
+    assert batcher.metrics.failed_batches == 1
+
+
+def test_batcher_requires_single_input():
+    with PostModelOutputsBatcher(FakePostModelOutputs()) as batcher:
+        with pytest.raises(UsageError):
+            batcher.submit(service_pb2.PostModelOutputsRequest(model_id="model"))
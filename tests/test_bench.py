@@ -0,0 +1,39 @@
+import contextlib
+
+from clarifai_grpc.bench import micro
+
+
+def test_micro_benchmarks_run_and_compare():
+    results = micro.run(repeat=2, number_scale=0.01)
+
+    names = [r["name"] for r in results["results"]]
+    assert "protobuf_to_dict.post_model_outputs_request" in names
+    assert "dict_to_protobuf.multi_output_response" in names
+    assert "pick_proper_endpoint.post_model_outputs" in names
+    assert "http_client.execute_request" in names
+    assert "grpc_json_channel.construction" in names
+    assert "round_trip.json.post_model_outputs" in names
+    assert "round_trip.grpc.post_model_outputs" in names
+    assert all(r["median_us"] > 0 for r in results["results"])
+
+    assert len(micro.compare(results, results)) == len(names)
+
+
+def test_micro_benchmarks_filter():
+    results = micro.run(name_filter="pick_proper_endpoint", repeat=1, number_scale=0.01)
+
+    assert [r["name"] for r in results["results"]] == ["pick_proper_endpoint.post_model_outputs"]
+
+
+def test_micro_benchmarks_start_servers_only_for_round_trips(monkeypatch):
+    with contextlib.ExitStack() as stack:
+        names = [name for name, _, _ in micro._round_trip_benchmarks(stack)]
+    assert tuple(names) == micro.ROUND_TRIP_BENCHMARKS
+
+    def fail(stack):
+        raise AssertionError("Started the local servers")
+
+    monkeypatch.setattr(micro, "_round_trip_benchmarks", fail)
+    results = micro.run(name_filter="dict_to_protobuf", repeat=1, number_scale=0.01)
+
+    assert results["results"]
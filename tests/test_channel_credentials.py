@@ -0,0 +1,77 @@
+import logging
+
+import pytest
+
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+from clarifai_grpc.grpc.api.status import status_code_pb2
+from clarifai_grpc.testing.fake_server import FakeV2Server
+
+
+def _stub(server, use_json_channel, api_key):
+    if use_json_channel:
+        return server.json_stub(api_key=api_key)
+    return server.grpc_stub(api_key=api_key)
+
+
+@pytest.mark.parametrize("use_json_channel", [False, True])
+def test_bound_credentials_authorize_calls_without_metadata(use_json_channel):
+    with FakeV2Server(api_key="bound-key") as server:
+        stub = _stub(server, use_json_channel, "bound-key")
+        response = stub.ListInputs(service_pb2.ListInputsRequest())
+
+    assert response.status.code == status_code_pb2.SUCCESS
+
+
+@pytest.mark.parametrize("use_json_channel", [False, True])
+def test_call_metadata_overrides_bound_credentials(use_json_channel):
+    with FakeV2Server(api_key="other-key") as server:
+        stub = _stub(server, use_json_channel, "bound-key")
+        rejected = stub.ListInputs(service_pb2.ListInputsRequest())
+        accepted = stub.ListInputs(
+            service_pb2.ListInputsRequest(), metadata=(("authorization", "Key other-key"),)
+        )
+        # Metadata without an authorization entry still uses the bound credentials.
+        still_rejected = stub.ListInputs(
+            service_pb2.ListInputsRequest(), metadata=(("x-request-id", "1"),)
+        )
+
+    assert rejected.status.code == status_code_pb2.CONN_KEY_INVALID
+    assert accepted.status.code == status_code_pb2.SUCCESS
+    assert still_rejected.status.code == status_code_pb2.CONN_KEY_INVALID
+
+
+def test_json_channel_accepts_unhashable_metadata():
+    with FakeV2Server(api_key="key") as server:
+        stub = server.json_stub()
+        for metadata in ([("authorization", "Key key")], (["authorization", "Key key"],)):
+            for _ in range(2):  # Uncached, then cached.
+                response = stub.ListInputs(service_pb2.ListInputsRequest(), metadata=metadata)
+                assert response.status.code == status_code_pb2.SUCCESS
+
+
+def test_json_channel_without_credentials_raises():
+    with FakeV2Server() as server:
+        stub = server.json_stub()
+        with pytest.raises(UsageError):
+            stub.ListInputs(service_pb2.ListInputsRequest())
+
+
+def test_json_channel_debug_logging_handles_inputs_without_data(caplog):
+    request = service_pb2.PostInputsRequest(
+        inputs=[
+            resources_pb2.Input(id="no-data"),
+            resources_pb2.Input(
+                id="with-data",
+                data=resources_pb2.Data(image=resources_pb2.Image(base64=b"x" * 100)),
+            ),
+        ]
+    )
+    with FakeV2Server() as server:
+        stub = server.json_stub(api_key="key")
+        with caplog.at_level(logging.DEBUG, logger="clarifai"):
+            response = stub.PostInputs(request)
+
+    assert response.status.code == status_code_pb2.SUCCESS
+    assert "......" in caplog.text
+    assert "Key key" not in caplog.text
@@ -0,0 +1,115 @@
+import os
+import threading
+
+import pytest
+
+from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.channel.interceptors import CallMetricsInterceptor
+from clarifai_grpc.channel.registry import ChannelRegistry
+from clarifai_grpc.grpc.api import service_pb2, service_pb2_grpc
+from clarifai_grpc.grpc.api.status import status_code_pb2
+from clarifai_grpc.testing.fake_server import FakeV2Server
+
+
+def test_same_key_returns_same_channel():
+    registry = ChannelRegistry()
+    interceptor = CallMetricsInterceptor()
+
+    channel = registry.get("json", "http://localhost:1", interceptors=[interceptor])
+
+    assert registry.get("json", "http://localhost:1", interceptors=[interceptor]) is channel
+    assert registry.get("json", "http://localhost:1") is not channel
+    assert registry.get("json", "http://localhost:2", interceptors=[interceptor]) is not channel
+    assert len(registry) == 3
+    registry.close_all()
+    assert len(registry) == 0
+
+
+def test_default_endpoint_shares_key_with_explicit_one(monkeypatch):
+    monkeypatch.setenv("CLARIFAI_API_BASE", "http://localhost:3")
+    registry = ChannelRegistry()
+
+    assert registry.get("json") is registry.get("json", "http://localhost:3")
+    registry.close_all()
+
+
+def test_unknown_transport():
+    with pytest.raises(UsageError):
+        ChannelRegistry().get("carrier-pigeon")
+
+
+def test_close_makes_new_channel_on_next_get():
+    registry = ChannelRegistry()
+    channel = registry.get("insecure-grpc", "localhost", port=1)
+
+    assert registry.close("insecure-grpc", "localhost", port=1)
+    assert not registry.close("insecure-grpc", "localhost", port=1)
+    assert registry.get("insecure-grpc", "localhost", port=1) is not channel
+    registry.close_all()
+
+
+def test_concurrent_gets_make_one_channel():
+    registry = ChannelRegistry()
+    channels = []
+    barrier = threading.Barrier(16)
+
+    def get():
+        barrier.wait()
+        channels.append(registry.get("json", "http://localhost:4"))
+
+    threads = [threading.Thread(target=get) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(channels) == 16
+    assert all(channel is channels[0] for channel in channels)
+    registry.close_all()
+
+
+def test_channels_inherited_over_fork_are_dropped(monkeypatch):
+    registry = ChannelRegistry()
+    channel = registry.get("json", "http://localhost:5")
+
+    monkeypatch.setattr(os, "getpid", lambda: -1)
+
+    assert registry.get("json", "http://localhost:5") is not channel
+
+
+def test_shared_channels_work_with_stubs_after_other_factory_calls():
+    registry = ChannelRegistry()
+    with FakeV2Server() as server:
+        json_channel = registry.get("json", server.base_url, api_key="key")
+        grpc_channel = registry.get(
+            "insecure-grpc", server.grpc_host, port=server.grpc_port, api_key="key"
+        )
+        ClarifaiChannel.get_insecure_grpc_channel(server.grpc_host, server.grpc_port)
+
+        json_stub = service_pb2_grpc.V2Stub(registry.get("json", server.base_url, api_key="key"))
+        json_response = json_stub.ListInputs(service_pb2.ListInputsRequest())
+        grpc_stub = service_pb2_grpc.V2Stub(
+            registry.get("insecure-grpc", server.grpc_host, port=server.grpc_port, api_key="key")
+        )
+        grpc_response = grpc_stub.ListInputs(service_pb2.ListInputsRequest())
+        registry.close_all()
+
+    assert json_channel is not grpc_channel
+    assert json_response.status.code == status_code_pb2.SUCCESS
+    assert grpc_response.status.code == status_code_pb2.SUCCESS
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs os.fork")
+def test_forked_child_starts_with_no_channels():
+    registry = ChannelRegistry()
+    registry.get("json", "http://localhost:6")
+
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if len(registry) == 0 else 1)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.WEXITSTATUS(status) == 0
+    assert len(registry) == 1
+    registry.close_all()
@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from clarifai_grpc.channel import pool
+from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.grpc.api import service_pb2, service_pb2_grpc
+from clarifai_grpc.grpc.api.status import status_code_pb2
+from clarifai_grpc.testing.fake_server import FakeV2Server, FaultInjection
+
+
+def _call_concurrently(stub, concurrency, calls):
+    def list_inputs(_):
+        return stub.ListInputs(service_pb2.ListInputsRequest()).status.code
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        codes = list(executor.map(list_inputs, range(calls)))
+    assert set(codes) == {status_code_pb2.SUCCESS}
+
+
+def test_pool_options_are_applied():
+    channel = ClarifaiChannel.get_json_channel(
+        "http://127.0.0.1:1", pool_maxsize=3, pool_connections=2, pool_block=True, max_retries=5
+    )
+    adapter = channel.session.get_adapter("http://127.0.0.1:1")
+
+    assert isinstance(adapter, pool.MeteredHTTPAdapter)
+    assert adapter._pool_maxsize == 3
+    assert adapter._pool_connections == 2
+    assert adapter._pool_block
+    assert adapter.max_retries.total == 5
+
+
+def test_pool_metrics_measure_waits_for_connections():
+    with FakeV2Server(faults=FaultInjection(latency=0.05)) as server:
+        channel = ClarifaiChannel.get_json_channel(
+            server.base_url, api_key="key", pool_maxsize=1, pool_block=True
+        )
+        _call_concurrently(service_pb2_grpc.V2Stub(channel), 4, 8)
+        channel.close()
+
+    metrics = channel.pool_metrics.snapshot()
+    assert metrics["acquisitions"] == 8
+    assert metrics["connections_opened"] == 1
+    assert metrics["waits"] > 0
+    assert metrics["max_wait"] >= 0.03
+    assert metrics["mean_wait"] > 0
+
+
+def test_non_blocking_pool_does_not_wait():
+    with FakeV2Server(faults=FaultInjection(latency=0.05)) as server:
+        channel = ClarifaiChannel.get_json_channel(server.base_url, api_key="key", pool_maxsize=1)
+        _call_concurrently(service_pb2_grpc.V2Stub(channel), 4, 8)
+        channel.close()
+
+    metrics = channel.pool_metrics.snapshot()
+    assert metrics["acquisitions"] == 8
+    # Non-blocking pools open connections rather than wait, however long getting one takes.
+    assert metrics["waits"] == 0
+    assert metrics["connections_opened"] > 1
+
+
+def test_adaptive_pool_grows_under_contention_and_shrinks_when_idle():
+    with FakeV2Server(faults=FaultInjection(latency=0.01)) as server:
+        channel = ClarifaiChannel.get_json_channel(
+            server.base_url, api_key="key", pool_maxsize=1, adaptive_pool=True, max_pool_size=8
+        )
+        stub = service_pb2_grpc.V2Stub(channel)
+
+        _call_concurrently(stub, 8, 8 * pool.ADAPT_WINDOW)
+        grown = max(channel.pool_metrics.pool_sizes.values())
+        _call_concurrently(stub, 1, 2 * pool.ADAPT_WINDOW)
+        shrunk = max(channel.pool_metrics.pool_sizes.values())
+        channel.close()
+
+    assert 1 < grown <= 8
+    assert shrunk < grown
+    assert channel.pool_metrics.resizes >= 2
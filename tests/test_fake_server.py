@@ -0,0 +1,184 @@
+import grpc
+import pytest
+
+from clarifai_grpc.channel.errors import ApiError
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+from clarifai_grpc.grpc.api.status import status_code_pb2
+from clarifai_grpc.testing.fake_server import FakeV2Server, FaultInjection
+from tests.common import both_fake_channels, raise_on_failure
+
+METADATA = (("authorization", "Key fake-key"),)
+
+
+def _input(input_id, **metadata):
+    input_ = resources_pb2.Input(
+        id=input_id,
+        data=resources_pb2.Data(
+            image=resources_pb2.Image(url="https://example.com/%s.jpg" % input_id)
+        ),
+    )
+    input_.data.metadata.update(metadata)
+    return input_
+
+
+@both_fake_channels
+def test_inputs_crud(stub, server):
+    response = stub.PostInputs(
+        service_pb2.PostInputsRequest(inputs=[_input("a", group="1"), _input("b")]),
+        metadata=METADATA,
+    )
+    raise_on_failure(response)
+    assert [i.id for i in response.inputs] == ["a", "b"]
+
+    response = stub.GetInput(service_pb2.GetInputRequest(input_id="a"), metadata=METADATA)
+    raise_on_failure(response)
+    assert response.input.data.metadata["group"] == "1"
+
+    response = stub.PatchInputs(
+        service_pb2.PatchInputsRequest(action="merge", inputs=[_input("a", group="2")]),
+        metadata=METADATA,
+    )
+    raise_on_failure(response)
+    assert server.backend.inputs["a"].data.metadata["group"] == "2"
+
+    response = stub.ListInputs(
+        service_pb2.ListInputsRequest(page=2, per_page=1), metadata=METADATA
+    )
+    raise_on_failure(response)
+    assert [i.id for i in response.inputs] == ["b"]
+
+    response = stub.StreamInputs(
+        service_pb2.StreamInputsRequest(per_page=10, last_id="a"), metadata=METADATA
+    )
+    raise_on_failure(response)
+    assert [i.id for i in response.inputs] == ["b"]
+
+    raise_on_failure(
+        stub.DeleteInputs(service_pb2.DeleteInputsRequest(ids=["a"]), metadata=METADATA)
+    )
+    response = stub.GetInput(service_pb2.GetInputRequest(input_id="a"), metadata=METADATA)
+    assert response.status.code == status_code_pb2.INPUT_DOES_NOT_EXIST
+
+
+@both_fake_channels
+def test_annotations_and_concepts(stub, server):
+    raise_on_failure(
+        stub.PostInputs(service_pb2.PostInputsRequest(inputs=[_input("a")]), metadata=METADATA)
+    )
+    raise_on_failure(
+        stub.PostConcepts(
+            service_pb2.PostConceptsRequest(concepts=[resources_pb2.Concept(id="dog")]),
+            metadata=METADATA,
+        )
+    )
+    response = stub.PostAnnotations(
+        service_pb2.PostAnnotationsRequest(
+            annotations=[
+                resources_pb2.Annotation(
+                    input_id="a",
+                    data=resources_pb2.Data(concepts=[resources_pb2.Concept(id="dog", value=1)]),
+                )
+            ]
+        ),
+        metadata=METADATA,
+    )
+    raise_on_failure(response)
+
+    response = stub.ListAnnotations(
+        service_pb2.ListAnnotationsRequest(input_ids=["a"]), metadata=METADATA
+    )
+    raise_on_failure(response)
+    assert [a.data.concepts[0].id for a in response.annotations] == ["dog"]
+
+    response = stub.GetConcept(service_pb2.GetConceptRequest(concept_id="dog"), metadata=METADATA)
+    raise_on_failure(response)
+    assert response.concept.name == "dog"
+
+
+@both_fake_channels
+def test_predict_returns_canned_outputs(stub, server):
+    server.backend.set_model_output(
+        "color", resources_pb2.Data(colors=[resources_pb2.Color(raw_hex="#ff0000", value=1)])
+    )
+
+    response = stub.PostModelOutputs(
+        service_pb2.PostModelOutputsRequest(model_id="general", inputs=[_input("a"), _input("b")]),
+        metadata=METADATA,
+    )
+    raise_on_failure(response)
+    assert [o.input.id for o in response.outputs] == ["a", "b"]
+    assert response.outputs[0].data.concepts[0].name == "dog"
+
+    response = stub.PostModelOutputs(
+        service_pb2.PostModelOutputsRequest(model_id="color", inputs=[_input("a")]),
+        metadata=METADATA,
+    )
+    raise_on_failure(response)
+    assert response.outputs[0].data.colors[0].raw_hex == "#ff0000"
+
+
+@both_fake_channels
+def test_inputs_searches_by_concept(stub, server):
+    inputs = [_input("a"), _input("b"), _input("c")]
+    inputs[0].data.concepts.add(id="dog", value=0.5)
+    inputs[1].data.concepts.add(id="dog", value=1)
+    stub.PostInputs(service_pb2.PostInputsRequest(inputs=inputs), metadata=METADATA)
+    query = resources_pb2.Query(
+        ranks=[
+            resources_pb2.Rank(
+                annotation=resources_pb2.Annotation(
+                    data=resources_pb2.Data(concepts=[resources_pb2.Concept(id="dog", value=1)])
+                )
+            )
+        ]
+    )
+
+    response = stub.PostInputsSearches(
+        service_pb2.PostInputsSearchesRequest(searches=[resources_pb2.Search(query=query)]),
+        metadata=METADATA,
+    )
+    raise_on_failure(response)
+    assert [(hit.input.id, hit.score) for hit in response.hits] == [("b", 1.0), ("a", 0.5)]
+
+    response = stub.PostInputsSearches(
+        service_pb2.PostInputsSearchesRequest(pagination=service_pb2.Pagination(per_page=2)),
+        metadata=METADATA,
+    )
+    raise_on_failure(response)
+    assert len(response.hits) == 2
+
+
+@both_fake_channels
+def test_injected_api_errors(stub, server):
+    server.faults.error_rate = 1.0
+
+    response = stub.ListInputs(service_pb2.ListInputsRequest(), metadata=METADATA)
+
+    assert response.status.code == status_code_pb2.INTERNAL_UNCATEGORIZED
+
+
+def test_injected_transport_errors():
+    with FakeV2Server(faults=FaultInjection(transport_error_rate=1.0)) as server:
+        with pytest.raises(grpc.RpcError):
+            server.grpc_stub().ListInputs(service_pb2.ListInputsRequest(), metadata=METADATA)
+        with pytest.raises(ApiError):
+            server.json_stub().ListInputs(service_pb2.ListInputsRequest(), metadata=METADATA)
+
+
+def test_api_key_is_checked():
+    with FakeV2Server(api_key="right-key") as server:
+        stub = server.json_stub()
+        response = stub.ListInputs(service_pb2.ListInputsRequest(), metadata=METADATA)
+        assert response.status.code == status_code_pb2.CONN_KEY_INVALID
+
+        response = stub.ListInputs(
+            service_pb2.ListInputsRequest(), metadata=(("authorization", "Key right-key"),)
+        )
+        raise_on_failure(response)
+
+
+def test_unimplemented_methods():
+    with FakeV2Server() as server:
+        with pytest.raises(grpc.RpcError) as e:
+            server.grpc_stub().ListModels(service_pb2.ListModelsRequest(), metadata=METADATA)
+        assert e.value.code() == grpc.StatusCode.UNIMPLEMENTED
@@ -0,0 +1,104 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.fork_safe_channel import ForkSafeChannel
+from clarifai_grpc.channel.http_client import ForkSafeSession, ThreadLocalSession
+from clarifai_grpc.channel.registry import get_shared_stub, init_shared_channel
+from clarifai_grpc.grpc.api import service_pb2, service_pb2_grpc
+from clarifai_grpc.grpc.api.status import status_code_pb2
+from clarifai_grpc.testing.fake_server import FakeV2Server
+
+needs_fork = pytest.mark.skipif(not hasattr(os, "fork"), reason="Needs os.fork")
+
+
+def _list_inputs_in_worker(base_url):
+    stub = get_shared_stub("json", base_url, api_key="key")
+    return os.getpid(), stub.ListInputs(service_pb2.ListInputsRequest()).status.code
+
+
+def test_fork_safe_session_remakes_its_pools_after_fork(monkeypatch):
+    session = ClarifaiChannel._make_requests_session()
+    session.headers["X-Custom"] = "kept"
+    adapter = session.get_adapter("https://api.clarifai.com")
+    parent_pools = adapter.poolmanager
+
+    monkeypatch.setattr(os, "getpid", lambda: -1)
+
+    assert isinstance(session, ForkSafeSession)
+    assert session.get_adapter("https://api.clarifai.com") is adapter
+    assert adapter.poolmanager is not parent_pools
+    assert session.headers["X-Custom"] == "kept"
+
+
+def test_thread_local_sessions_are_remade_after_fork(monkeypatch):
+    sessions = ThreadLocalSession(ClarifaiChannel._make_requests_session)
+    parent_session = sessions.session
+
+    monkeypatch.setattr(os, "getpid", lambda: -1)
+    child_session = sessions.session
+
+    assert child_session is not parent_session
+    assert sessions.session is child_session
+
+
+def test_fork_safe_grpc_channel_is_remade_after_fork(monkeypatch):
+    with FakeV2Server() as server:
+        channel = ClarifaiChannel.get_insecure_grpc_channel(
+            server.grpc_host, server.grpc_port, api_key="key", fork_safe=True
+        )
+        stub = service_pb2_grpc.V2Stub(channel)
+        parent_channel = channel.channel
+        assert stub.ListInputs(service_pb2.ListInputsRequest()).status.code == (
+            status_code_pb2.SUCCESS
+        )
+
+        monkeypatch.setattr(os, "getpid", lambda: -1)
+        response = stub.ListInputs(service_pb2.ListInputsRequest())
+
+        assert channel.channel is not parent_channel
+        assert response.status.code == status_code_pb2.SUCCESS
+        channel.close()
+        parent_channel.close()
+
+    assert isinstance(channel, ForkSafeChannel)
+
+
+@needs_fork
+def test_json_channel_works_in_forked_child():
+    with FakeV2Server() as server:
+        stub = server.json_stub(api_key="key")
+        assert stub.ListInputs(service_pb2.ListInputsRequest()).status.code == (
+            status_code_pb2.SUCCESS
+        )
+
+        pid = os.fork()
+        if pid == 0:
+            code = stub.ListInputs(service_pb2.ListInputsRequest()).status.code
+            os._exit(0 if code == status_code_pb2.SUCCESS else 1)
+        _, status = os.waitpid(pid, 0)
+
+        # The parent's pooled connection is still usable.
+        assert stub.ListInputs(service_pb2.ListInputsRequest()).status.code == (
+            status_code_pb2.SUCCESS
+        )
+
+    assert os.WEXITSTATUS(status) == 0
+
+
+@needs_fork
+def test_process_pool_workers_get_their_own_shared_channels():
+    with FakeV2Server() as server:
+        with ProcessPoolExecutor(
+            2,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=init_shared_channel,
+            initargs=("json", server.base_url, {"api_key": "key"}),
+        ) as executor:
+            results = list(executor.map(_list_inputs_in_worker, [server.base_url] * 8))
+
+    assert all(code == status_code_pb2.SUCCESS for _, code in results)
+    assert os.getpid() not in {pid for pid, _ in results}
@@ -0,0 +1,29 @@
+import sys
+
+import pytest
+
+from clarifai_grpc.bench.import_time import IMPORTTIME_MIN_VERSION, import_profile
+
+needs_importtime = pytest.mark.skipif(
+    sys.version_info < IMPORTTIME_MIN_VERSION, reason="Needs python -X importtime"
+)
+
+
+@needs_importtime
+def test_clarifai_channel_imports_no_transport():
+    imported = import_profile("clarifai_grpc.channel.clarifai_channel")
+
+    assert "clarifai_grpc.channel.clarifai_channel" in imported
+    assert "requests" not in imported
+    assert "grpc" not in imported
+    assert "clarifai_grpc.grpc.api.service_pb2" not in imported
+    assert "clarifai_grpc.channel.grpc_json_channel" not in imported
+
+
+@needs_importtime
+def test_grpc_stub_does_not_import_requests():
+    imported = import_profile("clarifai_grpc.grpc.api.service_pb2_grpc")
+
+    assert "grpc" in imported
+    assert "requests" not in imported
+    assert "clarifai_grpc.channel.http_client" not in imported
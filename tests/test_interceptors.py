@@ -0,0 +1,113 @@
+import grpc
+import pytest
+
+from clarifai_grpc.channel.interceptors import (
+    CallMetricsInterceptor,
+    ClientCallDetails,
+    UnaryOutcome,
+)
+from clarifai_grpc.grpc.api import service_pb2
+from clarifai_grpc.grpc.api.status import status_code_pb2
+from clarifai_grpc.testing.fake_server import FakeV2Server
+
+LIST_INPUTS = "/clarifai.api.V2/ListInputs"
+
+
+class AuthInterceptor(grpc.UnaryUnaryClientInterceptor):
+    def __init__(self, api_key):
+        self.api_key = api_key
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        metadata = list(client_call_details.metadata or ())
+        metadata.append(("authorization", "Key " + self.api_key))
+        call_details = ClientCallDetails(
+            client_call_details.method,
+            client_call_details.timeout,
+            metadata,
+            client_call_details.credentials,
+            client_call_details.wait_for_ready,
+            client_call_details.compression,
+        )
+        return continuation(call_details, request)
+
+
+class OrderInterceptor(grpc.UnaryUnaryClientInterceptor):
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        self.log.append(self.name)
+        return continuation(client_call_details, request)
+
+
+class CachingInterceptor(grpc.UnaryUnaryClientInterceptor):
+    def __init__(self):
+        self.cache = {}
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        key = (client_call_details.method, request.SerializeToString(deterministic=True))
+        if key not in self.cache:
+            self.cache[key] = continuation(client_call_details, request).result()
+        return UnaryOutcome(response=self.cache[key])
+
+
+class FailingInterceptor(grpc.UnaryUnaryClientInterceptor):
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        raise RuntimeError("rejected by interceptor")
+
+
+def _stub(server, use_json_channel, interceptors):
+    if use_json_channel:
+        return server.json_stub(interceptors)
+    return server.grpc_stub(interceptors)
+
+
+@pytest.mark.parametrize("use_json_channel", [False, True])
+def test_interceptors_run_outermost_first_and_can_inject_auth(use_json_channel):
+    log = []
+    interceptors = [
+        OrderInterceptor("outer", log),
+        AuthInterceptor("k"),
+        OrderInterceptor("inner", log),
+    ]
+    with FakeV2Server(api_key="k") as server:
+        stub = _stub(server, use_json_channel, interceptors)
+        response = stub.ListInputs(service_pb2.ListInputsRequest())
+
+    assert response.status.code == status_code_pb2.SUCCESS
+    assert log == ["outer", "inner"]
+
+
+@pytest.mark.parametrize("use_json_channel", [False, True])
+def test_call_metrics_interceptor(use_json_channel):
+    metrics = CallMetricsInterceptor()
+    with FakeV2Server() as server:
+        stub = _stub(server, use_json_channel, [metrics, AuthInterceptor("k")])
+        for _ in range(3):
+            stub.ListInputs(service_pb2.ListInputsRequest())
+
+    assert metrics.calls[LIST_INPUTS] == 3
+    assert metrics.errors[LIST_INPUTS] == 0
+    assert metrics.mean_latency(LIST_INPUTS) > 0
+
+
+@pytest.mark.parametrize("use_json_channel", [False, True])
+def test_interceptor_can_short_circuit_calls(use_json_channel):
+    cache = CachingInterceptor()
+    metrics = CallMetricsInterceptor()
+    with FakeV2Server() as server:
+        stub = _stub(server, use_json_channel, [cache, metrics, AuthInterceptor("k")])
+        first = stub.ListInputs(service_pb2.ListInputsRequest(per_page=5))
+        second = stub.ListInputs(service_pb2.ListInputsRequest(per_page=5))
+
+    assert first == second
+    assert metrics.calls[LIST_INPUTS] == 1
+
+
+@pytest.mark.parametrize("use_json_channel", [False, True])
+def test_interceptor_errors_propagate(use_json_channel):
+    with FakeV2Server() as server:
+        stub = _stub(server, use_json_channel, [FailingInterceptor()])
+        with pytest.raises(RuntimeError, match="rejected by interceptor"):
+            stub.ListInputs(service_pb2.ListInputsRequest())
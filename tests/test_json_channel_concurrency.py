@@ -0,0 +1,105 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.http_client import ThreadLocalSession
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2, service_pb2_grpc
+from clarifai_grpc.grpc.api.status import status_code_pb2
+from clarifai_grpc.testing.fake_server import FakeV2Server, FaultInjection
+
+LATENCY = 0.05
+CALLS_PER_THREAD = 4
+
+
+def _throughput(stub, concurrency):
+    def work(_):
+        for _ in range(CALLS_PER_THREAD):
+            response = stub.ListInputs(service_pb2.ListInputsRequest())
+            assert response.status.code == status_code_pb2.SUCCESS
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(work, range(concurrency)))
+    return concurrency * CALLS_PER_THREAD / (time.perf_counter() - start)
+
+
+def test_thread_local_session_gives_each_thread_its_own_session():
+    sessions = ThreadLocalSession(ClarifaiChannel._make_requests_session)
+    seen = []
+    lock = threading.Lock()
+
+    def record():
+        with lock:
+            seen.append(sessions.session)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    record()
+    record()
+
+    assert len(seen) == 6
+    assert len(set(map(id, seen))) == 5
+    sessions.close()
+    assert sessions.session is not seen[-1]
+
+
+def test_thread_local_session_forwards_attributes():
+    sessions = ThreadLocalSession(ClarifaiChannel._make_requests_session)
+    sessions.verify = False
+    sessions.headers["X-Custom"] = "value"
+
+    with ThreadPoolExecutor(1) as executor:
+        other = executor.submit(lambda: sessions.session).result()
+
+    assert sessions.session.verify is False
+    assert other.verify is False
+    assert sessions.headers["X-Custom"] == "value"
+    # Other attributes are the calling thread's session's.
+    assert "X-Custom" not in other.headers
+    sessions.close()
+
+
+@pytest.mark.parametrize("per_thread_sessions", [False, True])
+def test_concurrent_calls_get_their_own_responses(per_thread_sessions):
+    with FakeV2Server() as server:
+        channel = ClarifaiChannel.get_json_channel(
+            server.base_url, api_key="key", concurrency=32, per_thread_sessions=per_thread_sessions
+        )
+        stub = service_pb2_grpc.V2Stub(channel)
+        stub.PostInputs(
+            service_pb2.PostInputsRequest(
+                inputs=[resources_pb2.Input(id="input-%d" % i) for i in range(32)]
+            )
+        )
+
+        def get(i):
+            return stub.GetInput(service_pb2.GetInputRequest(input_id="input-%d" % i)).input.id
+
+        with ThreadPoolExecutor(32) as executor:
+            ids = list(executor.map(get, list(range(32)) * 4))
+        channel.close()
+
+    assert ids == ["input-%d" % i for i in list(range(32)) * 4]
+
+
+@pytest.mark.parametrize("per_thread_sessions", [False, True])
+def test_throughput_scales_with_concurrency(per_thread_sessions):
+    with FakeV2Server(faults=FaultInjection(latency=LATENCY)) as server:
+        channel = ClarifaiChannel.get_json_channel(
+            server.base_url, api_key="key", concurrency=8, per_thread_sessions=per_thread_sessions
+        )
+        stub = service_pb2_grpc.V2Stub(channel)
+        _throughput(stub, 8)  # Opens the connections.
+
+        sequential = _throughput(stub, 1)
+        concurrent = _throughput(stub, 8)
+        channel.close()
+
+    # Linear scaling would be 8x. Leave room for slow machines.
+    assert concurrent > 4 * sequential
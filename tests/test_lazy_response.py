@@ -0,0 +1,104 @@
+import copy
+
+import pytest
+
+from clarifai_grpc.channel.custom_converters.custom_dict_to_message import dict_to_protobuf
+from clarifai_grpc.channel.custom_converters.custom_message_to_dict import protobuf_to_dict
+from clarifai_grpc.channel.custom_converters.custom_struct_converters import dict_to_struct
+from clarifai_grpc.channel.lazy_response import LazyMessage, LazyRepeated, materialize
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2, service_pb2_grpc
+from clarifai_grpc.grpc.api.status import status_code_pb2, status_pb2
+from clarifai_grpc.helpers.pagination import paginate
+from clarifai_grpc.helpers.responses import raise_on_failure
+from clarifai_grpc.testing.fake_server import FakeV2Server
+
+METADATA = (("authorization", "Key fake-key"),)
+
+
+def _response_json():
+    response = service_pb2.MultiOutputResponse(
+        status=status_pb2.Status(code=status_code_pb2.SUCCESS, description="Ok"),
+        outputs=[
+            resources_pb2.Output(
+                id="output-%d" % i,
+                input=resources_pb2.Input(id="input-%d" % i),
+                data=resources_pb2.Data(
+                    concepts=[resources_pb2.Concept(id="dog", name="dog", value=0.5)],
+                    metadata=dict_to_struct({"index": i, "tags": ["a"]}),
+                ),
+            )
+            for i in range(3)
+        ],
+    )
+    response.outputs[0].created_at.FromSeconds(1600000000)
+    return protobuf_to_dict(response, use_integers_for_enums=False)
+
+
+def test_fields_read_like_the_message():
+    js = _response_json()
+    expected = dict_to_protobuf(service_pb2.MultiOutputResponse, copy.deepcopy(js))
+
+    response = LazyMessage(service_pb2.MultiOutputResponse, js)
+
+    assert response.status.code == status_code_pb2.SUCCESS
+    assert response.status.description == "Ok"
+    assert isinstance(response.outputs, LazyRepeated)
+    assert len(response.outputs) == 3
+    assert [output.input.id for output in response.outputs] == ["input-0", "input-1", "input-2"]
+    assert response.outputs[1].data.concepts[0].value == pytest.approx(0.5)
+    assert response.outputs[2].data.metadata["index"] == 2
+    assert response.outputs[0].created_at == expected.outputs[0].created_at
+    assert response.outputs[0] is response.outputs[0]
+    assert [o.id for o in response.outputs[1:]] == ["output-1", "output-2"]
+    assert response == expected
+
+
+def test_unset_fields_have_default_values():
+    response = LazyMessage(service_pb2.MultiOutputResponse, {})
+
+    assert response.status.code == 0
+    assert response.status.description == ""
+    assert len(response.outputs) == 0
+    assert response.outputs[0:5] == []
+
+
+def test_other_attributes_use_the_materialized_message():
+    js = _response_json()
+    response = LazyMessage(service_pb2.MultiOutputResponse, js)
+
+    assert response.HasField("status")
+    assert not response.outputs[0].HasField("model")
+    assert response.SerializeToString() == materialize(response).SerializeToString()
+    assert materialize(response) is materialize(response)
+    assert materialize(response.outputs[1]) == materialize(response).outputs[1]
+    assert response.DESCRIPTOR is service_pb2.MultiOutputResponse.DESCRIPTOR
+
+
+def test_read_only():
+    response = LazyMessage(service_pb2.MultiOutputResponse, _response_json())
+
+    with pytest.raises(AttributeError):
+        response.status = None
+
+
+def test_json_channel_lazy_responses():
+    with FakeV2Server() as server:
+        stub = service_pb2_grpc.V2Stub(server.json_channel(lazy_responses=True))
+        raise_on_failure(
+            stub.PostInputs(
+                service_pb2.PostInputsRequest(
+                    inputs=[resources_pb2.Input(id="input-%d" % i) for i in range(25)]
+                ),
+                metadata=METADATA,
+            )
+        )
+
+        response = stub.GetInput(
+            service_pb2.GetInputRequest(input_id="input-3"), metadata=METADATA
+        )
+        assert isinstance(response, LazyMessage)
+        raise_on_failure(response)
+        assert response.input.id == "input-3"
+
+        inputs = paginate(stub.ListInputs, service_pb2.ListInputsRequest(per_page=10), METADATA)
+        assert sorted(i.id for i in inputs) == sorted("input-%d" % i for i in range(25))
@@ -0,0 +1,41 @@
+import pytest
+
+from clarifai_grpc.bench import load
+from clarifai_grpc.testing.fake_server import FakeV2Server
+
+METADATA = (("authorization", "Key fake-key"),)
+
+
+def test_parse_mix():
+    assert load.parse_mix("predict=3, list") == {"predict": 3.0, "list": 1.0}
+    with pytest.raises(ValueError):
+        load.parse_mix("unknown=1")
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert load.percentile(values, 0.5) == 50
+    assert load.percentile(values, 0.99) == 99
+    assert load.percentile([], 0.5) == 0.0
+
+
+def test_run_load_against_fake_server():
+    with FakeV2Server() as server:
+        stub = load.make_stub("json", server.base_url)
+        report = load.run_load(
+            stub,
+            METADATA,
+            load.parse_mix("predict=2,list=1,post_inputs=1,search=1"),
+            concurrency=4,
+            total_requests=40,
+            seed=1,
+        )
+
+    assert report["overall"]["calls"] == 40
+    assert set(report["operations"]) == {"predict", "list", "post_inputs", "search"}
+    for operation in ("predict", "list", "post_inputs", "search"):
+        assert report["operations"][operation]["calls"] > 0
+        assert report["operations"][operation]["errors"] == 0
+    assert report["overall"]["latency_ms"]["p99"] >= report["overall"]["latency_ms"]["p50"]
+    assert report["client"]["cpu_s"] > 0
+    assert "overall" in load.format_report(report)
@@ -0,0 +1,127 @@
+import threading
+
+import pytest
+
+from clarifai_grpc.channel.errors import UsageError
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+from clarifai_grpc.grpc.api.status import status_code_pb2, status_pb2
+from clarifai_grpc.helpers.pagination import paginate, paginate_responses
+
+
+class FakeListInputs:
+    def __init__(self, total, failing_page=None):
+        self.total = total
+        self.failing_page = failing_page
+        self.requested_pages = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request, metadata=None):
+        with self._lock:
+            self.requested_pages.append(request.page)
+        status_code = status_code_pb2.SUCCESS
+        if request.page == self.failing_page:
+            status_code = status_code_pb2.FAILURE
+        start = (request.page - 1) * request.per_page
+        end = min(start + request.per_page, self.total)
+        return service_pb2.MultiInputResponse(
+            status=status_pb2.Status(code=status_code),
+            inputs=[resources_pb2.Input(id="input-%d" % i) for i in range(start, end)],
+        )
+
+
+def test_paginate_yields_all_items_in_order():
+    stub_method = FakeListInputs(total=25)
+
+    ids = [
+        i.id for i in paginate(stub_method, service_pb2.ListInputsRequest(per_page=10), prefetch=3)
+    ]
+
+    assert ids == ["input-%d" % i for i in range(25)]
+
+
+def test_paginate_stops_after_short_page():
+    stub_method = FakeListInputs(total=20)
+
+    responses = list(
+        paginate_responses(stub_method, service_pb2.ListInputsRequest(per_page=10), prefetch=0)
+    )
+
+    assert [len(r.inputs) for r in responses] == [10, 10, 0]
+    assert stub_method.requested_pages == [1, 2, 3]
+
+
+def test_paginate_starts_at_request_page():
+    stub_method = FakeListInputs(total=30)
+
+    ids = [i.id for i in paginate(stub_method, service_pb2.ListInputsRequest(page=2, per_page=10))]
+
+    assert ids == ["input-%d" % i for i in range(10, 30)]
+
+
+def test_paginate_respects_max_pages():
+    stub_method = FakeListInputs(total=100)
+
+    items = list(
+        paginate(stub_method, service_pb2.ListInputsRequest(per_page=10), prefetch=4, max_pages=2)
+    )
+
+    assert len(items) == 20
+    assert sorted(stub_method.requested_pages) == [1, 2]
+
+
+def test_paginate_raises_on_failed_page():
+    stub_method = FakeListInputs(total=100, failing_page=2)
+
+    with pytest.raises(ClarifaiException):
+        list(paginate(stub_method, service_pb2.ListInputsRequest(per_page=10)))
+
+
+def test_paginate_requires_items_field_for_ambiguous_responses():
+    def list_searches(request, metadata=None):
+        return service_pb2.MultiSearchResponse(
+            status=status_pb2.Status(code=status_code_pb2.SUCCESS)
+        )
+
+    with pytest.raises(UsageError):
+        list(paginate(list_searches, service_pb2.ListSearchesRequest()))
+
+    assert (
+        list(paginate(list_searches, service_pb2.ListSearchesRequest(), items_field="hits")) == []
+    )
+
+
+def test_paginate_searches_with_pagination_field():
+    requested_pages = []
+
+    def post_inputs_searches(request, metadata=None):
+        requested_pages.append((request.pagination.page, request.pagination.per_page))
+        start = (request.pagination.page - 1) * request.pagination.per_page
+        end = min(start + request.pagination.per_page, 25)
+        return service_pb2.MultiSearchResponse(
+            status=status_pb2.Status(code=status_code_pb2.SUCCESS),
+            hits=[
+                resources_pb2.Hit(input=resources_pb2.Input(id="input-%d" % i))
+                for i in range(start, end)
+            ],
+        )
+
+    request = service_pb2.PostInputsSearchesRequest(pagination=service_pb2.Pagination(per_page=10))
+    hits = list(paginate(post_inputs_searches, request, prefetch=0, items_field="hits"))
+
+    assert [h.input.id for h in hits] == ["input-%d" % i for i in range(25)]
+    assert requested_pages == [(1, 10), (2, 10), (3, 10)]
+
+
+def test_paginate_rejects_unpaginated_requests():
+    with pytest.raises(UsageError):
+        list(paginate(lambda request, metadata=None: None, service_pb2.GetInputRequest()))
+
+
+def test_page_limit_and_items_field_are_keyword_only():
+    stub_method = FakeListInputs(total=5)
+
+    with pytest.raises(TypeError):
+        paginate(stub_method, service_pb2.ListInputsRequest(), None, 0, 1)
+    with pytest.raises(TypeError):
+        paginate_responses(stub_method, service_pb2.ListInputsRequest(), None, 0, 1)
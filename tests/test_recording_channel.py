@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.channel.recording_channel import (
+    REDACTED,
+    RecordingChannel,
+    ReplayChannel,
+    read_recording,
+)
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2, service_pb2_grpc
+from clarifai_grpc.testing.fake_server import FakeV2Server, FaultInjection
+
+METADATA = (("authorization", "Key secret-key"),)
+INPUT = resources_pb2.Input(
+    id="a", data=resources_pb2.Data(image=resources_pb2.Image(url="https://example.com/a.jpg"))
+)
+
+
+def _record(path, use_json_channel):
+    requests = [
+        service_pb2.PostInputsRequest(inputs=[INPUT]),
+        service_pb2.ListInputsRequest(per_page=10),
+        service_pb2.PostModelOutputsRequest(model_id="general", inputs=[INPUT]),
+    ]
+    with FakeV2Server(faults=FaultInjection(latency=0.01)) as server:
+        channel = server.json_channel() if use_json_channel else server.grpc_channel()
+        with RecordingChannel(channel, path) as recording_channel:
+            stub = service_pb2_grpc.V2Stub(recording_channel)
+            responses = [
+                stub.PostInputs(requests[0], metadata=METADATA),
+                stub.ListInputs(requests[1], metadata=METADATA),
+                stub.PostModelOutputs(requests[2], metadata=METADATA),
+            ]
+    return requests, responses
+
+
+@pytest.mark.parametrize("use_json_channel", [False, True])
+def test_record_and_replay(tmp_path, use_json_channel):
+    path = str(tmp_path / "traffic.rec.gz")
+    requests, responses = _record(path, use_json_channel)
+
+    stub = service_pb2_grpc.V2Stub(ReplayChannel(path))
+    assert stub.PostInputs(requests[0], metadata=METADATA) == responses[0]
+    assert stub.ListInputs(requests[1], metadata=METADATA) == responses[1]
+    assert stub.PostModelOutputs(requests[2], metadata=METADATA) == responses[2]
+
+
+def test_recording_redacts_credentials(tmp_path):
+    path = str(tmp_path / "traffic.rec")
+    _record(path, use_json_channel=False)
+
+    calls = read_recording(path)
+    assert [c.method.split("/")[-1] for c in calls] == [
+        "PostInputs",
+        "ListInputs",
+        "PostModelOutputs",
+    ]
+    assert all(c.metadata == [["authorization", REDACTED]] for c in calls)
+    assert all(c.latency >= 0.01 for c in calls)
+    with open(path, "rb") as f:
+        assert b"secret-key" not in f.read()
+
+
+def test_replay_simulates_latency_and_strictness(tmp_path):
+    path = str(tmp_path / "traffic.rec")
+    requests, responses = _record(path, use_json_channel=False)
+
+    stub = service_pb2_grpc.V2Stub(ReplayChannel(path, strict=True))
+    with pytest.raises(ClarifaiException):
+        stub.ListInputs(service_pb2.ListInputsRequest(per_page=99), metadata=METADATA)
+
+    stub = service_pb2_grpc.V2Stub(ReplayChannel(path, simulate_latency=True, strict=False))
+    response = stub.ListInputs(service_pb2.ListInputsRequest(per_page=99), metadata=METADATA)
+    assert response == responses[1]
+    assert os.path.getsize(path) < 2000
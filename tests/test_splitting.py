@@ -0,0 +1,118 @@
+import threading
+
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+from clarifai_grpc.grpc.api.status import status_code_pb2, status_pb2
+from clarifai_grpc.helpers.splitting import call_in_chunks, split_request
+from tests.common import both_fake_channels
+
+
+def _inputs(count, payload_size=0):
+    return [
+        resources_pb2.Input(
+            id="input-%d" % i,
+            data=resources_pb2.Data(image=resources_pb2.Image(base64=b"x" * payload_size)),
+        )
+        for i in range(count)
+    ]
+
+
+def test_split_request_by_item_count():
+    request = service_pb2.PostInputsRequest(
+        user_app_id=resources_pb2.UserAppIDSet(app_id="app"), inputs=_inputs(10)
+    )
+
+    chunks = split_request(request, max_items=4)
+
+    assert [len(c.inputs) for c in chunks] == [4, 4, 2]
+    assert all(c.user_app_id.app_id == "app" for c in chunks)
+    assert [i.id for c in chunks for i in c.inputs] == [i.id for i in request.inputs]
+
+
+def test_split_request_by_byte_size():
+    request = service_pb2.PostInputsRequest(inputs=_inputs(6, payload_size=1000))
+
+    chunks = split_request(request, max_items=100, max_bytes=2500)
+
+    assert [len(c.inputs) for c in chunks] == [2, 2, 2]
+    assert all(c.ByteSize() <= 2500 for c in chunks)
+
+
+def test_split_request_of_scalar_ids():
+    request = service_pb2.DeleteInputsRequest(ids=["id-%d" % i for i in range(5)])
+
+    chunks = split_request(request, max_items=2)
+
+    assert [list(c.ids) for c in chunks] == [["id-0", "id-1"], ["id-2", "id-3"], ["id-4"]]
+
+
+def test_call_in_chunks_merges_responses_and_statuses():
+    lock = threading.Lock()
+    calls = []
+
+    def post_inputs(request, metadata=None):
+        with lock:
+            calls.append(request)
+        outputs = []
+        response_code = status_code_pb2.SUCCESS
+        for input_ in request.inputs:
+            code = status_code_pb2.INPUT_DOWNLOAD_PENDING
+            if input_.id == "input-5":
+                code = status_code_pb2.INPUT_DOWNLOAD_FAILED
+                response_code = status_code_pb2.MIXED_STATUS
+            outputs.append(resources_pb2.Input(id=input_.id, status=status_pb2.Status(code=code)))
+        return service_pb2.MultiInputResponse(
+            status=status_pb2.Status(code=response_code), inputs=outputs
+        )
+
+    result = call_in_chunks(
+        post_inputs, service_pb2.PostInputsRequest(inputs=_inputs(10)), max_items=3
+    )
+
+    assert len(calls) == 4
+    assert [i.id for i in result.response.inputs] == ["input-%d" % i for i in range(10)]
+    assert result.failed_indices == [5]
+    assert result.response.status.code == status_code_pb2.MIXED_STATUS
+    assert result.errors == []
+
+
+def test_call_in_chunks_reports_failed_chunks():
+    def delete_inputs(request, metadata=None):
+        if "id-0" in request.ids:
+            raise RuntimeError("connection reset")
+        return status_pb2.BaseResponse(status=status_pb2.Status(code=status_code_pb2.SUCCESS))
+
+    result = call_in_chunks(
+        delete_inputs,
+        service_pb2.DeleteInputsRequest(ids=["id-%d" % i for i in range(5)]),
+        max_items=2,
+    )
+
+    assert result.failed_indices == [0, 1]
+    assert "connection reset" in result.item_statuses[0].details
+    assert len(result.errors) == 1
+    assert result.response.status.code == status_code_pb2.MIXED_STATUS
+
+
+@both_fake_channels
+def test_call_in_chunks_against_the_fake_server(stub, server):
+    result = call_in_chunks(
+        stub.PostInputs,
+        service_pb2.PostInputsRequest(inputs=_inputs(5)),
+        metadata=(("authorization", "Key fake-key"),),
+        max_items=2,
+    )
+
+    assert result.failed_indices == []
+    assert result.response.status.code == status_code_pb2.SUCCESS
+    assert {s.code for s in result.item_statuses} == {status_code_pb2.INPUT_DOWNLOAD_SUCCESS}
+
+    # Posting them again fails, as duplicates.
+    result = call_in_chunks(
+        stub.PostInputs,
+        service_pb2.PostInputsRequest(inputs=_inputs(6)),
+        metadata=(("authorization", "Key fake-key"),),
+        max_items=2,
+    )
+
+    assert result.failed_indices == [0, 1, 2, 3, 4]
+    assert result.response.status.code == status_code_pb2.MIXED_STATUS
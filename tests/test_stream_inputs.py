@@ -0,0 +1,63 @@
+import pytest
+
+from clarifai_grpc.channel.exceptions import ClarifaiException
+from clarifai_grpc.grpc.api import resources_pb2, service_pb2
+from clarifai_grpc.grpc.api.status import status_code_pb2, status_pb2
+from clarifai_grpc.helpers.streaming import StreamInputsIterator
+
+
+class FakeStreamInputs:
+    def __init__(self, total, status_code=status_code_pb2.SUCCESS):
+        self.ids = ["input-%04d" % i for i in range(total)]
+        self.status_code = status_code
+        self.requests = []
+
+    def __call__(self, request, metadata=None):
+        self.requests.append(request)
+        remaining = [i for i in self.ids if i > request.last_id]
+        return service_pb2.MultiInputResponse(
+            status=status_pb2.Status(code=self.status_code),
+            inputs=[resources_pb2.Input(id=i) for i in remaining[: request.per_page]],
+        )
+
+
+def test_stream_inputs_iterates_all_inputs():
+    stub_method = FakeStreamInputs(total=25)
+
+    inputs = StreamInputsIterator(
+        stub_method, service_pb2.StreamInputsRequest(per_page=10), metadata=(("a", "b"),)
+    )
+
+    assert [i.id for i in inputs] == stub_method.ids
+    assert [r.last_id for r in stub_method.requests] == [
+        "",
+        "input-0009",
+        "input-0019",
+        "input-0024",
+    ]
+    assert inputs.stats.page_count == 4
+    assert inputs.stats.item_count == 25
+    assert inputs.stats.max_latency >= inputs.stats.mean_latency >= 0
+
+
+def test_stream_inputs_resumes_from_last_id():
+    stub_method = FakeStreamInputs(total=25)
+
+    inputs = StreamInputsIterator(stub_method, service_pb2.StreamInputsRequest(per_page=10))
+    for input_ in inputs:
+        if input_.id == "input-0012":
+            break
+
+    assert inputs.last_id == "input-0012"
+
+    resumed = StreamInputsIterator(
+        stub_method, service_pb2.StreamInputsRequest(per_page=10), last_id=inputs.last_id
+    )
+    assert [i.id for i in resumed] == stub_method.ids[13:]
+
+
+def test_stream_inputs_raises_on_failure():
+    stub_method = FakeStreamInputs(total=5, status_code=status_code_pb2.FAILURE)
+
+    with pytest.raises(ClarifaiException):
+        list(StreamInputsIterator(stub_method))
@@ -0,0 +1,102 @@
+import math
+
+import pytest
+from google.protobuf import struct_pb2
+from google.protobuf.json_format import ParseDict, ParseError
+
+from clarifai_grpc.channel.custom_converters.custom_dict_to_message import dict_to_protobuf
+from clarifai_grpc.channel.custom_converters.custom_message_to_dict import protobuf_to_dict
+from clarifai_grpc.channel.custom_converters.custom_struct_converters import (
+    dict_to_struct,
+    dicts_to_structs,
+    list_to_list_value,
+    object_to_value,
+    struct_to_dict,
+    structs_to_dicts,
+    value_to_object,
+)
+from clarifai_grpc.grpc.api import resources_pb2
+
+METADATA = {
+    "group": "a",
+    "score": 0.5,
+    "count": 3,
+    "flag": False,
+    "missing": None,
+    "tags": ["x", 1.0, True, None, {"k": "v"}, []],
+    "nested": {"inner": {"deep": "value"}, "empty": {}},
+    "empty": {},
+}
+
+
+def test_dict_to_struct_matches_json_format():
+    expected = struct_pb2.Struct()
+    ParseDict(METADATA, expected)
+
+    assert dict_to_struct(METADATA) == expected
+    assert dict_to_struct(METADATA).fields["empty"].HasField("struct_value")
+
+
+def test_struct_to_dict_round_trip():
+    converted = struct_to_dict(dict_to_struct(METADATA))
+
+    assert converted == dict(METADATA, count=3.0)
+    assert isinstance(converted["count"], float)
+
+
+def test_unset_values():
+    struct = struct_pb2.Struct()
+    struct.fields["unset"]
+    struct.fields["list"].list_value.values.add()
+
+    assert struct_to_dict(struct) == {"unset": {}, "list": [None]}
+    assert value_to_object(struct_pb2.Value()) is None
+
+
+def test_non_finite_numbers():
+    struct = dict_to_struct({"nan": float("nan"), "inf": float("inf"), "-inf": float("-inf")})
+
+    assert math.isnan(struct.fields["nan"].number_value)
+    assert struct_to_dict(struct) == {"nan": "NaN", "inf": "Infinity", "-inf": "-Infinity"}
+
+
+def test_dict_to_struct_replaces_the_contents():
+    input_ = resources_pb2.Input()
+    input_.data.metadata.update({"old": 1})
+
+    dict_to_struct({"new": 2}, input_.data.metadata)
+
+    assert struct_to_dict(input_.data.metadata) == {"new": 2.0}
+
+
+def test_values_and_lists():
+    assert value_to_object(object_to_value(["a", {"b": None}])) == ["a", {"b": None}]
+    assert list(list_to_list_value([1, "x"]).values) == [
+        struct_pb2.Value(number_value=1),
+        struct_pb2.Value(string_value="x"),
+    ]
+
+
+def test_unsupported_values():
+    with pytest.raises(ParseError):
+        dict_to_struct({"a": object()})
+    with pytest.raises(ParseError):
+        dict_to_struct(["not", "a", "dict"])
+
+
+def test_batches():
+    dicts = [{"index": i, "name": "input-%d" % i} for i in range(5)]
+
+    structs = dicts_to_structs(dicts)
+    assert structs_to_dicts(structs) == [dict(d, index=float(d["index"])) for d in dicts]
+
+    inputs = [resources_pb2.Input() for _ in dicts]
+    dicts_to_structs(dicts, [input_.data.metadata for input_ in inputs])
+    assert [input_.data.metadata["name"] for input_ in inputs] == [d["name"] for d in dicts]
+
+
+def test_json_channel_converters_use_struct_semantics():
+    input_ = dict_to_protobuf(resources_pb2.Input, {"id": "a", "data": {"metadata": METADATA}})
+
+    assert input_.data.metadata == dict_to_struct(METADATA)
+    assert protobuf_to_dict(input_)["data"]["metadata"] == dict(METADATA, count=3.0)
@@ -0,0 +1,125 @@
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+from clarifai_grpc.channel.clarifai_channel import ClarifaiChannel
+from clarifai_grpc.channel.warm_up import warm_up_grpc_channel, warm_up_json_channel
+from clarifai_grpc.grpc.api import service_pb2, service_pb2_grpc
+from clarifai_grpc.grpc.api.status import status_code_pb2
+from clarifai_grpc.testing.fake_server import FakeV2Server
+
+
+def _unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_json_channel_warm_up_opens_pooled_connections():
+    with FakeV2Server() as server:
+        channel = ClarifaiChannel.get_json_channel(
+            server.base_url, api_key="key", warm_up=True, warm_up_connections=3
+        )
+
+        assert channel.warm_up.done
+        assert channel.warm_up.error is None
+        assert channel.warm_up.connections == 3
+        assert channel.warm_up.seconds > 0
+        assert channel.pool_metrics.connections_opened == 3
+
+        stub = service_pb2_grpc.V2Stub(channel)
+        with ThreadPoolExecutor(3) as executor:
+            codes = list(
+                executor.map(
+                    lambda _: stub.ListInputs(service_pb2.ListInputsRequest()).status.code,
+                    range(6),
+                )
+            )
+
+        assert set(codes) == {status_code_pb2.SUCCESS}
+        # The calls used the warm connections rather than opening new ones.
+        assert channel.pool_metrics.connections_opened == 3
+        channel.close()
+
+
+def test_json_channel_warm_up_with_a_blocking_pool():
+    with FakeV2Server() as server:
+        channel = ClarifaiChannel.get_json_channel(
+            server.base_url,
+            api_key="key",
+            pool_maxsize=2,
+            pool_block=True,
+            warm_up=True,
+            warm_up_connections=3,
+        )
+
+        assert channel.warm_up.error is None
+        assert channel.warm_up.connections == 2
+        assert channel.warm_up.seconds < 5
+        # The warm connections were returned to the pool.
+        stub = service_pb2_grpc.V2Stub(channel)
+        for _ in range(3):
+            response = stub.ListInputs(service_pb2.ListInputsRequest())
+            assert response.status.code == status_code_pb2.SUCCESS
+        assert channel.pool_metrics.connections_opened == 2
+        channel.close()
+
+
+def test_json_channel_warm_up_in_background():
+    with FakeV2Server() as server:
+        channel = ClarifaiChannel.get_json_channel(
+            server.base_url,
+            api_key="key",
+            warm_up=True,
+            warm_up_in_background=True,
+            warm_up_connections=2,
+        )
+
+        assert channel.warm_up.wait(10)
+        assert channel.warm_up.connections == 2
+        channel.close()
+
+
+def test_json_channel_warm_up_without_pool_internals(monkeypatch):
+    from urllib3.connectionpool import HTTPConnectionPool
+
+    with FakeV2Server() as server:
+        channel = ClarifaiChannel.get_json_channel(server.base_url, api_key="key")
+        monkeypatch.delattr(HTTPConnectionPool, "_get_conn")
+
+        warm_up = warm_up_json_channel(channel, connections=2)
+
+        assert warm_up.done
+        assert warm_up.error is None
+        assert warm_up.connections == 0
+        assert channel.pool_metrics.connections_opened == 0
+        channel.close()
+
+
+def test_json_channel_is_not_warmed_up_by_default():
+    assert ClarifaiChannel.get_json_channel("http://127.0.0.1:1").warm_up is None
+
+
+def test_grpc_channel_warm_up():
+    with FakeV2Server() as server:
+        channel = ClarifaiChannel.get_insecure_grpc_channel(
+            server.grpc_host, server.grpc_port, api_key="key", warm_up=True
+        )
+        stub = service_pb2_grpc.V2Stub(channel)
+
+        assert channel.warm_up.done
+        assert channel.warm_up.connections == 1
+        assert channel.warm_up.error is None
+        assert stub.ListInputs(service_pb2.ListInputsRequest()).status.code == (
+            status_code_pb2.SUCCESS
+        )
+        channel.close()
+
+
+def test_failed_warm_up_records_the_error():
+    channel = ClarifaiChannel.get_insecure_grpc_channel("127.0.0.1", _unused_port())
+    warm_up = warm_up_grpc_channel(channel, timeout=0.2, background=True)
+
+    assert warm_up.wait(10)
+    assert warm_up.connections == 0
+    assert warm_up.error is not None
+    channel.close()